@@ -0,0 +1,144 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:
+    # Without Brotli, clients asking for br get gzip instead.
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/x-ndjson', 'application/javascript',
+    'application/xml', 'image/svg+xml',
+)
+
+
+class GzipEncoder:
+    name = 'gzip'
+
+    def __init__(self):
+        # wbits=31 writes a gzip header and trailer around the deflate stream.
+        self.compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self.compressor.compress(data)
+
+    def flush(self):
+        return self.compressor.flush()
+
+
+class BrotliEncoder:
+    name = 'br'
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self.compressor.process(data)
+
+    def flush(self):
+        return self.compressor.finish()
+
+
+def available_encoders():
+    """Encoders in order of preference when a client weighs several equally."""
+    return [BrotliEncoder, GzipEncoder] if brotli is not None else [GzipEncoder]
+
+
+def parse_accept_encoding(header):
+    """``'br;q=0.8, gzip'`` -> ``{'br': 0.8, 'gzip': 1.0}``."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoder(header):
+    """The encoder class the client ranks highest, or None if it accepts none of them."""
+    accepted = parse_accept_encoding(header)
+    chosen, chosen_quality = None, 0.0
+    for encoder in available_encoders():
+        quality = accepted.get(encoder.name, accepted.get('*', 0.0))
+        if quality > chosen_quality:
+            chosen, chosen_quality = encoder, quality
+    return chosen
+
+
+def compress_stream(encoder, chunks):
+    for chunk in chunks:
+        data = encoder.compress(chunk)
+        if data:
+            yield data
+    yield encoder.flush()
+
+
+async def acompress_stream(encoder, chunks):
+    async for chunk in chunks:
+        data = encoder.compress(chunk)
+        if data:
+            yield data
+    yield encoder.flush()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress text and JSON responses of at least COMPRESSION_MIN_SIZE bytes,
+    and streamed exports, with brotli or gzip as negotiated through
+    Accept-Encoding.
+
+    Responses that set cookies are left alone: they carry tokens, and
+    compressing secrets next to reflected input exposes them to BREACH.
+    Static files are precompressed and served by WhiteNoise.
+    """
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.cookies:
+            return response
+        content_type = response.get('Content-Type', '')
+        if not content_type.startswith(COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoder_class = negotiate_encoder(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoder_class is None:
+            return response
+        encoder = encoder_class()
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(encoder, response.streaming_content)
+            else:
+                response.streaming_content = compress_stream(encoder, response.streaming_content)
+            # The compressed size is only known once the stream ends.
+            del response.headers['Content-Length']
+        else:
+            compressed = encoder.compress(response.content) + encoder.flush()
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # The body now differs byte for byte, so a strong ETag must become
+        # weak (RFC 9110 8.8.1); conditional GETs compare weakly anyway.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoder.name
+        return response
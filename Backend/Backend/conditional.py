@@ -0,0 +1,69 @@
+import datetime
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def make_validators(request, state):
+    """
+    Build an (ETag, Last-Modified) pair from ``state``, a dict of the values
+    that determine a response body (timestamps, row counts, ...).
+    """
+    fingerprint = repr((request.get_full_path(), sorted(state.items())))
+    etag = '"%s"' % hashlib.sha1(fingerprint.encode()).hexdigest()
+    timestamps = [value for value in state.values() if isinstance(value, datetime.datetime)]
+    return etag, max(timestamps) if timestamps else None
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET with 304 Not Modified when the client's If-None-Match or
+    If-Modified-Since still matches, before anything is serialized.
+
+    Views implement ``get_validator_state()`` returning a dict of values
+    that change whenever the response body would, or None to skip.
+    """
+
+    def get(self, request, *args, **kwargs):
+        state = self.get_validator_state()
+        if state is None:
+            return super().get(request, *args, **kwargs)
+
+        response, etag, timestamp = conditional_response(request, state)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        return add_validators(response, etag, timestamp)
+
+
+class AsyncConditionalGetMixin:
+    """
+    ConditionalGetMixin for AsyncAPIViewMixin views: awaits
+    ``aget_validator_state()`` and then ``aget_response()`` for the body.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        state = await self.aget_validator_state()
+        if state is None:
+            return await self.aget_response(request, *args, **kwargs)
+
+        response, etag, timestamp = conditional_response(request, state)
+        if response is None:
+            response = await self.aget_response(request, *args, **kwargs)
+        return add_validators(response, etag, timestamp)
+
+
+def conditional_response(request, state):
+    """Return ``(304 response or None, etag, last-modified timestamp)`` for ``state``."""
+    etag, last_modified = make_validators(request, state)
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp), etag, timestamp
+
+
+def add_validators(response, etag, timestamp):
+    if response.status_code not in (200, 304):
+        return response
+    response['ETag'] = etag
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    return response
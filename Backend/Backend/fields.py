@@ -0,0 +1,116 @@
+from rest_framework import serializers
+
+SAFE_READS = ('GET', 'HEAD')
+
+
+def parse_field_paths(value):
+    """
+    Parse ``'id,items.book.title'`` into the tree
+    ``{'id': {}, 'items': {'book': {'title': {}}}}``.
+    """
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in path.strip().split('.'):
+            if name:
+                node = node.setdefault(name, {})
+    return tree
+
+
+def subtree(tree, path):
+    for name in path:
+        if tree is None:
+            return None
+        tree = tree.get(name)
+    return tree
+
+
+class SparseFieldsMixin:
+    """
+    ModelSerializer mixin for the ``fields=`` and ``expand=`` query
+    parameters (parsed into the context by SparseFieldsViewMixin).
+
+    A serializer renders either its full representation or, as the root of
+    a summary view and whenever nested, just ``Meta.summary_fields``.
+    ``expand=items.book`` adds fields left out of a summary and renders the
+    nested serializer they lead to in full; ``fields=id,items.book.title``
+    keeps exactly the named fields, at any depth.
+
+    ``Meta.field_columns`` maps fields that are not backed by a model column
+    of the same name to the columns they read, for get_deferred_columns().
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        path = self.field_path()
+        selected = subtree(self.context.get('fields'), path)
+        expand = self.context.get('expand') or {}
+        if path:
+            summary = subtree(expand, path) is None
+        else:
+            summary = self.context.get('summary', False)
+        expanded = subtree(expand, path) or {}
+
+        if selected:
+            wanted = set(selected)
+        elif summary:
+            wanted = set(getattr(self.Meta, 'summary_fields', fields)) | set(expanded)
+        else:
+            wanted = set(fields)
+
+        unknown = (set(selected or ()) | set(expanded)) - set(fields)
+        if unknown:
+            raise serializers.ValidationError({
+                'fields': [f"Unknown field {'.'.join(path + [name])!r}." for name in sorted(unknown)]
+            })
+        return {name: field for name, field in fields.items() if name in wanted}
+
+    def field_path(self):
+        """Field names leading from the root serializer to this one."""
+        path, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        return path[::-1]
+
+    def get_deferred_columns(self):
+        """
+        Concrete model fields none of the selected fields read. Foreign keys
+        are always kept: prefetches and select_related join on them.
+        """
+        field_columns = getattr(self.Meta, 'field_columns', {})
+        used = set()
+        for name, field in self.fields.items():
+            if name in field_columns:
+                used.update(field_columns[name])
+            else:
+                used.add(field.source.split('.')[0])
+        return [
+            field.name for field in self.Meta.model._meta.concrete_fields
+            if not field.primary_key and not field.is_relation and field.name not in used
+        ]
+
+
+class SparseFieldsViewMixin:
+    """
+    Pass ``fields=``/``expand=`` to the serializer on reads. Set
+    ``summary_view`` on list endpoints to render summaries by default.
+    """
+    summary_view = False
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method in SAFE_READS:
+            params = self.request.query_params
+            context['fields'] = parse_field_paths(params['fields']) if params.get('fields') else None
+            context['expand'] = parse_field_paths(params.get('expand', ''))
+            context['summary'] = self.summary_view
+        return context
+
+    def get_read_serializer(self):
+        """The serializer a GET will render with, for shaping querysets; None on writes."""
+        if self.request.method not in SAFE_READS:
+            return None
+        serializer = self.get_serializer()
+        return getattr(serializer, 'child', serializer)
@@ -0,0 +1,116 @@
+import contextlib
+import contextvars
+import hmac
+import os
+import time
+
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from prometheus_client import CollectorRegistry, Histogram, disable_created_metrics, generate_latest, multiprocess
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Per-request counters, set by Backend.middleware.RequestMetricsMiddleware.
+current_request = contextvars.ContextVar('current_request_metrics', default=None)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+VIEW_LABELS = ('view', 'method')
+
+# Histograms register here. Under gunicorn each worker writes them to
+# PROMETHEUS_MULTIPROC_DIR and metrics_view() merges the files; see
+# Backend/gunicorn.conf.py.
+REGISTRY = CollectorRegistry()
+# Multiprocess mode has no _created series; keep one worker's output the same.
+disable_created_metrics()
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Time spent handling a request.',
+    ('view', 'method', 'status'), buckets=LATENCY_BUCKETS, registry=REGISTRY,
+)
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'SQL queries run per request.',
+    VIEW_LABELS, buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100), registry=REGISTRY,
+)
+DB_DURATION = Histogram(
+    'http_request_db_duration_seconds', 'Time spent in SQL per request.',
+    VIEW_LABELS, buckets=LATENCY_BUCKETS, registry=REGISTRY,
+)
+SERIALIZER_DURATION = Histogram(
+    'http_request_serializer_duration_seconds', 'Time spent in serializer to_representation per request.',
+    VIEW_LABELS, buckets=LATENCY_BUCKETS, registry=REGISTRY,
+)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Response body size as sent, after compression; streamed responses are not counted.',
+    VIEW_LABELS, buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304), registry=REGISTRY,
+)
+HISTOGRAMS = [REQUEST_DURATION, DB_QUERIES, DB_DURATION, SERIALIZER_DURATION, RESPONSE_SIZE]
+
+# Callables returning extra exposition lines, e.g. cache counters; see register_collector().
+collectors = []
+
+
+def register_collector(collector):
+    if collector not in collectors:
+        collectors.append(collector)
+
+
+def render():
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    lines = [generate_latest(registry).decode().rstrip('\n')]
+    for collector in collectors:
+        lines.extend(collector())
+    return '\n'.join(lines) + '\n'
+
+
+@contextlib.contextmanager
+def timed_serialization():
+    """
+    Add the time spent in the block to the current request's serializer
+    time. Nested blocks are not counted twice.
+    """
+    stats = current_request.get()
+    if stats is None or stats.serializing:
+        yield
+        return
+    stats.serializing = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serializer_time += time.perf_counter() - started
+        stats.serializing = False
+
+
+class TimedSerializerMixin:
+    """
+    Add the time spent serializing to the current request's metrics. Only
+    the outermost serializer is timed, so nested serializers that also use
+    the mixin are not counted twice.
+    """
+
+    def to_representation(self, instance):
+        with timed_serialization():
+            return super().to_representation(instance)
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. Requires ``Authorization: Bearer
+    <METRICS_TOKEN>`` when METRICS_TOKEN is set; without one it is only
+    served in DEBUG.
+
+    The request histograms cover every gunicorn worker, live or exited,
+    since the last restart; the registered collectors read counters that
+    all workers already share.
+    """
+    token = settings.METRICS_TOKEN
+    if not token:
+        if not settings.DEBUG:
+            raise Http404
+    elif not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return HttpResponseForbidden()
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
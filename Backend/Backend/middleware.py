@@ -0,0 +1,119 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_RECORDED_QUERIES = 200
+
+
+class RequestStats:
+    def __init__(self):
+        self.query_count = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializing = False
+        self.queries = []
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    execute_wrapper installed on every connection. Under ASGI the ORM runs
+    on a worker thread with its own connection, so the request is found
+    through the context variable rather than by wrapping one connection.
+    """
+    stats = metrics.current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.query_count += 1
+        stats.db_time += elapsed
+        if len(stats.queries) < MAX_RECORDED_QUERIES:
+            stats.queries.append((elapsed, sql))
+
+
+@receiver(connection_created)
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record duration, SQL query count and time, serializer time and response
+    size for every request, labelled by URL name, into Backend.metrics; log
+    requests slower than SLOW_REQUEST_THRESHOLD_MS with their slowest SQL.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Connections opened before the middleware loaded missed connection_created.
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(None, connection)
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = metrics.current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        self.observe(request, response, stats, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = metrics.current_request.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            metrics.current_request.reset(token)
+        self.observe(request, response, stats, time.perf_counter() - started)
+        return response
+
+    def observe(self, request, response, stats, duration):
+        match = request.resolver_match
+        labels = {
+            'view': match.view_name if match and match.view_name else '<unmatched>',
+            'method': request.method,
+            'status': response.status_code,
+        }
+        view = (labels['view'], labels['method'])
+        metrics.REQUEST_DURATION.labels(*view, labels['status']).observe(duration)
+        metrics.DB_QUERIES.labels(*view).observe(stats.query_count)
+        metrics.DB_DURATION.labels(*view).observe(stats.db_time)
+        metrics.SERIALIZER_DURATION.labels(*view).observe(stats.serializer_time)
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.labels(*view).observe(len(response.content))
+
+        if duration * 1000 >= settings.SLOW_REQUEST_THRESHOLD_MS:
+            self.log_slow_request(request, labels, duration, stats)
+
+    def log_slow_request(self, request, labels, duration, stats):
+        slowest = sorted(stats.queries, key=lambda query: query[0], reverse=True)[:settings.SLOW_REQUEST_LOGGED_QUERIES]
+        logger.warning(
+            "Slow request %s %s (%s) %s in %.0fms: %d queries in %.0fms, serializers %.0fms%s",
+            request.method, request.get_full_path(), labels['view'], labels['status'], duration * 1000,
+            stats.query_count, stats.db_time * 1000, stats.serializer_time * 1000,
+            ''.join(f'\n  {elapsed * 1000:.1f}ms {sql}' for elapsed, sql in slowest),
+        )
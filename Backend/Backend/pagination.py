@@ -0,0 +1,228 @@
+import base64
+import datetime
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def estimate_count(queryset):
+    """
+    Return the planner's row estimate for ``queryset``, or None when the
+    database cannot provide one cheaply.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class ApproximateCountPaginator(Paginator):
+    # Below this estimate an exact COUNT(*) is cheap enough to be worth it.
+    exact_count_threshold = 10_000
+    is_approximate = False
+
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < self.exact_count_threshold:
+            self.is_approximate = False
+            return super().count
+        self.is_approximate = True
+        return estimate
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seek-based pagination on the queryset's ordering with ``id`` as the final
+    tie-breaker, so every page costs the same regardless of depth and no
+    COUNT(*) is issued.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        values, reverse = self.decode_cursor(request)
+
+        if values is not None:
+            queryset = queryset.filter(self.seek_filter(queryset, values, reverse))
+        ordering = [self.invert(field) for field in self.ordering] if reverse else self.ordering
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, values is not None
+
+        self.next_values = self.position(results[-1]) if has_next and results else None
+        self.previous_values = self.position(results[0]) if has_previous and results else None
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_link(self.next_values, reverse=False)),
+            ('previous', self.get_link(self.previous_values, reverse=True)),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_ordering(self, queryset):
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering)
+        if not all(isinstance(field, str) and '__' not in field for field in ordering):
+            raise NotFound('Keyset pagination is not available for this ordering.')
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            descending = bool(ordering) and ordering[0].startswith('-')
+            ordering.append('-id' if descending else 'id')
+        return ordering
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else '-' + field
+
+    def seek_filter(self, queryset, values, reverse):
+        if len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = [self.field_value(queryset, field.lstrip('-'), value) for field, value in zip(self.ordering, values)]
+        condition = Q()
+        for index, field in enumerate(self.ordering):
+            name = field.lstrip('-')
+            descending = field.startswith('-') != reverse
+            term = Q(**{f'{name}__{"lt" if descending else "gt"}': values[index]})
+            for previous, value in zip(self.ordering[:index], values):
+                term &= Q(**{previous.lstrip('-'): value})
+            condition |= term
+        return condition
+
+    def field_value(self, queryset, name, value):
+        """``value`` from a cursor as the Python value of ``queryset``'s ``name`` field or annotation."""
+        if name in queryset.query.annotations:
+            field = queryset.query.annotations[name].output_field
+        else:
+            field = queryset.model._meta.pk if name == 'pk' else queryset.model._meta.get_field(name)
+        try:
+            value = field.to_python(value)
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        return value
+
+    def position(self, obj):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            # values() rows carry the ordering columns under their own names.
+            if isinstance(obj, dict):
+                values.append(self.cursor_value(obj[name]))
+                continue
+            try:
+                name = obj._meta.get_field(name).attname
+            except FieldDoesNotExist:
+                pass
+            values.append(self.cursor_value(getattr(obj, 'pk' if name == 'pk' else name)))
+        return values
+
+    @staticmethod
+    def cursor_value(value):
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            return value.isoformat()
+        return value
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            values = payload['v']
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or not all(isinstance(value, (str, int, float)) for value in values):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, values, reverse):
+        payload = {'v': values, 'r': 1} if reverse else {'v': values}
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode()).decode('ascii')
+
+    def get_link(self, values, reverse):
+        if values is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values, reverse))
+
+
+class DefaultPagination(PageNumberPagination):
+    """
+    Page-number pagination that can switch per request or per view to:
+
+    * keyset pagination: ``?pagination=keyset`` (or any ``?cursor=``), or a
+      view with ``pagination_mode = 'keyset'``;
+    * planner-estimated counts: ``?count=approximate``, or a view with
+      ``approximate_count = True``.
+    """
+    mode_query_param = 'pagination'
+    count_query_param = 'count'
+
+    keyset = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request, view):
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+
+        if self.use_approximate_count(request, view):
+            self.django_paginator_class = ApproximateCountPaginator
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        response = super().get_paginated_response(data)
+        if getattr(self.page.paginator, 'is_approximate', False):
+            response.data['count_is_approximate'] = True
+        return response
+
+    def use_keyset(self, request, view):
+        if KeysetPagination.cursor_query_param in request.query_params:
+            return True
+        mode = request.query_params.get(self.mode_query_param) or getattr(view, 'pagination_mode', 'page')
+        return mode == 'keyset'
+
+    def use_approximate_count(self, request, view):
+        if request.query_params.get(self.count_query_param) == 'approximate':
+            return True
+        return getattr(view, 'approximate_count', False)
@@ -0,0 +1,32 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+# Dates and times go through DRF's encoder, so they keep its format
+# (``Z`` for UTC) rather than orjson's.
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer producing the same bytes with orjson. Indented output (the
+    browsable API, ``; indent=``) and data orjson rejects, such as integers
+    beyond 64 bits, lone surrogates or non-string keys, go through JSONRenderer.
+    """
+    # Types orjson does not know (lazy strings, decimals, querysets...).
+    default = staticmethod(JSONRenderer.encoder_class().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # orjson only writes compact, unescaped UTF-8.
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.default, option=ORJSON_OPTIONS)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, keeping the output a JavaScript subset.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
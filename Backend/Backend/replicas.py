@@ -0,0 +1,121 @@
+import contextvars
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_COOKIE_NAME = 'db_primary_until'
+
+
+class RoutingState:
+    def __init__(self, use_replicas):
+        self.use_replicas = use_replicas
+        self.wrote = False
+
+
+# Set per request by ReplicaRoutingMiddleware; mutated in place, so a write
+# on a sync_to_async thread still pins the rest of the request.
+current_routing = contextvars.ContextVar('database_routing', default=None)
+
+
+def pin_to_primary():
+    """Send the current request's remaining reads to the primary."""
+    state = current_routing.get()
+    if state is not None:
+        state.use_replicas = False
+
+
+class ReplicaRouter:
+    """
+    Route reads of safe-method requests to a random DATABASE_REPLICAS alias
+    and everything else to the primary.
+
+    Reads go to the primary outside requests (management commands, tests),
+    inside a transaction, once the request has written, and for
+    REPLICA_STICKY_SECONDS after a client's last write, so users read their
+    own writes despite replication lag.
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_routing.get()
+        if state is None or not state.use_replicas or not settings.DATABASE_REPLICAS:
+            return DEFAULT_DB_ALIAS
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        state = current_routing.get()
+        if state is not None:
+            state.use_replicas = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let ReplicaRouter send this request's reads to replicas, and pin the
+    client to the primary with a short-lived cookie once a request writes.
+    List it before CompressionMiddleware, which leaves alone responses that
+    set cookies.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        state = self.routing_state(request)
+        token = current_routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        return self.process_response(state, response)
+
+    async def __acall__(self, request):
+        state = self.routing_state(request)
+        token = current_routing.set(state)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_routing.reset(token)
+        return self.process_response(state, response)
+
+    def routing_state(self, request):
+        try:
+            pinned = float(request.COOKIES.get(PIN_COOKIE_NAME, 0)) > time.time()
+        except ValueError:
+            pinned = False
+        return RoutingState(use_replicas=request.method in SAFE_METHODS and not pinned)
+
+    def process_response(self, state, response):
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PIN_COOKIE_NAME,
+                str(time.time() + settings.REPLICA_STICKY_SECONDS),
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                secure=settings.SESSION_COOKIE_SECURE,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
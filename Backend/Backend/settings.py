@@ -2,6 +2,7 @@
 
 from pathlib import Path
 from datetime import timedelta
+import copy
 import os
 from dotenv import load_dotenv
 
@@ -33,12 +34,18 @@ INSTALLED_APPS = [
 
     'users',
     'books',
-    'reading_lists'
+    'reading_lists',
+    'jobs',
+    'benchmarks',
 ]
 
 MIDDLEWARE = [
+    'Backend.middleware.RequestMetricsMiddleware',
+    'Backend.replicas.ReplicaRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'Backend.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -69,6 +76,8 @@ WSGI_APPLICATION = 'Backend.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+DB_CONN_MAX_AGE = os.getenv('DB_CONN_MAX_AGE', '0')
+
 DATABASES = {
     'default': {
         'ENGINE': os.getenv('DB_ENGINE', 'django.db.backends.postgresql'),
@@ -77,9 +86,110 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Seconds a worker keeps its connection between requests ('none' for
+        # no limit). 0 opens a new connection for every request.
+        'CONN_MAX_AGE': None if DB_CONN_MAX_AGE.lower() == 'none' else int(DB_CONN_MAX_AGE),
+        # Check a reused connection is still alive before a request uses it.
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true',
     }
 }
 
+# psycopg 3 connection pool, one per worker process. Use it instead of
+# DB_CONN_MAX_AGE (Django refuses both) and always under ASGI, where
+# persistent connections belong to threads and are not reused across
+# requests. Pooled connections are checked when handed out.
+if os.getenv('DB_POOL', 'False').lower() == 'true':
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            # Seconds a request waits for a free connection before failing.
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        },
+    }
+
+# Read replicas: DB_REPLICAS is a comma-separated list of host[:port] with
+# the primary's name and credentials, or of database files with SQLite.
+# Safe-method requests read from them (Backend.replicas.ReplicaRouter);
+# clients read from the primary for REPLICA_STICKY_SECONDS after a write.
+DATABASE_REPLICAS = []
+for number, replica in enumerate(filter(None, map(str.strip, os.getenv('DB_REPLICAS', '').split(','))), 1):
+    config = copy.deepcopy(DATABASES['default'])
+    if config['ENGINE'] == 'django.db.backends.sqlite3':
+        config['NAME'] = replica
+    else:
+        host, _, port = replica.partition(':')
+        config.update(HOST=host, PORT=port or config['PORT'])
+    # Tests run against the primary's test database only.
+    config['TEST'] = {'MIRROR': 'default'}
+    DATABASES[f'replica{number}'] = config
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['Backend.replicas.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(os.getenv('DB_REPLICA_STICKY_SECONDS', 5))
+
+# Cache
+# Point CACHE_BACKEND at a shared store (e.g. django.core.cache.backends.redis.RedisCache)
+# when running more than one process, otherwise invalidation stays per-process.
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'bookmanagement'),
+    }
+}
+
+BOOK_CACHE_TIMEOUT = int(os.getenv('BOOK_CACHE_TIMEOUT_SECONDS', 300))
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT_SECONDS', 300))
+# How long a refresh token found not to be revoked is trusted without
+# checking again (users.revocation), when the cache is shared between
+# processes; revocations themselves are cached until the token expires.
+TOKEN_REVOCATION_CACHE_TIMEOUT = int(os.getenv('TOKEN_REVOCATION_CACHE_TIMEOUT_SECONDS', 60))
+
+# Serve book list GETs from values() rows and a compiled BookSerializer
+# (books.fastpath); the output is identical either way.
+BOOK_LIST_FAST_PATH = os.getenv('BOOK_LIST_FAST_PATH', 'True').lower() == 'true'
+
+# Background jobs (jobs app): run by `manage.py run_jobs`, e.g. the Procfile's
+# worker. JOBS_RUN_INLINE=True runs each job in the process that queued it
+# once its transaction commits, for development without a worker.
+JOBS_RUN_INLINE = os.getenv('JOBS_RUN_INLINE', 'False').lower() == 'true'
+# Jobs a worker runs at once, each in its own process.
+JOBS_CONCURRENCY = int(os.getenv('JOBS_CONCURRENCY', 2))
+JOBS_POLL_INTERVAL = float(os.getenv('JOBS_POLL_INTERVAL_SECONDS', 1))
+JOBS_MAX_ATTEMPTS = int(os.getenv('JOBS_MAX_ATTEMPTS', 3))
+# Seconds before the first retry, doubling with each further attempt.
+JOBS_RETRY_DELAY = int(os.getenv('JOBS_RETRY_DELAY_SECONDS', 30))
+# Workers record a heartbeat on their running jobs every
+# JOBS_HEARTBEAT_INTERVAL seconds. A job without one for JOBS_HEARTBEAT_TIMEOUT
+# is taken for lost with its worker and retried. Jobs run inline have no
+# heartbeat, so a worker sharing their database may retry long ones.
+JOBS_HEARTBEAT_INTERVAL = float(os.getenv('JOBS_HEARTBEAT_INTERVAL_SECONDS', 10))
+JOBS_HEARTBEAT_TIMEOUT = int(os.getenv('JOBS_HEARTBEAT_TIMEOUT_SECONDS', 120))
+JOBS_MAX_TASKS_PER_CHILD = int(os.getenv('JOBS_MAX_TASKS_PER_CHILD', 100))
+JOBS_RETENTION_DAYS = int(os.getenv('JOBS_RETENTION_DAYS', 7))
+# Task name -> seconds between runs, queued by the workers.
+JOBS_PERIODIC = {
+    'users.prune_expired_tokens': int(os.getenv('TOKEN_PRUNE_INTERVAL_SECONDS', 3600)),
+    'jobs.prune_finished_jobs': 86400,
+}
+
+# Password hashing
+# PASSWORD_HASHER picks the hasher for new and upgraded hashes; the others
+# stay listed so existing hashes still verify and are upgraded on login.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'pbkdf2')
+_PASSWORD_HASHER_CLASSES = {
+    'pbkdf2': 'users.hashers.PBKDF2PasswordHasher',
+    'scrypt': 'users.hashers.ScryptPasswordHasher',
+    'argon2': 'users.hashers.Argon2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+PASSWORD_PBKDF2_ITERATIONS = int(os.getenv('PASSWORD_PBKDF2_ITERATIONS', 0)) or None
+PASSWORD_SCRYPT_WORK_FACTOR = int(os.getenv('PASSWORD_SCRYPT_WORK_FACTOR', 0)) or None
+PASSWORD_ARGON2_TIME_COST = int(os.getenv('PASSWORD_ARGON2_TIME_COST', 0)) or None
+PASSWORD_ARGON2_MEMORY_COST = int(os.getenv('PASSWORD_ARGON2_MEMORY_COST', 0)) or None
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -108,7 +218,28 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 STATIC_URL = 'static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
-STATIC_ROOT = BASE_DIR / 'staticfiles' 
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic writes content-hashed copies with .gz and .br variants;
+# WhiteNoise serves them with far-future Cache-Control, picking the
+# encoding the client accepts. STATIC_ROOT is build output and not in git:
+# without collectstatic's manifest every page with static files fails, so
+# the Procfile's web process runs it before starting.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# API responses from this size up are compressed with brotli or gzip, as
+# the client's Accept-Encoding allows (Backend.compression).
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', 6))
+# Brotli's top qualities are far too slow for per-request compression.
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', 4))
 
 # Media files
 MEDIA_URL = '/media/'
@@ -163,11 +294,22 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'Backend.pagination.DefaultPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'Backend.renderers.ORJSONRenderer',
     ],
+    # Token buckets for the password-hashing endpoints (users.throttling),
+    # per client address and per account email. An empty rate disables one.
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.getenv('THROTTLE_LOGIN_IP', '20/min') or None,
+        'login_account': os.getenv('THROTTLE_LOGIN_ACCOUNT', '5/min') or None,
+        'register_ip': os.getenv('THROTTLE_REGISTER_IP', '10/hour') or None,
+        'register_account': os.getenv('THROTTLE_REGISTER_ACCOUNT', '5/hour') or None,
+    },
+    # Proxies in front of the app that append to X-Forwarded-For; with 0
+    # the client address is REMOTE_ADDR, which clients cannot spoof.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 0)),
 }
 
 # CORS Settings
@@ -225,6 +367,16 @@ LOGGING = {
     },
 }
 
+# Serve the book and reading-list read endpoints with async views. Only
+# worth it under ASGI (SERVER_MODE=asgi, see gunicorn.conf.py); under WSGI
+# each async view costs an extra event loop per request.
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False').lower() == 'true'
+
+# Request metrics (see Backend.middleware and /metrics/)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+SLOW_REQUEST_THRESHOLD_MS = int(os.getenv('SLOW_REQUEST_THRESHOLD_MS', 500))
+SLOW_REQUEST_LOGGED_QUERIES = int(os.getenv('SLOW_REQUEST_LOGGED_QUERIES', 10))
+
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('FILE_UPLOAD_MAX_MEMORY_SIZE_MB', 10)) * 1024 * 1024
 DATA_UPLOAD_MAX_MEMORY_SIZE = int(os.getenv('DATA_UPLOAD_MAX_MEMORY_SIZE_MB', 10)) * 1024 * 1024
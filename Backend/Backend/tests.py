@@ -0,0 +1,203 @@
+import gzip
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+import brotli
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from prometheus_client import values
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from books.cache import fill_from_primary, invalidate_book_cache
+from books.models import Book
+from books.tests import make_books
+
+from . import metrics
+from .replicas import PIN_COOKIE_NAME, ReplicaRoutingMiddleware, RoutingState, current_routing
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'], REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTests(SimpleTestCase):
+    def route(self, method='get', pinned_until=None, write=False):
+        def view(request):
+            if write:
+                Book.objects.select_for_update().db  # Routed as a write.
+            return HttpResponse(Book.objects.all().db)
+
+        request = getattr(APIRequestFactory(), method)('/api/book/')
+        if pinned_until is not None:
+            request.COOKIES[PIN_COOKIE_NAME] = str(pinned_until)
+        return ReplicaRoutingMiddleware(view)(request)
+
+    def test_safe_requests_read_from_replicas_until_the_client_writes(self):
+        self.assertEqual(Book.objects.all().db, 'default')
+        response = self.route()
+        self.assertEqual(response.content, b'replica1')
+        self.assertNotIn(PIN_COOKIE_NAME, response.cookies)
+        self.assertEqual(self.route('post').content, b'default')
+
+        response = self.route(write=True)
+        self.assertEqual(response.content, b'default')
+        self.assertEqual(response.cookies[PIN_COOKIE_NAME]['max-age'], 5)
+        pinned_until = response.cookies[PIN_COOKIE_NAME].value
+        self.assertEqual(self.route(pinned_until=pinned_until).content, b'default')
+        self.assertEqual(self.route(pinned_until=time.time() - 1).content, b'replica1')
+        self.assertEqual(self.route(pinned_until='bogus').content, b'replica1')
+
+    def test_cache_fills_read_from_the_primary_after_book_writes(self):
+        cache.clear()
+        state = RoutingState(use_replicas=True)
+        token = current_routing.set(state)
+        self.addCleanup(current_routing.reset, token)
+        fill_from_primary()
+        self.assertTrue(state.use_replicas)
+        invalidate_book_cache()
+        fill_from_primary()
+        self.assertFalse(state.use_replicas)
+
+
+class ResponseCompressionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', email='reader@example.com')
+        self.client.force_authenticate(self.user)
+        make_books(self.user, 20)
+        self.url = reverse('book-list-create')
+
+    def test_encoding_is_negotiated(self):
+        plain = self.client.get(self.url)
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='br;q=0.5, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='br;q=0, gzip;q=0')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_small_responses_and_conditional_gets(self):
+        small = self.client.get(reverse('book-detail', args=[Book.objects.first().pk]), {'fields': 'id'},
+                                HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', small)
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_streamed_exports_are_compressed(self):
+        plain = self.client.get(reverse('book-export', args=['csv']))
+        response = self.client.get(reverse('book-export', args=['csv']), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b''.join(plain.streaming_content))
+
+
+class StaticFilesTests(APITestCase):
+    def setUp(self):
+        source, root = tempfile.mkdtemp(), tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, source)
+        self.addCleanup(shutil.rmtree, root)
+        with open(os.path.join(source, 'app.css'), 'w') as handle:
+            handle.write('body { color: #333; }\n' * 200)
+        settings_override = override_settings(
+            STATIC_ROOT=root, STATICFILES_DIRS=[source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_hashed_files_are_precompressed_and_cached_forever(self):
+        url = staticfiles_storage.url('app.css')
+        self.assertRegex(url, r'^/static/app\.[0-9a-f]{12}\.css$')
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('max-age=315360000', response['Cache-Control'])
+
+        response = self.client.get('/static/app.css', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+
+@override_settings(DEBUG=False)
+class AdminStaticFilesTests(APITestCase):
+    def test_admin_pages_render_from_the_collected_manifest(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        # STATIC_ROOT is build output; this is the build step.
+        with override_settings(STATIC_ROOT=root):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            response = self.client.get('/admin/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response.content.decode(), r'/static/admin/css/base\.[0-9a-f]{12}\.css')
+
+
+@override_settings(METRICS_TOKEN='scrape-secret')
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        for histogram in metrics.HISTOGRAMS:
+            histogram.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        make_books(self.user, 3)
+
+    def scrape(self, **headers):
+        return self.client.get(reverse('metrics'), **headers)
+
+    def test_metrics_endpoint_reports_per_view_histograms(self):
+        self.client.get(reverse('book-list-create'))
+        self.assertEqual(self.scrape().status_code, 403)
+
+        body = self.scrape(HTTP_AUTHORIZATION='Bearer scrape-secret').content.decode()
+        labels = '{method="GET",view="book-list-create"}'
+        self.assertIn(f'http_request_db_queries_count{labels} 1.0', body)
+        self.assertIn('http_request_db_queries_bucket{le="5.0",method="GET",view="book-list-create"} 1.0', body)
+        self.assertIn('http_request_duration_seconds_count{method="GET",status="200",view="book-list-create"} 1.0', body)
+        serializer_time = float(body.split(f'http_request_serializer_duration_seconds_sum{labels} ')[1].split()[0])
+        self.assertGreater(serializer_time, 0)
+        self.assertIn(f'http_response_size_bytes_count{labels} 1', body)
+        self.assertIn('book_cache_misses_total 1', body)
+
+    def test_metrics_endpoint_merges_every_worker(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        with mock.patch.dict(os.environ, {'PROMETHEUS_MULTIPROC_DIR': directory}):
+            # Two workers, each writing its own file.
+            for pid in (101, 102):
+                with mock.patch.object(values, 'ValueClass', values.MultiProcessValue(lambda pid=pid: pid)):
+                    for histogram in metrics.HISTOGRAMS:
+                        histogram.clear()
+                    self.client.get(reverse('book-list-create'))
+            for histogram in metrics.HISTOGRAMS:
+                histogram.clear()
+            body = self.scrape(HTTP_AUTHORIZATION='Bearer scrape-secret').content.decode()
+        self.assertIn('http_request_db_queries_count{method="GET",view="book-list-create"} 2.0', body)
+        self.assertIn('book_cache_misses_total 1', body)
+
+    def test_slow_requests_are_logged_with_sql(self):
+        with override_settings(SLOW_REQUEST_THRESHOLD_MS=0), self.assertLogs('Backend.middleware', 'WARNING') as logs:
+            self.client.get(reverse('book-list-create'))
+        self.assertIn('Slow request GET /api/book/ (book-list-create) 200', logs.output[0])
+        self.assertIn('FROM "books_book"', logs.output[0])
@@ -1,10 +1,14 @@
 from django.contrib import admin
 from django.urls import path, include
 
+from .metrics import metrics_view
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('users.urls')),
     path('api/book/', include('books.urls')),
     path('api/reading-list/', include('reading_lists.urls')),
+    path('api/jobs/', include('jobs.urls')),
+    path('metrics/', metrics_view, name='metrics'),
 
 ]
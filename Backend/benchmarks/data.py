@@ -0,0 +1,98 @@
+import datetime
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from books.authors import sync_authors
+from books.cache import invalidate_book_cache
+from books.facets import batched_facet_changes, rebuild_facets
+from books.models import Book
+from reading_lists.models import ReadingList, ReadingListItem
+from reading_lists.ordering import ORDER_GAP
+
+User = get_user_model()
+
+USERNAME_PREFIX = 'bench-'
+PASSWORD = 'Benchmark-pass1!'
+BATCH_SIZE = 5_000
+WORDS = (
+    'shadow river empire garden winter silent machine ocean crown forest '
+    'memory storm letter island kingdom secret voyage mirror engine harvest '
+    'desert whisper lantern orchard citadel compass ember falcon glacier'
+).split()
+
+
+def benchmark_users():
+    return User.objects.filter(username__startswith=USERNAME_PREFIX).order_by('pk')
+
+
+def reset():
+    """Delete every benchmark user; their books and lists cascade."""
+    with batched_facet_changes():
+        benchmark_users().delete()
+    invalidate_book_cache()
+
+
+def seed(users=50, books=20_000, lists_per_user=5, items_per_list=50, seed=42):
+    """
+    Load synthetic users (all with PASSWORD), books spread across them and
+    reading lists with ``items_per_list`` items each. Returns row counts.
+    """
+    rng = random.Random(seed)
+    # Hash once: every benchmark user shares the password, and hashing
+    # thousands of times would dominate the load time.
+    password = make_password(PASSWORD)
+    with transaction.atomic():
+        start = benchmark_users().count()
+        owners = User.objects.bulk_create([
+            User(
+                username=f'{USERNAME_PREFIX}{start + i}',
+                email=f'{USERNAME_PREFIX}{start + i}@example.com',
+                password=password,
+            )
+            for i in range(users)
+        ])
+
+        for offset in range(0, books, BATCH_SIZE):
+            batch = Book.objects.bulk_create([
+                Book(
+                    title=' '.join(rng.sample(WORDS, 3)).title(),
+                    authors=', '.join(
+                        f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}' for _ in range(rng.randint(1, 2))
+                    ),
+                    genre=rng.choice(Book.GENRE_CHOICES)[0],
+                    publication_date=datetime.date(rng.randint(1900, 2024), rng.randint(1, 12), 1),
+                    description=' '.join(rng.choices(WORDS, k=40)),
+                    pages=rng.randint(80, 900),
+                    created_by=rng.choice(owners),
+                )
+                for _ in range(min(BATCH_SIZE, books - offset))
+            ])
+            sync_authors(batch, created=True)
+
+        book_ids = list(Book.objects.values_list('pk', flat=True))
+        reading_lists = ReadingList.objects.bulk_create([
+            ReadingList(name=f'Benchmark list {i}', user=owner)
+            for owner in owners
+            for i in range(lists_per_user)
+        ])
+        items = []
+        for reading_list in reading_lists:
+            for position, book_id in enumerate(rng.sample(book_ids, min(items_per_list, len(book_ids)))):
+                items.append(ReadingListItem(reading_list=reading_list, book_id=book_id, order=(position + 1) * ORDER_GAP))
+            if len(items) >= BATCH_SIZE:
+                ReadingListItem.objects.bulk_create(items)
+                items = []
+        ReadingListItem.objects.bulk_create(items)
+
+    # bulk_create sends no signals.
+    rebuild_facets()
+    invalidate_book_cache()
+    return {
+        'users': len(owners),
+        'books': books,
+        'reading_lists': len(reading_lists),
+        'reading_list_items': len(reading_lists) * min(items_per_list, len(book_ids)),
+    }
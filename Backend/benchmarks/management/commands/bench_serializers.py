@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.serialization import compare
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rendering a page of books through BookSerializer and "
+        "JSONRenderer with the compiled fast path and ORJSONRenderer, after "
+        "checking both produce the same bytes. Reports median milliseconds per "
+        "page, with and without the queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, action='append', dest='page_sizes', help="Default: 20 and 100.")
+        parser.add_argument('--repeat', type=int, default=50, help="Timed pages per path and page size.")
+
+    def handle(self, *args, **options):
+        try:
+            results = compare(page_sizes=options['page_sizes'] or (20, 100), repeat=options['repeat'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(
+            f"{'page size':>10}{'serializer ms':>15}{'fast path ms':>14}{'speedup':>9}"
+            f"{'render only: serializer':>25}{'fast path':>11}{'speedup':>9}"
+        )
+        for result in results:
+            self.stdout.write(
+                f"{result['page_size']:>10}{result['serializer_ms']:>15.2f}{result['fast_path_ms']:>14.2f}"
+                f"{result['serializer_ms'] / result['fast_path_ms']:>8.1f}x"
+                f"{result['serializer_render_ms']:>25.2f}{result['fast_path_render_ms']:>11.2f}"
+                f"{result['serializer_render_ms'] / result['fast_path_render_ms']:>8.1f}x"
+            )
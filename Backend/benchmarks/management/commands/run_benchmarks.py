@@ -0,0 +1,91 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.runner import compare, run
+from benchmarks.scenarios import SCENARIOS, Context
+
+
+class Command(BaseCommand):
+    help = (
+        "Run every API scenario against the benchmark data and report "
+        "p50/p95/p99 latency, throughput and queries per request. Save a "
+        "report with --output and compare a later run against it with --compare."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help="Timed requests per scenario.")
+        parser.add_argument('--warmup', type=int, default=10, help="Untimed requests per worker first.")
+        parser.add_argument('--concurrency', type=int, default=1, help="Parallel clients, each its own user.")
+        parser.add_argument(
+            '--base-url',
+            help=(
+                "Benchmark a running server (e.g. http://localhost:8000) instead of calling views in-process. "
+                "Start it with empty THROTTLE_LOGIN_* rates, or the login scenario measures rejections."
+            ),
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios', choices=[scenario.name for scenario in SCENARIOS],
+            help="Only run this scenario (repeatable).",
+        )
+        parser.add_argument('--output', help="Write the JSON report here.")
+        parser.add_argument('--compare', help="Baseline JSON report to compare against.")
+        parser.add_argument(
+            '--max-regression', type=float,
+            help="With --compare, exit non-zero if any p95 is this many percent slower.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            context = Context()
+        except ValueError as e:
+            raise CommandError(str(e))
+        scenarios = [s for s in SCENARIOS if not options['scenarios'] or s.name in options['scenarios']]
+        report = run(
+            scenarios, context,
+            requests=options['requests'],
+            warmup=options['warmup'],
+            concurrency=options['concurrency'],
+            base_url=options['base_url'],
+        )
+
+        meta = report['meta']
+        connections = 'pooled connections' if meta['db_pool'] else f"CONN_MAX_AGE {meta['conn_max_age']}"
+        self.stdout.write(
+            f"{meta['mode']} on {meta['database']}, commit {meta['commit'] or 'unknown'}, "
+            f"concurrency {meta['concurrency']}, {connections}"
+        )
+        self.stdout.write(
+            f"{'scenario':<22}{'reqs':>6}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}{'queries':>9}"
+        )
+        for name, stats in report['scenarios'].items():
+            queries = '-' if stats['queries_per_request'] is None else f"{stats['queries_per_request']:.1f}"
+            self.stdout.write(
+                f"{name:<22}{stats['requests']:>6}{stats['errors']:>8}{stats['p50_ms']:>9.1f}"
+                f"{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['throughput_rps']:>9.1f}{queries:>9}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+
+        if options['compare']:
+            with open(options['compare']) as handle:
+                baseline = json.load(handle)
+            self.report_comparison(report, baseline, options['max_regression'])
+
+    def report_comparison(self, report, baseline, max_regression):
+        self.stdout.write(f"\ncompared with commit {baseline['meta'].get('commit') or 'unknown'}")
+        self.stdout.write(f"{'scenario':<22}{'metric':<22}{'before':>10}{'after':>10}{'change':>9}")
+        regressions = []
+        for name, metric, before, after, change in compare(report, baseline):
+            if before is None or after is None:
+                continue
+            self.stdout.write(
+                f"{name:<22}{metric:<22}{before:>10.1f}{after:>10.1f}"
+                + (f"{change:>+8.1f}%" if change is not None else f"{'-':>9}")
+            )
+            if metric == 'p95_ms' and max_regression is not None and change is not None and change > max_regression:
+                regressions.append(name)
+        if regressions:
+            raise CommandError(f"p95 regressed by more than {max_regression}% in: {', '.join(regressions)}")
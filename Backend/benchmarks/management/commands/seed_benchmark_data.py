@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from benchmarks.data import PASSWORD, USERNAME_PREFIX, reset, seed
+
+
+class Command(BaseCommand):
+    help = (
+        f"Load synthetic users ({USERNAME_PREFIX}N@example.com / {PASSWORD}), "
+        "books and reading lists for run_benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--books', type=int, default=20_000)
+        parser.add_argument('--lists-per-user', type=int, default=5)
+        parser.add_argument('--items-per-list', type=int, default=50)
+        parser.add_argument('--seed', type=int, default=42, help="Random seed, for repeatable data.")
+        parser.add_argument('--reset', action='store_true', help="Delete earlier benchmark data first.")
+
+    def handle(self, *args, **options):
+        if options['reset']:
+            reset()
+        counts = seed(
+            users=options['users'],
+            books=options['books'],
+            lists_per_user=options['lists_per_user'],
+            items_per_list=options['items_per_list'],
+            seed=options['seed'],
+        )
+        self.stdout.write(json.dumps(counts))
@@ -0,0 +1,197 @@
+import datetime
+import json
+import math
+import random
+import statistics
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import CookieJar
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+from django.conf import settings
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from .data import PASSWORD
+
+
+class InProcessClient:
+    """Calls the API through Django's test client and counts the SQL each request runs."""
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            if method == 'GET':
+                response = self.client.get(path, data)
+            else:
+                response = self.client.post(path, data or {}, content_type='application/json')
+        return response.status_code, len(queries)
+
+
+class HTTPClient:
+    """Calls a running server; queries per request are not visible from here."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = build_opener(HTTPCookieProcessor(CookieJar()))
+
+    def request(self, method, path, data=None):
+        url = self.base_url + path
+        body = None
+        if method == 'GET':
+            if data:
+                url = f'{url}?{urlencode(data)}'
+        else:
+            body = json.dumps(data or {}).encode()
+        request = Request(url, data=body, method=method, headers={'Content-Type': 'application/json'})
+        try:
+            with self.opener.open(request) as response:
+                response.read()
+                return response.status, None
+        except HTTPError as e:
+            e.read()
+            return e.code, None
+
+
+class Session:
+    def __init__(self, client, user_id, email):
+        self.client = client
+        self.user_id = user_id
+        self.email = email
+
+    def login(self):
+        status, _ = self.client.request('POST', reverse('login'), {'email': self.email, 'password': PASSWORD})
+        if status != 200:
+            raise RuntimeError(f"Login as {self.email} failed with {status}")
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def run_worker(scenario, context, session, count, warmup, seed):
+    rng = random.Random(seed)
+    timings, query_counts, errors = [], [], 0
+    for index in range(warmup + count):
+        method, path, data = scenario.build(rng, context, session)
+        started = time.perf_counter()
+        status, queries = session.client.request(method, path, data)
+        elapsed = time.perf_counter() - started
+        if index < warmup:
+            continue
+        timings.append(elapsed)
+        if queries is not None:
+            query_counts.append(queries)
+        if status >= 400:
+            errors += 1
+    return timings, query_counts, errors
+
+
+def run_scenario(scenario, context, sessions, requests, warmup, seed=0):
+    per_worker = max(1, requests // len(sessions))
+    started = time.perf_counter()
+    if len(sessions) == 1:
+        results = [run_worker(scenario, context, sessions[0], per_worker, warmup, seed)]
+    else:
+        def work(index):
+            try:
+                return run_worker(scenario, context, sessions[index], per_worker, warmup, seed + index)
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+            results = list(executor.map(work, range(len(sessions))))
+    wall = time.perf_counter() - started
+
+    timings = sorted(t for result in results for t in result[0])
+    query_counts = [q for result in results for q in result[1]]
+    total = len(timings)
+    return {
+        'requests': total,
+        'errors': sum(result[2] for result in results),
+        'p50_ms': round(percentile(timings, 50) * 1000, 2),
+        'p95_ms': round(percentile(timings, 95) * 1000, 2),
+        'p99_ms': round(percentile(timings, 99) * 1000, 2),
+        'mean_ms': round(statistics.fmean(timings) * 1000, 2),
+        # Warm-up requests are inside the wall clock too; count them.
+        'throughput_rps': round((total + warmup * len(sessions)) / wall, 1),
+        'queries_per_request': round(statistics.fmean(query_counts), 2) if query_counts else None,
+    }
+
+
+def make_sessions(context, concurrency, base_url=None):
+    sessions = []
+    for index in range(concurrency):
+        user_id, email = context.users[index % len(context.users)]
+        client = HTTPClient(base_url) if base_url else InProcessClient()
+        sessions.append(Session(client, user_id, email))
+    for session in sessions:
+        session.login()
+    return sessions
+
+
+def run(scenarios, context, requests=200, warmup=10, concurrency=1, base_url=None):
+    """Run each scenario in turn and return a JSON-serialisable report."""
+    overrides = {}
+    if not base_url:
+        # The in-process client sends Host: testserver, and every session
+        # logs in from the same address, so the login rate limits are off.
+        overrides['ALLOWED_HOSTS'] = [*settings.ALLOWED_HOSTS, 'testserver']
+        overrides['REST_FRAMEWORK'] = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+    with override_settings(**overrides):
+        sessions = make_sessions(context, concurrency, base_url)
+        results = {
+            scenario.name: run_scenario(scenario, context, sessions, requests, warmup)
+            for scenario in scenarios
+        }
+    return {
+        'meta': {
+            'commit': current_commit(),
+            'database': connection.vendor,
+            # Only meaningful in HTTP mode, against a server sharing this
+            # environment: the test client never closes connections.
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'db_pool': bool(connection.settings_dict['OPTIONS'].get('pool')),
+            'mode': 'http' if base_url else 'in-process',
+            'base_url': base_url,
+            'requests': requests,
+            'warmup': warmup,
+            'concurrency': concurrency,
+            'books': context.book_count,
+            'users': len(context.users),
+            'started_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        },
+        'scenarios': results,
+    }
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline):
+    """Yield ``(scenario, metric, before, after, change_pct)`` for scenarios in both reports."""
+    for name, stats in current['scenarios'].items():
+        before = baseline['scenarios'].get(name)
+        if before is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'queries_per_request'):
+            old, new = before.get(metric), stats.get(metric)
+            change = (new - old) / old * 100 if old and new is not None else None
+            yield name, metric, old, new, change
@@ -0,0 +1,97 @@
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.urls import reverse
+
+from books.models import Author, Book
+from reading_lists.models import ReadingList
+
+from .data import PASSWORD, WORDS, benchmark_users
+
+SAMPLE_SIZE = 5_000
+
+
+class Context:
+    """Ids and values sampled from the benchmark data, shared by every scenario."""
+
+    def __init__(self):
+        self.users = list(benchmark_users().values_list('pk', 'email'))
+        if not self.users:
+            raise ValueError("No benchmark users; run seed_benchmark_data first.")
+        self.book_ids = list(Book.objects.order_by('?').values_list('pk', flat=True)[:SAMPLE_SIZE])
+        self.authors = list(Author.objects.order_by('?').values_list('name', flat=True)[:SAMPLE_SIZE])
+        self.lists_by_user = defaultdict(list)
+        user_ids = [pk for pk, _ in self.users]
+        for pk, user_id in ReadingList.objects.filter(user_id__in=user_ids).values_list('pk', 'user_id'):
+            self.lists_by_user[user_id].append(pk)
+        self.genres = [value for value, _ in Book.GENRE_CHOICES]
+        self.book_count = Book.objects.count()
+        self.book_pages = max(1, min(10, math.ceil(self.book_count / settings.REST_FRAMEWORK['PAGE_SIZE'])))
+
+
+class Scenario:
+    """
+    One kind of request. ``build(rng, context, session)`` returns
+    ``(method, path, data)``; GET data goes in the query string, POST data
+    is sent as JSON.
+    """
+
+    def __init__(self, name, build):
+        self.name = name
+        self.build = build
+
+
+def book_list(rng, context, session):
+    return 'GET', reverse('book-list-create'), {'page': rng.randint(1, context.book_pages)}
+
+
+def book_list_filtered(rng, context, session):
+    return 'GET', reverse('book-list-create'), {'genre': rng.choice(context.genres), 'ordering': 'title'}
+
+
+def book_list_keyset(rng, context, session):
+    return 'GET', reverse('book-list-create'), {'pagination': 'keyset'}
+
+
+def book_search(rng, context, session):
+    return 'GET', reverse('book-list-create'), {'search': ' '.join(rng.sample(WORDS, rng.randint(1, 2)))}
+
+
+def book_by_author(rng, context, session):
+    return 'GET', reverse('book-list-create'), {'author': rng.choice(context.authors)}
+
+
+def book_detail(rng, context, session):
+    return 'GET', reverse('book-detail', args=[rng.choice(context.book_ids)]), None
+
+
+def reading_lists(rng, context, session):
+    return 'GET', reverse('reading-list-list-create'), None
+
+
+def reading_list_detail(rng, context, session):
+    list_id = rng.choice(context.lists_by_user[session.user_id])
+    return 'GET', reverse('reading-list-detail', args=[list_id]), None
+
+
+def login(rng, context, session):
+    return 'POST', reverse('login'), {'email': session.email, 'password': PASSWORD}
+
+
+def token_refresh(rng, context, session):
+    return 'POST', reverse('token_refresh'), None
+
+
+SCENARIOS = [
+    Scenario('book-list', book_list),
+    Scenario('book-list-filtered', book_list_filtered),
+    Scenario('book-list-keyset', book_list_keyset),
+    Scenario('book-search', book_search),
+    Scenario('book-by-author', book_by_author),
+    Scenario('book-detail', book_detail),
+    Scenario('reading-lists', reading_lists),
+    Scenario('reading-list-detail', reading_list_detail),
+    Scenario('login', login),
+    Scenario('token-refresh', token_refresh),
+]
@@ -0,0 +1,74 @@
+import statistics
+import time
+
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from Backend.renderers import ORJSONRenderer
+from books.fastpath import compile_book_serializer
+from books.models import Book
+from books.serializers import BookSerializer, load_book_fields
+
+ORDERING = ('-created_at', '-id')
+
+
+class SerializerPath:
+    """A book list page the way the serializer renders it: instances, prefetched authors, JSONRenderer."""
+
+    def __init__(self, request):
+        self.request = request
+
+    def fetch(self, page_size):
+        serializer = BookSerializer(context={'request': self.request})
+        return list(load_book_fields(Book.objects.all(), serializer).order_by(*ORDERING)[:page_size])
+
+    def render(self, books):
+        data = BookSerializer(books, many=True, context={'request': self.request}).data
+        return JSONRenderer().render(data)
+
+
+class FastPath:
+    """The same page through books.fastpath and ORJSONRenderer."""
+
+    def __init__(self, request):
+        self.request = request
+        self.compiled = compile_book_serializer(tuple(BookSerializer().fields))
+
+    def fetch(self, page_size):
+        rows = list(self.compiled.values(Book.objects.all()).order_by(*ORDERING)[:page_size])
+        # One query for the page's authors, as the prefetch above.
+        self.compiled.load_authors(rows)
+        return rows
+
+    def render(self, rows):
+        return ORJSONRenderer().render(self.compiled.represent(rows, self.request))
+
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def compare(page_sizes=(20, 100), repeat=50):
+    """
+    Median milliseconds to fetch and render a page of books through each
+    path, and to render an already fetched page. Raises ValueError if the
+    two paths produce different bytes.
+    """
+    request = RequestFactory().get('/api/book/')
+    paths = {'serializer': SerializerPath(request), 'fast_path': FastPath(request)}
+    results = []
+    for page_size in page_sizes:
+        pages = {name: path.fetch(page_size) for name, path in paths.items()}
+        if paths['serializer'].render(pages['serializer']) != paths['fast_path'].render(pages['fast_path']):
+            raise ValueError(f'Fast path output differs from BookSerializer at page size {page_size}.')
+        result = {'page_size': page_size}
+        for name, path in paths.items():
+            result[f'{name}_ms'] = median_ms(lambda: path.render(path.fetch(page_size)), repeat)
+            result[f'{name}_render_ms'] = median_ms(lambda: path.render(pages[name]), repeat)
+        results.append(result)
+    return results
@@ -0,0 +1,58 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from books.models import Book
+from reading_lists.models import ReadingListItem
+
+from .data import benchmark_users
+
+
+class BenchmarkSuiteTests(TestCase):
+    def setUp(self):
+        call_command(
+            'seed_benchmark_data', users=2, books=30, lists_per_user=2, items_per_list=5, stdout=io.StringIO()
+        )
+        handle = tempfile.NamedTemporaryFile(suffix='.json', delete=False)
+        handle.close()
+        self.addCleanup(os.unlink, handle.name)
+        self.report_path = handle.name
+
+    def test_seed_creates_users_books_and_lists(self):
+        self.assertEqual(benchmark_users().count(), 2)
+        self.assertEqual(Book.objects.count(), 30)
+        self.assertEqual(ReadingListItem.objects.count(), 20)
+
+    def test_report_covers_every_scenario_and_compares(self):
+        call_command('run_benchmarks', requests=3, warmup=1, output=self.report_path, stdout=io.StringIO())
+        with open(self.report_path) as handle:
+            report = json.load(handle)
+        self.assertEqual(len(report['scenarios']), 10)
+        for name, stats in report['scenarios'].items():
+            self.assertEqual(stats['errors'], 0, name)
+            self.assertEqual(stats['requests'], 3)
+            self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+            self.assertIsNotNone(stats['queries_per_request'])
+
+        out = io.StringIO()
+        call_command('run_benchmarks', requests=3, scenarios=['book-detail'], compare=self.report_path, stdout=out)
+        self.assertIn('compared with commit', out.getvalue())
+
+        report['scenarios']['book-detail']['p95_ms'] = 0.001
+        with open(self.report_path, 'w') as handle:
+            json.dump(report, handle)
+        with self.assertRaises(CommandError):
+            call_command(
+                'run_benchmarks', requests=3, scenarios=['book-detail'],
+                compare=self.report_path, max_regression=50, stdout=io.StringIO(),
+            )
+
+    def test_serializer_benchmark_checks_identical_output(self):
+        out = io.StringIO()
+        call_command('bench_serializers', page_sizes=[5], repeat=2, stdout=out)
+        self.assertEqual(out.getvalue().splitlines()[1].split()[0], '5')
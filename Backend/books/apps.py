@@ -1,6 +1,29 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+
+    from .search import install_search_index
+
+    connection = connections[using]
+    applied = MigrationRecorder(connection).applied_migrations()
+    if ('books', '0003_book_search_index') in applied:
+        install_search_index(connection)
 
 
 class BooksConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'books'
+
+    def ready(self):
+        from Backend.metrics import register_collector
+
+        from . import signals  # noqa: F401
+        from .cache import cache_metrics
+
+        register_collector(cache_metrics)
+
+        post_migrate.connect(ensure_search_index, sender=self)
@@ -0,0 +1,52 @@
+from collections import defaultdict
+
+from .models import Author, BookAuthor, normalize_author_name, parse_authors, split_authors
+
+
+def get_or_create_authors(names):
+    """Map normalized name -> Author for ``names``, creating missing ones in bulk."""
+    wanted = {}
+    for name in names:
+        wanted.setdefault(normalize_author_name(name), name)
+    authors = {author.normalized_name: author for author in Author.objects.filter(normalized_name__in=wanted)}
+    missing = [Author(name=name, normalized_name=key) for key, name in wanted.items() if key not in authors]
+    if missing:
+        # ignore_conflicts covers a concurrent writer; it also leaves pks unset, so re-read.
+        Author.objects.bulk_create(missing, ignore_conflicts=True)
+        authors.update(
+            (author.normalized_name, author)
+            for author in Author.objects.filter(normalized_name__in=[author.normalized_name for author in missing])
+        )
+    return authors
+
+
+def sync_authors(books, created=False):
+    """
+    Bring the BookAuthor rows of ``books``, and their spelling of each name,
+    in line with their ``authors`` strings. Books whose entries already match are left alone; pass
+    ``created=True`` for just-inserted books to skip looking them up.
+    """
+    books = [book for book in books if book.pk is not None]
+    if not books:
+        return
+    desired = {book.pk: list(parse_authors(book.authors).items()) for book in books}
+
+    current = defaultdict(list)
+    if not created:
+        for book_id, key, name in (
+            BookAuthor.objects.filter(book_id__in=desired)
+            .order_by('book_id', 'position')
+            .values_list('book_id', 'author__normalized_name', 'name')
+        ):
+            current[book_id].append((key, name))
+    stale = {book.pk: book for book in books if current[book.pk] != desired[book.pk]}
+    if not stale:
+        return
+
+    authors = get_or_create_authors(name for book in stale.values() for name in split_authors(book.authors))
+    BookAuthor.objects.filter(book_id__in=[pk for pk in stale if current[pk]]).delete()
+    BookAuthor.objects.bulk_create([
+        BookAuthor(book_id=pk, author=authors[key], name=name, position=position)
+        for pk in stale
+        for position, (key, name) in enumerate(desired[pk])
+    ])
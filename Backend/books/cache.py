@@ -0,0 +1,200 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from Backend.replicas import pin_to_primary
+
+VERSION_KEY = 'books:version'
+# Set for REPLICA_STICKY_SECONDS after every invalidation.
+RECENT_WRITE_KEY = 'books:recently-written'
+HITS_KEY = 'books:cache:hits'
+MISSES_KEY = 'books:cache:misses'
+
+
+def get_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version.
+        cache.add(VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def aget_version():
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, int(time.time() * 1000), None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def invalidate_book_cache():
+    """Make every cached book response stale. Call after any write to books."""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, int(time.time() * 1000), None)
+    cache.set(RECENT_WRITE_KEY, True, settings.REPLICA_STICKY_SECONDS)
+
+
+def fill_from_primary():
+    """
+    Read from the primary if books changed within the replica lag window:
+    a response cached now is served to everyone until the next write, so
+    it must not come from a replica that has yet to see the last one.
+    """
+    if settings.DATABASE_REPLICAS and cache.get(RECENT_WRITE_KEY):
+        pin_to_primary()
+
+
+async def afill_from_primary():
+    if settings.DATABASE_REPLICAS and await cache.aget(RECENT_WRITE_KEY):
+        pin_to_primary()
+
+
+def normalize_params(query_params):
+    return urlencode(sorted(
+        (key, value)
+        for key in query_params
+        for value in query_params.getlist(key)
+        if value != ''
+    ))
+
+
+def request_digest(request, view_kwargs):
+    params = normalize_params(request.query_params)
+    kwargs = urlencode(sorted((key, str(value)) for key, value in view_kwargs.items()))
+    return hashlib.sha1(f'{request.get_host()}|{kwargs}|{params}'.encode()).hexdigest()
+
+
+def response_cache_key(scope, request, view_kwargs):
+    return f'books:{get_version()}:{scope}:{request_digest(request, view_kwargs)}'
+
+
+async def aresponse_cache_key(scope, request, view_kwargs):
+    return f'books:{await aget_version()}:{scope}:{request_digest(request, view_kwargs)}'
+
+
+def record(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+async def arecord(key):
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, None)
+        await cache.aincr(key)
+
+
+def cache_stats():
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else None,
+        'version': get_version(),
+    }
+
+
+def cache_metrics():
+    """Prometheus lines for Backend.metrics; the counters are shared by every worker."""
+    stats = cache_stats()
+    yield '# HELP book_cache_hits_total Book responses served from the shared cache.'
+    yield '# TYPE book_cache_hits_total counter'
+    yield f"book_cache_hits_total {stats['hits']}"
+    yield '# HELP book_cache_misses_total Book responses rendered and stored in the shared cache.'
+    yield '# TYPE book_cache_misses_total counter'
+    yield f"book_cache_misses_total {stats['misses']}"
+
+
+class CachedResponseMixin:
+    """
+    Serve GET responses from the shared cache. Keys include the book cache
+    version, so ``invalidate_book_cache()`` drops every entry at once.
+
+    Conditional-GET validator state is cached the same way, so a warm 304
+    costs no database queries; views provide ``compute_validator_state()``,
+    which by default returns None and so skips conditional GET.
+    """
+    cache_scope = None
+
+    def compute_validator_state(self):
+        return None
+
+    def get_validator_state(self):
+        key = response_cache_key(f'{self.cache_scope}:validators', self.request, self.kwargs)
+        state = cache.get(key)
+        if state is None:
+            fill_from_primary()
+            state = self.compute_validator_state()
+            if state is not None:
+                cache.set(key, state, settings.BOOK_CACHE_TIMEOUT)
+        return state
+
+    def get(self, request, *args, **kwargs):
+        key = response_cache_key(self.cache_scope, request, kwargs)
+        data = cache.get(key)
+        if data is not None:
+            record(HITS_KEY)
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        record(MISSES_KEY)
+        fill_from_primary()
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, settings.BOOK_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+        return response
+
+
+class AsyncCachedResponseMixin(CachedResponseMixin):
+    """
+    CachedResponseMixin for AsyncConditionalGetMixin views. Views override
+    ``acompute_validator_state()`` and ``aget_uncached_response()`` with
+    async ORM versions; by default both run their sync counterparts in a
+    thread.
+    """
+
+    async def acompute_validator_state(self):
+        return await sync_to_async(self.compute_validator_state)()
+
+    async def aget_uncached_response(self, request, *args, **kwargs):
+        # The view's own handler, below the caching in the MRO.
+        return await sync_to_async(super(CachedResponseMixin, self).get)(request, *args, **kwargs)
+
+    async def aget_validator_state(self):
+        key = await aresponse_cache_key(f'{self.cache_scope}:validators', self.request, self.kwargs)
+        state = await cache.aget(key)
+        if state is None:
+            await afill_from_primary()
+            state = await self.acompute_validator_state()
+            if state is not None:
+                await cache.aset(key, state, settings.BOOK_CACHE_TIMEOUT)
+        return state
+
+    async def aget_response(self, request, *args, **kwargs):
+        key = await aresponse_cache_key(self.cache_scope, request, kwargs)
+        data = await cache.aget(key)
+        if data is not None:
+            await arecord(HITS_KEY)
+            return Response(data, headers={'X-Cache': 'HIT'})
+
+        await arecord(MISSES_KEY)
+        await afill_from_primary()
+        response = await self.aget_uncached_response(request, *args, **kwargs)
+        if response.status_code == 200:
+            await cache.aset(key, response.data, settings.BOOK_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+        return response
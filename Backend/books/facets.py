@@ -0,0 +1,234 @@
+"""
+Book counts per genre, publication year and uploader.
+
+BookFacetCount rows are moved by FacetDelta whenever books are created,
+changed or deleted (signals, the importer). Facets for the genre, uploader
+and year filters are read from those rows; author and search filters are
+not part of the key, so with either of them the counts come from the
+matching books instead.
+"""
+import contextvars
+import itertools
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import reduce
+from operator import or_
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import ExtractYear
+from rest_framework.exceptions import ValidationError
+
+from .filters import BookFilter
+from .models import Book, BookFacetCount
+from .search import BookSearchFilter
+
+User = get_user_model()
+
+# Fields a change to which moves a book to other BookFacetCount rows.
+KEY_FIELDS = ('genre', 'publication_date', 'created_by')
+# Facet name (also its list filter) -> (BookFacetCount column, its roll-up value, Book column).
+FACETS = {
+    'genre': ('genre', BookFacetCount.ALL_GENRES, 'genre'),
+    'publication_year': ('year', BookFacetCount.ALL_YEARS, 'year'),
+    'created_by': ('uploader', BookFacetCount.ALL_UPLOADERS, 'created_by'),
+}
+TOP_UPLOADERS = 20
+
+pending_changes = contextvars.ContextVar('pending_book_facet_changes', default=None)
+
+
+def rollup_keys(genre, year, uploader):
+    """The eight (genre, year, uploader) rows a book with this key counts towards."""
+    return itertools.product(
+        (genre, BookFacetCount.ALL_GENRES),
+        (year, BookFacetCount.ALL_YEARS),
+        (uploader, BookFacetCount.ALL_UPLOADERS),
+    )
+
+
+def facet_key(book):
+    return book.genre, book.publication_date.year, book.created_by_id
+
+
+def stored_facet_key(pk):
+    """The key of book ``pk`` as currently saved, or None. Locks the row until the transaction ends."""
+    row = Book.objects.select_for_update().filter(pk=pk).values_list('genre', 'publication_date', 'created_by').first()
+    return None if row is None else (row[0], row[1].year, row[2])
+
+
+def touches_facets(update_fields):
+    return update_fields is None or any(field in update_fields for field in KEY_FIELDS)
+
+
+class FacetDelta:
+    """Net changes to BookFacetCount rows, written by save()."""
+
+    def __init__(self):
+        self.changes = Counter()
+
+    def count(self, key, change):
+        for row in rollup_keys(*key):
+            self.changes[row] += change
+
+    def add(self, *books):
+        for book in books:
+            self.count(facet_key(book), 1)
+
+    def remove(self, *books):
+        for book in books:
+            self.count(facet_key(book), -1)
+
+    def move(self, old_key, book):
+        # Roll-ups the two keys share (all of them for a change to the
+        # title) net out to 0 and are not written.
+        if old_key is not None:
+            self.count(old_key, -1)
+        self.add(book)
+
+    def save(self):
+        pending = pending_changes.get()
+        if pending is not None:
+            pending.changes.update(self.changes)
+        else:
+            # One UPDATE per distinct change rather than per row.
+            by_change = defaultdict(list)
+            for key, change in self.changes.items():
+                if change:
+                    by_change[change].append(key)
+            with transaction.atomic(savepoint=False):
+                for change, keys in by_change.items():
+                    apply_change(keys, change)
+        self.changes.clear()
+
+
+@contextmanager
+def batched_facet_changes():
+    """Write the facet changes made inside the block once, on the way out."""
+    pending = FacetDelta()
+    token = pending_changes.set(pending)
+    try:
+        yield
+    finally:
+        pending_changes.reset(token)
+    pending.save()
+
+
+def apply_change(keys, change):
+    """Add ``change`` to the rows ``keys``, creating the missing ones of an increment."""
+    rows = BookFacetCount.objects.filter(
+        reduce(or_, (Q(genre=genre, year=year, uploader=uploader) for genre, year, uploader in keys))
+    )
+    if rows.update(count=F('count') + change) == len(keys) or change < 0:
+        return
+    existing = set(rows.values_list('genre', 'year', 'uploader'))
+    missing = [key for key in keys if key not in existing]
+    try:
+        with transaction.atomic():
+            BookFacetCount.objects.bulk_create([
+                BookFacetCount(genre=genre, year=year, uploader=uploader, count=change)
+                for genre, year, uploader in missing
+            ])
+    except IntegrityError:
+        # A concurrent writer created some of them first; their insert won,
+        # so only the rows it did not create still lack this change.
+        for key in missing:
+            apply_change([key], change)
+
+
+def rebuild_facets():
+    """Recount every BookFacetCount row from the book table."""
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Hold off book writes so no change lands between the count and the swap.
+            with connection.cursor() as cursor:
+                cursor.execute('LOCK TABLE books_book IN SHARE MODE')
+        rows = (
+            Book.objects.order_by()
+            .values_list('genre', ExtractYear('publication_date'), 'created_by')
+            .annotate(total=Count('id'))
+        )
+        counts = Counter()
+        for genre, year, uploader, total in rows:
+            for key in rollup_keys(genre, year, uploader):
+                counts[key] += total
+        BookFacetCount.objects.all().delete()
+        BookFacetCount.objects.bulk_create([
+            BookFacetCount(genre=genre, year=year, uploader=uploader, count=total)
+            for (genre, year, uploader), total in counts.items()
+        ], batch_size=2000)
+    return len(counts)
+
+
+class BookFacets:
+    """
+    Facet counts for a book list request. Each facet applies every filter
+    but its own, so the genre counts stay useful while a genre is selected.
+    """
+
+    def __init__(self, request, view):
+        self.request = request
+        self.view = view
+        filterset = BookFilter(request.query_params, queryset=Book.objects.all(), request=request)
+        if not filterset.is_valid():
+            raise ValidationError(filterset.errors)
+        self.filters = {name: value for name, value in filterset.form.cleaned_data.items() if value not in (None, '')}
+        search = request.query_params.get(BookSearchFilter.search_param, '').strip()
+        self.from_aggregates = not search and 'author' not in self.filters
+
+    def counts(self, facet):
+        """``(value, count)`` pairs for ``facet``, or ``(id, username, count)`` for uploaders."""
+        if self.from_aggregates:
+            rows = self.stored_counts(facet)
+        else:
+            column = FACETS[facet][2]
+            fields = {'value': F(column)}
+            if facet == 'created_by':
+                fields['username'] = F('created_by__username')
+            rows = self.matching_books(exclude=facet).values(**fields).annotate(total=Count('id'))
+        if facet == 'created_by':
+            rows = rows.filter(total__gt=0).order_by('-total', 'value')[:TOP_UPLOADERS]
+            return [(row['value'], row['username'], row['total']) for row in rows]
+        return [(row['value'], row['total']) for row in rows.filter(total__gt=0)]
+
+    def stored_counts(self, facet):
+        # The rows for every value of the facet's column, with the other two
+        # columns at the filter's value or, when unfiltered, the roll-up.
+        lookups = {}
+        for name, (column, everything, _) in FACETS.items():
+            if name != facet:
+                value = self.filters.get(name, everything)
+                lookups[column] = getattr(value, 'pk', value)
+        column, everything, _ = FACETS[facet]
+        rows = BookFacetCount.objects.filter(**lookups).exclude(**{column: everything})
+        if facet == 'created_by':
+            usernames = User.objects.filter(pk=OuterRef('uploader')).values('username')
+            return rows.values(value=F(column), total=F('count'), username=Subquery(usernames))
+        return rows.values(value=F(column), total=F('count'))
+
+    def matching_books(self, exclude):
+        params = self.request.query_params.copy()
+        params.pop(exclude, None)
+        queryset = BookFilter(params, queryset=Book.objects.all(), request=self.request).qs
+        queryset = BookSearchFilter().filter_queryset(self.request, queryset, self.view)
+        return queryset.order_by().annotate(year=ExtractYear('publication_date'))
+
+    def as_dict(self):
+        genres = dict(self.counts('genre'))
+        selected = self.filters.get('genre')
+        return {
+            'count': genres.get(selected, 0) if selected else sum(genres.values()),
+            'genre': [
+                {'value': value, 'label': label, 'count': genres.get(value, 0)}
+                for value, label in Book.GENRE_CHOICES
+            ],
+            'publication_year': [
+                {'value': year, 'count': total}
+                for year, total in sorted(self.counts('publication_year'), reverse=True)
+            ],
+            'created_by': [
+                {'value': user_id, 'username': username, 'count': total}
+                for user_id, username, total in self.counts('created_by')
+            ],
+        }
@@ -0,0 +1,156 @@
+"""
+Book list rows built from values() queries by a BookSerializer compiled
+once per field selection, skipping model instances and DRF's per-field
+machinery. The output is identical to BookSerializer's.
+"""
+import functools
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from Backend.metrics import timed_serialization
+from .models import Book, BookAuthor
+from .serializers import BookSerializer, cover_rendition_urls
+
+# Fields whose to_representation returns the database value unchanged.
+PASSTHROUGH_FIELDS = (
+    serializers.CharField, serializers.ChoiceField, serializers.IntegerField, serializers.PrimaryKeyRelatedField,
+)
+# Fields converted by their own to_representation.
+CONVERTED_FIELDS = (serializers.DateField, serializers.DateTimeField)
+
+# Row key the page's author names are stored under before conversion.
+AUTHORS_KEY = '_authors_list'
+
+
+def author_names(book_ids):
+    """Ordered author names per book, as get_authors_list() reads them from the prefetch."""
+    names = {}
+    entries = BookAuthor.objects.filter(book_id__in=book_ids).order_by('position')
+    for book_id, name in entries.values_list('book_id', 'name'):
+        names.setdefault(book_id, []).append(name)
+    return names
+
+
+def authors_list(row, request):
+    return row[AUTHORS_KEY]
+
+
+def compile_field(field):
+    """
+    Return ``(columns, convert)`` reproducing ``field`` from a values() row,
+    where ``convert(row, request)`` returns the representation; None when
+    the field has no compiled form.
+    """
+    storage = Book._meta.get_field('cover_image').storage
+
+    if type(field) in PASSTHROUGH_FIELDS:
+        if getattr(field, 'pk_field', None) is not None:
+            return None
+        column = '__'.join(field.source_attrs)
+        return [column], lambda row, request: row[column]
+
+    if type(field) in CONVERTED_FIELDS:
+        column = '__'.join(field.source_attrs)
+        to_representation = field.to_representation
+
+        def convert(row, request):
+            value = row[column]
+            return None if value is None else to_representation(value)
+        return [column], convert
+
+    if type(field) is serializers.ImageField and field.source == 'cover_image':
+        if not getattr(field, 'use_url', True):
+            return None
+
+        def convert(row, request):
+            name = row['cover_image']
+            if not name:
+                return None
+            url = storage.url(name)
+            return request.build_absolute_uri(url) if request else url
+        return ['cover_image'], convert
+
+    if type(field) is serializers.SerializerMethodField and field.method_name == 'get_cover_renditions':
+        return ['cover_image', 'cover_renditions'], lambda row, request: cover_rendition_urls(
+            row['cover_renditions'], row['cover_image'], storage, request
+        )
+
+    if type(field) is serializers.ListField and field.source == 'get_authors_list':
+        return [], authors_list
+
+    return None
+
+
+class CompiledBookSerializer:
+    def __init__(self, columns, converters):
+        self.columns = columns
+        self.converters = converters
+        # Author names come from one query per page, like the prefetch.
+        self.with_authors = any(convert is authors_list for name, convert in converters)
+
+    def values(self, queryset):
+        """``queryset`` as the rows serialize() reads, plus its ordering columns for keyset cursors."""
+        ordering = [
+            field.lstrip('-') for field in queryset.query.order_by or queryset.model._meta.ordering
+            if isinstance(field, str) and field != '?'
+        ]
+        return queryset.prefetch_related(None).values(*dict.fromkeys(self.columns + ordering))
+
+    def load_authors(self, rows):
+        names = author_names([row['id'] for row in rows])
+        for row in rows:
+            row[AUTHORS_KEY] = names.get(row['id'], [])
+
+    def represent(self, rows, request=None):
+        converters = self.converters
+        with timed_serialization():
+            return [{name: convert(row, request) for name, convert in converters} for row in rows]
+
+    def serialize(self, rows, request=None):
+        if self.with_authors:
+            self.load_authors(rows)
+        return self.represent(rows, request)
+
+
+@functools.lru_cache(maxsize=64)
+def compile_book_serializer(names):
+    """
+    A CompiledBookSerializer for the BookSerializer fields ``names`` (a
+    tuple, in output order), or None if any of them cannot be compiled.
+    """
+    fields = BookSerializer().fields
+    columns, converters = ['id'], []
+    for name in names:
+        compiled = compile_field(fields[name])
+        if compiled is None:
+            return None
+        field_columns, convert = compiled
+        columns.extend(column for column in field_columns if column not in columns)
+        converters.append((name, convert))
+    return CompiledBookSerializer(columns, converters)
+
+
+class FastBookListMixin:
+    """
+    Serve list GETs through compile_book_serializer() when
+    BOOK_LIST_FAST_PATH is on, falling back to the serializer for field
+    selections it cannot compile.
+    """
+
+    def list(self, request, *args, **kwargs):
+        response = self.fast_list(request) if settings.BOOK_LIST_FAST_PATH else None
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return response
+
+    def fast_list(self, request):
+        compiled = compile_book_serializer(tuple(self.get_read_serializer().fields))
+        if compiled is None:
+            return None
+        rows = compiled.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is None:
+            return Response(compiled.serialize(list(rows), request))
+        return self.get_paginated_response(compiled.serialize(page, request))
@@ -0,0 +1,17 @@
+import django_filters
+
+from .models import Book, normalize_author_name
+
+
+class BookFilter(django_filters.FilterSet):
+    # Exact, case- and whitespace-insensitive match on one author, served by
+    # the unique index on Author.normalized_name rather than a LIKE scan.
+    author = django_filters.CharFilter(method='filter_author')
+    publication_year = django_filters.NumberFilter(field_name='publication_date', lookup_expr='year')
+
+    class Meta:
+        model = Book
+        fields = ['genre', 'created_by', 'author', 'publication_year']
+
+    def filter_author(self, queryset, name, value):
+        return queryset.filter(author_entries__normalized_name=normalize_author_name(value))
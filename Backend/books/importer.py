@@ -0,0 +1,202 @@
+import csv
+import io
+import json
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .authors import sync_authors
+from .cache import invalidate_book_cache
+from .facets import FacetDelta
+from .models import Book
+from .serializers import BookCreateUpdateSerializer
+
+FORMATS = ('csv', 'jsonl')
+CONFLICT_POLICIES = ('skip', 'update')
+IMPORT_FIELDS = ['title', 'authors', 'genre', 'publication_date', 'description', 'isbn', 'pages']
+
+
+class BookImportSerializer(BookCreateUpdateSerializer):
+    # ISBN conflicts are resolved per batch by the importer, not per row by
+    # a UniqueValidator query.
+    isbn = serializers.CharField(max_length=13, required=False, allow_blank=True, allow_null=True)
+
+    class Meta(BookCreateUpdateSerializer.Meta):
+        fields = IMPORT_FIELDS
+
+
+class ImportReport:
+    def __init__(self, max_errors=1000):
+        self.created = 0
+        self.updated = 0
+        self.skipped = 0
+        self.error_count = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    def add_error(self, row, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': row, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'skipped': self.skipped,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+def detect_format(filename, default='csv'):
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.csv'):
+        return 'csv'
+    return default
+
+
+def read_rows(stream, file_format):
+    """
+    Yield ``(row_number, data, error)`` from a binary stream, one row at a
+    time, so files of any size are never held in memory. Text that is not
+    UTF-8, or not CSV, ends the rows with an error for the row it is in.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    rows = read_csv(text) if file_format == 'csv' else read_jsonl(text)
+    number = 0
+    try:
+        for number, data, error in rows:
+            yield number, data, error
+    except UnicodeDecodeError as e:
+        yield number + 1, None, {'non_field_errors': [f'The file is not UTF-8 text ({e.reason}); no further rows were read.']}
+    except csv.Error as e:
+        yield number + 1, None, {'non_field_errors': [f'Invalid CSV: {e}; no further rows were read.']}
+
+
+def read_csv(text):
+    for number, row in enumerate(csv.DictReader(text), start=1):
+        # CSV cannot tell a missing value from an empty one; treat both as missing.
+        yield number, {key: value for key, value in row.items() if key and value not in ('', None)}, None
+
+
+def read_jsonl(text):
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError as e:
+            yield number, None, {'non_field_errors': [f'Invalid JSON: {e}']}
+            continue
+        if not isinstance(data, dict):
+            yield number, None, {'non_field_errors': ['Each line must be a JSON object.']}
+            continue
+        yield number, data, None
+
+
+def import_books(rows, user, on_conflict='skip', batch_size=1000, report=None):
+    """
+    Validate rows with the same rules as the book API and write them in
+    batches. Rows whose ISBN already exists are skipped or, with
+    ``on_conflict='update'``, update the existing book when ``user`` owns it.
+    """
+    report = report or ImportReport()
+    batch = []
+    for number, data, error in rows:
+        if error is not None:
+            report.add_error(number, error)
+            continue
+        serializer = BookImportSerializer(data=data)
+        if not serializer.is_valid():
+            report.add_error(number, {
+                field: [str(message) for message in messages]
+                for field, messages in serializer.errors.items()
+            })
+            continue
+        validated = serializer.validated_data
+        validated['isbn'] = validated.get('isbn') or None
+        batch.append((number, validated))
+        if len(batch) >= batch_size:
+            write_batch(batch, user, on_conflict, report)
+            batch = []
+    if batch:
+        write_batch(batch, user, on_conflict, report)
+    if report.created or report.updated:
+        # bulk_create/bulk_update send no signals.
+        invalidate_book_cache()
+    return report
+
+
+def existing_books(isbns):
+    return {book.isbn: book for book in Book.objects.filter(isbn__in=isbns)}
+
+
+def plan_batch(batch, user, on_conflict):
+    """Sort a batch into books to create and to update, rows skipped and row errors."""
+    isbns = {data['isbn'] for _, data in batch if data['isbn']}
+    existing = existing_books(isbns)
+    pending = {}
+    to_create, to_update = [], {}
+    skipped, errors = 0, []
+    facets = FacetDelta()
+    now = timezone.now()
+
+    for number, data in batch:
+        isbn = data['isbn']
+        book = existing.get(isbn) if isbn else None
+        if book is None and isbn in pending:
+            book = pending[isbn]
+
+        if book is None:
+            book = Book(created_by=user, **data)
+            to_create.append(book)
+            if isbn:
+                pending[isbn] = book
+            continue
+
+        if on_conflict != 'update':
+            skipped += 1
+            continue
+        if book.created_by_id != user.pk:
+            errors.append((number, {'isbn': ['A book with this ISBN belongs to another user.']}))
+            continue
+        if book.pk is not None and book.pk not in to_update:
+            facets.remove(book)
+        for field, value in data.items():
+            setattr(book, field, value)
+        if book.pk is not None:
+            book.updated_at = now
+            to_update[book.pk] = book
+    return to_create, list(to_update.values()), skipped, errors, facets
+
+
+def write_batch(batch, user, on_conflict, report, attempts=3):
+    for attempt in range(1, attempts + 1):
+        to_create, to_update, skipped, errors, facets = plan_batch(batch, user, on_conflict)
+        try:
+            with transaction.atomic():
+                Book.objects.bulk_create(to_create)
+                if to_update:
+                    Book.objects.bulk_update(to_update, IMPORT_FIELDS + ['updated_at'])
+                sync_authors(to_create, created=True)
+                sync_authors(to_update)
+                facets.add(*to_create, *to_update)
+                facets.save()
+            break
+        except IntegrityError as e:
+            # Typically a book saved with one of the batch's ISBNs since the
+            # lookup; planning the batch again finds it.
+            if attempt == attempts:
+                for number, _ in batch:
+                    report.add_error(number, {'non_field_errors': [f'Could not be saved: {e}']})
+                return
+
+    report.created += len(to_create)
+    report.updated += len(to_update)
+    report.skipped += skipped
+    for number, error in errors:
+        report.add_error(number, error)
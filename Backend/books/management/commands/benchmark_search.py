@@ -0,0 +1,92 @@
+import datetime
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+
+from books.cache import invalidate_book_cache
+from books.facets import rebuild_facets
+from books.models import Book
+from books.search import search_books
+
+User = get_user_model()
+
+WORDS = (
+    'shadow river empire garden winter silent machine ocean crown forest '
+    'memory storm letter island kingdom secret voyage mirror engine harvest '
+    'desert whisper lantern orchard citadel compass ember falcon glacier'
+).split()
+QUERIES = ['river', 'silent garden', 'emp', 'crown of winter', 'falcon glac', 'mirror engine harvest']
+
+
+class Command(BaseCommand):
+    help = "Compare full-text book search against the old icontains SearchFilter."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=100_000, help="Number of synthetic books to load.")
+        parser.add_argument('--repeat', type=int, default=5, help="Timed runs per query.")
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--keep', action='store_true', help="Keep the synthetic books instead of rolling back.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['books'], options['batch_size'])
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute('ANALYZE books_book')
+
+            self.stdout.write(f"{Book.objects.count()} books on {connection.vendor}")
+            self.stdout.write(f"{'query':<24}{'icontains p50':>16}{'full-text p50':>16}{'speedup':>10}")
+            for query in QUERIES:
+                legacy = self.measure(lambda: self.legacy_search(query), options['repeat'])
+                fulltext = self.measure(lambda: self.fulltext_search(query), options['repeat'])
+                self.stdout.write(
+                    f"{query:<24}{legacy * 1000:>14.1f}ms{fulltext * 1000:>14.1f}ms{legacy / fulltext:>9.1f}x"
+                )
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+            else:
+                # bulk_create sends no signals, so count the new books here.
+                rebuild_facets()
+        if options['keep']:
+            invalidate_book_cache()
+
+    def seed(self, total, batch_size):
+        user, _ = User.objects.get_or_create(
+            email='benchmark@example.com', defaults={'username': 'benchmark'}
+        )
+        rng = random.Random(42)
+        for start in range(0, total, batch_size):
+            Book.objects.bulk_create([
+                Book(
+                    title='_'.join(rng.sample(WORDS, 3)),
+                    authors=f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}',
+                    genre=rng.choice(Book.GENRE_CHOICES)[0],
+                    publication_date=datetime.date(rng.randint(1900, 2024), 1, 1),
+                    description=' '.join(rng.choices(WORDS, k=40)),
+                    created_by=user,
+                )
+                for _ in range(min(batch_size, total - start))
+            ])
+
+    def legacy_search(self, query):
+        condition = Q()
+        for term in query.split():
+            condition &= Q(title__icontains=term) | Q(authors__icontains=term) | Q(description__icontains=term)
+        return list(Book.objects.filter(condition).order_by('-created_at')[:20])
+
+    def fulltext_search(self, query):
+        return list(search_books(Book.objects.all(), query).order_by('-search_rank', '-created_at')[:20])
+
+    def measure(self, run, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
@@ -0,0 +1,189 @@
+import datetime
+import json
+import random
+import re
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve, reverse
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from books.authors import sync_authors
+from books.cache import invalidate_book_cache
+from books.models import Author, Book
+from reading_lists.models import ReadingList, ReadingListItem
+
+User = get_user_model()
+
+WORDS = (
+    'shadow river empire garden winter silent machine ocean crown forest '
+    'memory storm letter island kingdom secret voyage mirror engine harvest'
+).split()
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (\S+)(?: AS \S+)?$')
+
+
+class Command(BaseCommand):
+    help = (
+        "Request each list/detail endpoint, EXPLAIN every SELECT it runs and "
+        "fail if a filtered or ordered query falls back to a sequential scan "
+        "of a large table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true', help="Load synthetic data first (rolled back afterwards).")
+        parser.add_argument('--books', type=int, default=50_000, help="Books to load with --seed.")
+        parser.add_argument('--users', type=int, default=200, help="Users to load with --seed.")
+        parser.add_argument('--min-rows', type=int, default=1_000, help="Tables smaller than this may be scanned.")
+        parser.add_argument(
+            '--disable-seqscan', action='store_true',
+            help=(
+                "On PostgreSQL, price sequential scans out, so one only shows up when no index can serve "
+                "the query. For small data sets, where the planner rightly prefers scanning; leave it off "
+                "at realistic sizes to catch indexes the planner passes over."
+            ),
+        )
+        parser.add_argument('--verbose-plans', action='store_true', help="Print every plan, not just regressions.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['books'], options['users'])
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+                if options['disable_seqscan'] and connection.vendor == 'postgresql':
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            # Make sure cached responses do not hide the queries.
+            invalidate_book_cache()
+
+            regressions = self.check_endpoints(options['min_rows'], options['verbose_plans'])
+            transaction.set_rollback(True)
+
+        if regressions:
+            raise CommandError(f"{regressions} query plan(s) use a sequential scan of a large table.")
+        self.stdout.write(self.style.SUCCESS("All endpoint queries use indexes."))
+
+    def endpoints(self):
+        book = Book.objects.order_by('-created_at').first()
+        if book is None:
+            raise CommandError("No books to query; pass --seed.")
+        user = book.created_by
+        author = Author.objects.filter(books=book).first()
+        reading_list = ReadingList.objects.filter(user=user).first()
+        book_list = reverse('book-list-create')
+
+        yield 'book list', user, book_list, {}
+        yield 'book list, keyset', user, book_list, {'pagination': 'keyset'}
+        yield 'book list by genre', user, book_list, {'genre': book.genre}
+        yield 'book list by owner', user, book_list, {'created_by': user.pk}
+        if author:
+            yield 'book list by author', user, book_list, {'author': author.name}
+        yield 'book list by title', user, book_list, {'ordering': 'title'}
+        yield 'book list by publication date', user, book_list, {'ordering': '-publication_date'}
+        yield 'book search', user, book_list, {'search': book.title.split('_')[0]}
+        yield 'book detail', user, reverse('book-detail', args=[book.pk]), {}
+        yield 'reading lists', user, reverse('reading-list-list-create'), {}
+        if reading_list:
+            yield 'reading list detail', user, reverse('reading-list-detail', args=[reading_list.pk]), {}
+
+    def check_endpoints(self, min_rows, verbose):
+        factory = APIRequestFactory()
+        tables = set(connection.introspection.table_names())
+        table_sizes = {}
+        regressions = 0
+        for name, user, path, params in self.endpoints():
+            request = factory.get(path, params)
+            force_authenticate(request, user=user)
+            match = resolve(path)
+            # Pagination builds absolute links from the request host.
+            with override_settings(ALLOWED_HOSTS=['testserver']), CaptureQueriesContext(connection) as queries:
+                view = match.func
+                if iscoroutinefunction(view):
+                    view = async_to_sync(view)
+                response = view(request, *match.args, **match.kwargs)
+                response.render()
+            if response.status_code != 200:
+                raise CommandError(f"{name}: {path} returned {response.status_code}")
+
+            self.stdout.write(f"{name} ({len(queries)} queries)")
+            for query in queries:
+                sql = query['sql']
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                scans, plan = self.full_scans(sql)
+                large = [
+                    table for table in scans
+                    if table in tables and self.table_size(table, table_sizes) >= min_rows
+                ]
+                flagged = large and re.search(r'\b(WHERE|ORDER BY)\b', sql)
+                if flagged:
+                    regressions += 1
+                    self.stdout.write(self.style.ERROR(f"  sequential scan of {', '.join(large)}: {sql[:200]}"))
+                if verbose or flagged:
+                    for line in plan:
+                        self.stdout.write(f"    {line}")
+        return regressions
+
+    def full_scans(self, sql):
+        """Return the tables scanned without an index, and the plan as text lines."""
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                scans, lines = [], []
+                self.walk_postgres_plan(plan[0]['Plan'], scans, lines, 0)
+                return scans, lines
+            if connection.vendor == 'sqlite':
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                lines = [row[3] for row in cursor.fetchall()]
+                scans = [match.group(1) for match in map(SQLITE_FULL_SCAN.match, lines) if match]
+                return scans, lines
+        raise CommandError(f"EXPLAIN is not supported on {connection.vendor}.")
+
+    def walk_postgres_plan(self, node, scans, lines, depth):
+        relation = node.get('Relation Name')
+        lines.append('  ' * depth + node['Node Type'] + (f' on {relation}' if relation else ''))
+        if node['Node Type'] == 'Seq Scan':
+            scans.append(relation)
+        for child in node.get('Plans', []):
+            self.walk_postgres_plan(child, scans, lines, depth + 1)
+
+    def table_size(self, table, sizes):
+        if table not in sizes:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                sizes[table] = cursor.fetchone()[0]
+        return sizes[table]
+
+    def seed(self, total_books, total_users):
+        rng = random.Random(42)
+        users = User.objects.bulk_create([
+            User(username=f'plan-check-{i}', email=f'plan-check-{i}@example.com')
+            for i in range(total_users)
+        ])
+        for start in range(0, total_books, 5_000):
+            books = Book.objects.bulk_create([
+                Book(
+                    title='_'.join(rng.sample(WORDS, 3)),
+                    authors=f'{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}',
+                    genre=rng.choice(Book.GENRE_CHOICES)[0],
+                    publication_date=datetime.date(rng.randint(1900, 2024), 1, 1),
+                    created_by=rng.choice(users),
+                )
+                for _ in range(min(5_000, total_books - start))
+            ])
+            sync_authors(books, created=True)
+
+        book_ids = list(Book.objects.values_list('pk', flat=True))
+        reading_lists = ReadingList.objects.bulk_create([
+            ReadingList(name=f'List {i}', user=user) for user in users for i in range(5)
+        ])
+        ReadingListItem.objects.bulk_create([
+            ReadingListItem(reading_list=reading_list, book_id=book_id, order=position)
+            for reading_list in reading_lists
+            for position, book_id in enumerate(rng.sample(book_ids, min(20, len(book_ids))))
+        ], batch_size=5_000)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from books.models import Book
+from books.renditions import generate_renditions, needs_renditions
+
+
+class Command(BaseCommand):
+    help = "Generate cover thumbnails for books whose renditions are missing or stale."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help="Regenerate renditions that are up to date.")
+        parser.add_argument('--book', type=int, action='append', dest='books', help="Only this book id (repeatable).")
+
+    def handle(self, *args, **options):
+        books = Book.objects.exclude(cover_image='').exclude(cover_image__isnull=True).only(
+            'id', 'cover_image', 'cover_renditions'
+        )
+        if options['books']:
+            books = books.filter(pk__in=options['books'])
+
+        done = failed = 0
+        for book in books.iterator(chunk_size=500):
+            if not options['force'] and not needs_renditions(book):
+                continue
+            try:
+                generate_renditions(book.pk)
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f"Book {book.pk}: {e}")
+                continue
+            done += 1
+        self.stdout.write(f"Generated renditions for {done} book(s), {failed} failed.")
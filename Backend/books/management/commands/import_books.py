@@ -0,0 +1,39 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from books.importer import CONFLICT_POLICIES, FORMATS, ImportReport, detect_format, import_books, read_rows
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Stream books from a CSV or JSON-lines file (or - for stdin) into the catalogue."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', required=True, help="Email of the user the books are created by.")
+        parser.add_argument('--format', choices=FORMATS, help="Defaults to the file extension, else csv.")
+        parser.add_argument('--on-conflict', choices=CONFLICT_POLICIES, default='skip')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--max-errors', type=int, default=100, help="Errors to print in the report.")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user with email {options['user']}")
+
+        file_format = options['format'] or detect_format(options['path'])
+        report = ImportReport(max_errors=options['max_errors'])
+        if options['path'] == '-':
+            rows = read_rows(sys.stdin.buffer, file_format)
+            import_books(rows, user, options['on_conflict'], options['batch_size'], report)
+        else:
+            with open(options['path'], 'rb') as stream:
+                rows = read_rows(stream, file_format)
+                import_books(rows, user, options['on_conflict'], options['batch_size'], report)
+
+        self.stdout.write(json.dumps(report.as_dict(), indent=2))
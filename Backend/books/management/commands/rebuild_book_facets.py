@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from books.cache import invalidate_book_cache
+from books.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the per genre/year/uploader book counts behind /api/book/facets/ "
+        "from the book table, e.g. after bulk changes made outside the ORM."
+    )
+
+    def handle(self, *args, **options):
+        rows = rebuild_facets()
+        invalidate_book_cache()
+        self.stdout.write(f"Rebuilt {rows} facet rows.")
@@ -0,0 +1,100 @@
+from django.db import migrations
+
+# The schema as of this migration; books.search installs the current one.
+POSTGRES_INSTALL = [
+    "ALTER TABLE books_book ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION books_book_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.authors, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS books_book_search_vector_trigger ON books_book",
+    """
+    CREATE TRIGGER books_book_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, authors, description ON books_book
+    FOR EACH ROW EXECUTE FUNCTION books_book_search_vector_update()
+    """,
+    "CREATE INDEX IF NOT EXISTS books_book_search_vector_idx ON books_book USING GIN (search_vector)",
+]
+POSTGRES_BACKFILL = "UPDATE books_book SET title = title WHERE search_vector IS NULL"
+POSTGRES_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS books_book_search_vector_trigger ON books_book",
+    "DROP FUNCTION IF EXISTS books_book_search_vector_update()",
+    "ALTER TABLE books_book DROP COLUMN IF EXISTS search_vector",
+]
+
+# External-content FTS5 table kept in sync by triggers.
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_book_fts USING fts5(
+        title, authors, description,
+        content='books_book', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_book_fts_insert AFTER INSERT ON books_book BEGIN
+        INSERT INTO books_book_fts(rowid, title, authors, description)
+        VALUES (new.id, new.title, new.authors, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_book_fts_delete AFTER DELETE ON books_book BEGIN
+        INSERT INTO books_book_fts(books_book_fts, rowid, title, authors, description)
+        VALUES ('delete', old.id, old.title, old.authors, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_book_fts_update
+    AFTER UPDATE OF title, authors, description ON books_book BEGIN
+        INSERT INTO books_book_fts(books_book_fts, rowid, title, authors, description)
+        VALUES ('delete', old.id, old.title, old.authors, old.description);
+        INSERT INTO books_book_fts(rowid, title, authors, description)
+        VALUES (new.id, new.title, new.authors, new.description);
+    END
+    """,
+]
+SQLITE_BACKFILL = "INSERT INTO books_book_fts(books_book_fts) VALUES ('rebuild')"
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS books_book_fts_insert",
+    "DROP TRIGGER IF EXISTS books_book_fts_delete",
+    "DROP TRIGGER IF EXISTS books_book_fts_update",
+    "DROP TABLE IF EXISTS books_book_fts",
+]
+
+
+def run(schema_editor, statements):
+    with schema_editor.connection.cursor() as cursor:
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            cursor.execute(statement)
+
+
+def install(apps, schema_editor):
+    run(schema_editor, {
+        'postgresql': POSTGRES_INSTALL + [POSTGRES_BACKFILL],
+        'sqlite': SQLITE_INSTALL + [SQLITE_BACKFILL],
+    })
+
+
+def uninstall(apps, schema_editor):
+    run(schema_editor, {
+        'postgresql': POSTGRES_UNINSTALL,
+        'sqlite': SQLITE_UNINSTALL,
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,45 @@
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def normalize_author_name(name):
+    return ' '.join(name.split()).casefold()
+
+
+def split_authors(authors):
+    return [' '.join(name.split()) for name in authors.split(',') if name.strip()]
+
+
+def split_existing_authors(apps, schema_editor):
+    Author = apps.get_model('books', 'Author')
+    Book = apps.get_model('books', 'Book')
+    BookAuthor = apps.get_model('books', 'BookAuthor')
+
+    author_ids = {}
+    entries = []
+    for book_id, authors in Book.objects.order_by('pk').values_list('pk', 'authors').iterator(chunk_size=BATCH_SIZE):
+        keys = []
+        for name in split_authors(authors):
+            key = normalize_author_name(name)
+            if key in keys:
+                continue
+            keys.append(key)
+            if key not in author_ids:
+                author_ids[key] = Author.objects.create(name=name, normalized_name=key).pk
+            entries.append(BookAuthor(book_id=book_id, author_id=author_ids[key], position=len(keys) - 1))
+        if len(entries) >= BATCH_SIZE:
+            BookAuthor.objects.bulk_create(entries)
+            entries = []
+    BookAuthor.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0005_author'),
+    ]
+
+    operations = [
+        migrations.RunPython(split_existing_authors, migrations.RunPython.noop),
+    ]
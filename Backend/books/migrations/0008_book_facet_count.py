@@ -0,0 +1,52 @@
+# Generated by Django 5.2.5 on 2026-10-18 07:11
+
+import itertools
+from collections import Counter
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import ExtractYear
+
+
+def count_existing_books(apps, schema_editor):
+    Book = apps.get_model('books', 'Book')
+    BookFacetCount = apps.get_model('books', 'BookFacetCount')
+    counts = Counter()
+    rows = (
+        Book.objects.order_by()
+        .values_list('genre', ExtractYear('publication_date'), 'created_by')
+        .annotate(total=Count('id'))
+    )
+    for genre, year, uploader, total in rows:
+        # Every combination of each value and its roll-up ('' / 0 for all).
+        for key in itertools.product((genre, ''), (year, 0), (uploader, 0)):
+            counts[key] += total
+    BookFacetCount.objects.bulk_create([
+        BookFacetCount(genre=genre, year=year, uploader=uploader, count=total)
+        for (genre, year, uploader), total in counts.items()
+    ], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0007_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('genre', models.CharField(blank=True, choices=[('fiction', 'Fiction'), ('non_fiction', 'Non-Fiction'), ('mystery', 'Mystery'), ('romance', 'Romance'), ('sci_fi', 'Science Fiction'), ('fantasy', 'Fantasy'), ('biography', 'Biography'), ('history', 'History'), ('self_help', 'Self Help'), ('other', 'Other')], max_length=20)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('uploader', models.PositiveBigIntegerField()),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['year', 'uploader'], name='book_facet_year_idx')],
+                'constraints': [models.UniqueConstraint(fields=('genre', 'year', 'uploader'), name='book_facet_key')],
+            },
+        ),
+        migrations.RunPython(count_existing_books, migrations.RunPython.noop),
+    ]
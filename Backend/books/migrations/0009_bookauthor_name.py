@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def normalize_author_name(name):
+    return ' '.join(name.split()).casefold()
+
+
+def fill_names(apps, schema_editor):
+    """Set each entry's name to the spelling in its book's ``authors`` string."""
+    Book = apps.get_model('books', 'Book')
+    BookAuthor = apps.get_model('books', 'BookAuthor')
+
+    books = Book.objects.order_by('pk').values_list('pk', 'authors')
+    for start in range(0, books.count(), BATCH_SIZE):
+        spellings = {}
+        for book_id, authors in books[start:start + BATCH_SIZE]:
+            for name in authors.split(','):
+                name = ' '.join(name.split())
+                if name:
+                    spellings.setdefault((book_id, normalize_author_name(name)), name)
+        entries = list(
+            BookAuthor.objects.filter(book_id__in={book_id for book_id, _ in spellings})
+            .select_related('author')
+        )
+        for entry in entries:
+            entry.name = spellings.get((entry.book_id, entry.author.normalized_name), entry.author.name)
+        BookAuthor.objects.bulk_update(entries, ['name'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0008_book_facet_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bookauthor',
+            name='name',
+            field=models.CharField(default='', max_length=255),
+            preserve_default=False,
+        ),
+        migrations.RunPython(fill_names, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,49 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+
+def normalize_author_name(name):
+    return ' '.join(name.split()).casefold()
+
+
+def split_authors(authors):
+    return [' '.join(name.split()) for name in authors.split(',') if name.strip()]
+
+
+def parse_authors(authors):
+    """Normalized name -> name as first spelled, for each distinct author in ``authors``."""
+    names = {}
+    for name in split_authors(authors):
+        names.setdefault(normalize_author_name(name), name)
+    return names
+
+
+class BookQuerySet(models.QuerySet):
+    def with_owner(self):
+        return self.select_related('created_by')
+
+    def with_authors(self):
+        return self.prefetch_related(authors_prefetch())
+
+
+def authors_prefetch(lookup='book_authors'):
+    """Prefetch of the ordered author entries get_authors_list() reads; ``lookup`` may go through a relation."""
+    return models.Prefetch(lookup, queryset=BookAuthor.objects.order_by('position'))
+
+
+class Author(models.Model):
+    name = models.CharField(max_length=255)
+    normalized_name = models.CharField(max_length=255, unique=True)
+
+    class Meta:
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
 class Book(models.Model):
     GENRE_CHOICES = [
         ('fiction', 'Fiction'),
@@ -23,17 +64,89 @@ class Book(models.Model):
     publication_date = models.DateField()
     description = models.TextField(blank=True)
     cover_image = models.ImageField(upload_to='book_covers/', blank=True, null=True)
+    # Filled in by books.renditions after upload: {'source': ..., 'thumb': {'webp': ..., 'jpeg': ...}, ...}
+    cover_renditions = models.JSONField(default=dict, blank=True, editable=False)
     isbn = models.CharField(max_length=13, unique=True, blank=True, null=True)
     pages = models.PositiveIntegerField(blank=True, null=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='uploaded_books')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Kept in step with `authors` by books.authors.sync_authors.
+    author_entries = models.ManyToManyField(Author, through='BookAuthor', related_name='books')
+
+    objects = BookQuerySet.as_manager()
     
     class Meta:
         ordering = ['-created_at']
+        # One index per list access path: the default ordering, each filter
+        # combined with it, and each alternative ordering. Trailing id matches
+        # the keyset pagination tie-breaker.
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='book_created_idx'),
+            models.Index(fields=['genre', '-created_at', '-id'], name='book_genre_created_idx'),
+            models.Index(fields=['created_by', '-created_at', '-id'], name='book_owner_created_idx'),
+            models.Index(fields=['title', 'id'], name='book_title_idx'),
+            models.Index(fields=['publication_date', 'id'], name='book_pubdate_idx'),
+        ]
     
     def __str__(self):
         return f"{self.title} by {self.authors}"
+
+    def save(self, *args, **kwargs):
+        # books.signals reads the stored facet key, locking the row, before
+        # the write and moves the counts after it. Doing both in the save's
+        # transaction makes concurrent edits of a book take turns, so they
+        # never both move counts off the same old key.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
     
     def get_authors_list(self):
-        return [author.strip() for author in self.authors.split(',')]
\ No newline at end of file
+        if 'book_authors' in getattr(self, '_prefetched_objects_cache', {}):
+            return [entry.name for entry in self.book_authors.all()]
+        return list(parse_authors(self.authors).values())
+
+
+class BookAuthor(models.Model):
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name='book_authors')
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='book_authors')
+    # As this book spells it; Author.name keeps the first spelling seen anywhere.
+    name = models.CharField(max_length=255)
+    position = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        unique_together = ['book', 'author']
+        ordering = ['position']
+
+    def __str__(self):
+        return f"{self.author.name} ({self.book.title})"
+
+
+class BookFacetCount(models.Model):
+    """
+    Number of books per genre, publication year and uploader, kept current
+    by books.facets. Each book also counts towards the rows that roll up
+    any of the three: ALL_GENRES, ALL_YEARS and ALL_UPLOADERS stand for
+    every value, so any facet is read from the handful of rows it returns.
+    """
+    ALL_GENRES = ''
+    ALL_YEARS = 0
+    ALL_UPLOADERS = 0
+
+    genre = models.CharField(max_length=20, choices=Book.GENRE_CHOICES, blank=True)
+    year = models.PositiveSmallIntegerField()
+    # The uploader's user id, not a foreign key as ALL_UPLOADERS is no user.
+    # Deleting a user deletes their books, and so takes their counts to 0.
+    uploader = models.PositiveBigIntegerField()
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['genre', 'year', 'uploader'], name='book_facet_key'),
+        ]
+        indexes = [
+            # The key's index serves lookups by genre; this one the genre facet.
+            models.Index(fields=['year', 'uploader'], name='book_facet_year_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.genre or '*'}/{self.year or '*'}/{self.uploader or '*'}: {self.count}"
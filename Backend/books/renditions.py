@@ -0,0 +1,79 @@
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from jobs.queue import enqueue
+
+from .cache import invalidate_book_cache
+from .models import Book
+
+RENDITIONS = {
+    'thumb': (160, 240),
+    'card': (320, 480),
+}
+FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+def needs_renditions(book):
+    return (book.cover_image.name or None) != book.cover_renditions.get('source')
+
+
+def schedule_renditions(book_id):
+    """Queue a job generating the renditions; it runs once the current transaction commits."""
+    enqueue('books.generate_renditions', book_id=book_id)
+
+
+def render(image, size, file_format, options):
+    rendition = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+    if file_format == 'JPEG' and rendition.mode != 'RGB':
+        background = Image.new('RGB', rendition.size, (255, 255, 255))
+        background.paste(rendition, mask=rendition.getchannel('A') if 'A' in rendition.getbands() else None)
+        rendition = background
+    buffer = io.BytesIO()
+    rendition.save(buffer, file_format, **options)
+    return buffer.getvalue()
+
+
+def generate_renditions(book_id):
+    """
+    Write a fixed-size WebP and JPEG for each of RENDITIONS next to the
+    book's cover and record their paths in ``Book.cover_renditions``.
+    """
+    book = Book.objects.filter(pk=book_id).only('id', 'cover_image', 'cover_renditions').first()
+    if book is None:
+        return
+    storage = book.cover_image.storage
+    source = book.cover_image.name or None
+    previous = book.cover_renditions
+
+    renditions = {'source': source}
+    if source:
+        with book.cover_image.open('rb') as cover:
+            image = ImageOps.exif_transpose(Image.open(cover))
+            image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+        stem = posixpath.splitext(posixpath.basename(source))[0]
+        for name, size in RENDITIONS.items():
+            renditions[name] = {}
+            for extension, (file_format, options) in FORMATS.items():
+                path = f'book_covers/renditions/{book_id}/{stem}_{name}.{extension}'
+                content = ContentFile(render(image, size, file_format, options))
+                renditions[name][extension] = storage.save(path, content)
+
+    updated = Book.objects.filter(pk=book_id, cover_image=source or '').update(
+        cover_renditions=renditions, updated_at=timezone.now()
+    )
+    # Drop whichever set of files lost: the old one, or ours if the cover changed meanwhile.
+    delete_files(storage, previous if updated else renditions)
+    if updated:
+        invalidate_book_cache()
+
+
+def delete_files(storage, renditions):
+    for name in RENDITIONS:
+        for path in renditions.get(name, {}).values():
+            storage.delete(path)
@@ -0,0 +1,171 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+TERM_RE = re.compile(r'[^\W_]+')
+MAX_TERMS = 10
+
+POSTGRES_INSTALL = [
+    "ALTER TABLE books_book ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION books_book_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.authors, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS books_book_search_vector_trigger ON books_book",
+    """
+    CREATE TRIGGER books_book_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, authors, description ON books_book
+    FOR EACH ROW EXECUTE FUNCTION books_book_search_vector_update()
+    """,
+    "CREATE INDEX IF NOT EXISTS books_book_search_vector_idx ON books_book USING GIN (search_vector)",
+]
+POSTGRES_BACKFILL = "UPDATE books_book SET title = title WHERE search_vector IS NULL"
+POSTGRES_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS books_book_search_vector_trigger ON books_book",
+    "DROP FUNCTION IF EXISTS books_book_search_vector_update()",
+    "ALTER TABLE books_book DROP COLUMN IF EXISTS search_vector",
+]
+
+# External-content FTS5 table kept in sync by triggers. Django rebuilds SQLite
+# tables on some schema changes, which drops the triggers, so installation is
+# idempotent and re-run after every migrate (see BooksConfig.ready).
+SQLITE_INSTALL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS books_book_fts USING fts5(
+        title, authors, description,
+        content='books_book', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_book_fts_insert AFTER INSERT ON books_book BEGIN
+        INSERT INTO books_book_fts(rowid, title, authors, description)
+        VALUES (new.id, new.title, new.authors, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_book_fts_delete AFTER DELETE ON books_book BEGIN
+        INSERT INTO books_book_fts(books_book_fts, rowid, title, authors, description)
+        VALUES ('delete', old.id, old.title, old.authors, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS books_book_fts_update
+    AFTER UPDATE OF title, authors, description ON books_book BEGIN
+        INSERT INTO books_book_fts(books_book_fts, rowid, title, authors, description)
+        VALUES ('delete', old.id, old.title, old.authors, old.description);
+        INSERT INTO books_book_fts(rowid, title, authors, description)
+        VALUES (new.id, new.title, new.authors, new.description);
+    END
+    """,
+]
+SQLITE_BACKFILL = "INSERT INTO books_book_fts(books_book_fts) VALUES ('rebuild')"
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS books_book_fts_insert",
+    "DROP TRIGGER IF EXISTS books_book_fts_delete",
+    "DROP TRIGGER IF EXISTS books_book_fts_update",
+    "DROP TABLE IF EXISTS books_book_fts",
+]
+
+
+def install_search_index(connection, backfill=False):
+    if connection.vendor == 'postgresql':
+        statements = POSTGRES_INSTALL + ([POSTGRES_BACKFILL] if backfill else [])
+    elif connection.vendor == 'sqlite':
+        statements = SQLITE_INSTALL + ([SQLITE_BACKFILL] if backfill else [])
+    else:
+        return
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def uninstall_search_index(connection):
+    statements = {
+        'postgresql': POSTGRES_UNINSTALL,
+        'sqlite': SQLITE_UNINSTALL,
+    }.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def search_terms(query):
+    return TERM_RE.findall(query.lower())[:MAX_TERMS]
+
+
+def search_books(queryset, query):
+    """
+    Filter ``queryset`` to books matching ``query`` and annotate ``search_rank``.
+
+    Every term must match; the last one is matched as a prefix so partially
+    typed words still find results. A blank query leaves ``queryset``
+    unfiltered; one with no searchable terms, e.g. ``***``, matches nothing.
+    Returns None on databases without a full-text index so callers can fall
+    back to ``icontains``.
+    """
+    if not query.strip():
+        return queryset
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        tsquery = ' & '.join(terms[:-1] + [terms[-1] + ':*'])
+        return queryset.filter(
+            RawSQL(
+                "books_book.search_vector @@ to_tsquery('english', %s)",
+                [tsquery], output_field=BooleanField(),
+            )
+        ).annotate(
+            # ts_rank() is a real; as a double it survives the round trip
+            # through a keyset cursor exactly and still compares equal.
+            search_rank=RawSQL(
+                "ts_rank(books_book.search_vector, to_tsquery('english', %s))::double precision",
+                [tsquery], output_field=FloatField(),
+            )
+        )
+
+    if vendor == 'sqlite':
+        match = ' '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+        # Join the FTS table so MATCH and bm25() run once per query rather than
+        # once per candidate row; ORM expressions cannot express that join.
+        return queryset.extra(
+            tables=['books_book_fts'],
+            where=['books_book_fts.rowid = books_book.id', 'books_book_fts MATCH %s'],
+            params=[match],
+        ).annotate(
+            # bm25() is lower for better matches; negate it so higher ranks first.
+            search_rank=RawSQL('-bm25(books_book_fts)', [], output_field=FloatField()),
+        )
+
+    return None
+
+
+class BookSearchFilter(filters.SearchFilter):
+    """
+    Full-text ``?search=`` for books, ranked by relevance unless the request
+    asks for an explicit ``?ordering=``. Must run after ``OrderingFilter``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '')
+        results = search_books(queryset, query)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+
+        ordering_param = filters.OrderingFilter.ordering_param
+        if 'search_rank' in results.query.annotations and not request.query_params.get(ordering_param):
+            results = results.order_by('-search_rank', *results.model._meta.ordering)
+        return results
@@ -1,19 +1,68 @@
 import re
 from rest_framework import serializers
-from .models import Book
+from Backend.fields import SparseFieldsMixin
+from Backend.metrics import TimedSerializerMixin
+from .models import Book, authors_prefetch
 
-class BookSerializer(serializers.ModelSerializer):
+
+def load_book_fields(queryset, serializer, prefix=''):
+    """
+    Fetch what a (possibly sparse) BookSerializer will read: the owner and
+    author entries only when their fields are selected, and no unselected
+    columns. ``prefix`` reaches the book through a relation, e.g. 'book__'.
+    """
+    if 'created_by_username' in serializer.fields:
+        queryset = queryset.select_related(prefix + 'created_by')
+    elif prefix:
+        queryset = queryset.select_related(prefix[:-2])
+    if 'authors_list' in serializer.fields:
+        queryset = queryset.prefetch_related(authors_prefetch(prefix + 'book_authors'))
+    return queryset.defer(*(prefix + name for name in serializer.get_deferred_columns()))
+
+
+def cover_rendition_urls(renditions, cover_name, storage, request=None):
+    # Until books.renditions has processed the current cover this is {},
+    # and clients fall back to cover_image.
+    if renditions.get('source') != (cover_name or None):
+        return {}
+    urls = {}
+    for name, paths in renditions.items():
+        if name == 'source':
+            continue
+        urls[name] = {}
+        for extension, path in paths.items():
+            url = storage.url(path)
+            urls[name][extension] = request.build_absolute_uri(url) if request else url
+    return urls
+
+
+class BookSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
     authors_list = serializers.ListField(source='get_authors_list', read_only=True)
+    cover_renditions = serializers.SerializerMethodField()
 
     class Meta:
         model = Book
         fields = [
             'id', 'title', 'authors', 'authors_list', 'genre', 'publication_date',
-            'description', 'cover_image', 'isbn', 'pages', 'created_by',
+            'description', 'cover_image', 'cover_renditions', 'isbn', 'pages', 'created_by',
             'created_by_username', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+        # Books nested in other resources, e.g. reading-list items.
+        summary_fields = [
+            'id', 'title', 'authors', 'authors_list', 'genre', 'publication_date',
+            'cover_image', 'cover_renditions', 'created_by', 'created_by_username',
+        ]
+        field_columns = {
+            'authors_list': ['authors'],
+            'cover_renditions': ['cover_renditions', 'cover_image'],
+        }
+
+    def get_cover_renditions(self, obj):
+        return cover_rendition_urls(
+            obj.cover_renditions, obj.cover_image.name, obj.cover_image.storage, self.context.get('request')
+        )
 
     def validate_title(self, value):
         if not value or not value.strip():
@@ -34,15 +83,18 @@ class BookSerializer(serializers.ModelSerializer):
         if not value:
             raise serializers.ValidationError("At least one author is required.")
 
-        if any(not str(author).strip() for author in value):
+        # `authors` is a comma-separated string; validate each name, not each character.
+        value_list = value.split(',') if isinstance(value, str) else value
+
+        if any(not str(author).strip() for author in value_list):
             raise serializers.ValidationError("Author names cannot be blank.")
 
         # for author in value:
         #     if len(str(author).strip()) < 2:
         #         raise serializers.ValidationError("Author names must be at least 2 characters long.")
 
-        for author in value:
-            if str(author).isdigit():
+        for author in value_list:
+            if str(author).strip().isdigit():
                 raise serializers.ValidationError("Author names cannot be numbers.")
 
         # if len(value) != len(set([str(a).strip().lower() for a in value])):
@@ -55,6 +107,7 @@ class BookSerializer(serializers.ModelSerializer):
     def validate_isbn(self, value):
         if value and len(value) not in [10, 13]:
             raise serializers.ValidationError('ISBN must be 10 or 13 digits')
+        return value or None
         
 class BookCreateUpdateSerializer(BookSerializer):
     class Meta(BookSerializer.Meta):
@@ -0,0 +1,62 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authors import sync_authors
+from .cache import invalidate_book_cache
+from .facets import FacetDelta, stored_facet_key, touches_facets
+from .models import Book
+from .renditions import needs_renditions, schedule_renditions
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def book_changed(sender, **kwargs):
+    invalidate_book_cache()
+
+
+@receiver(post_save, sender=Book)
+def authors_changed(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if not raw and (update_fields is None or 'authors' in update_fields):
+        sync_authors([instance], created=created)
+
+
+@receiver(pre_save, sender=Book)
+def remember_facet_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    # The saved key is gone by post_save; read it while it is still there.
+    if not raw and instance.pk is not None and touches_facets(update_fields):
+        instance._stored_facet_key = stored_facet_key(instance.pk)
+
+
+@receiver(post_save, sender=Book)
+def facets_changed(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    delta = FacetDelta()
+    if created:
+        delta.add(instance)
+    elif touches_facets(update_fields):
+        delta.move(instance.__dict__.pop('_stored_facet_key', None), instance)
+    delta.save()
+
+
+@receiver(post_delete, sender=Book)
+def facets_deleted(sender, instance, **kwargs):
+    delta = FacetDelta()
+    delta.remove(instance)
+    delta.save()
+
+
+@receiver(post_save, sender=Book)
+def cover_changed(sender, instance, raw=False, **kwargs):
+    if not raw and needs_renditions(instance):
+        schedule_renditions(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def uploader_changed(sender, update_fields=None, **kwargs):
+    # Book responses embed created_by_username.
+    if update_fields is None or 'username' in update_fields:
+        invalidate_book_cache()
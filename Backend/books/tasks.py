@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+
+from jobs.registry import task
+
+from .importer import import_books, read_rows
+from .renditions import generate_renditions
+
+User = get_user_model()
+
+
+@task('books.generate_renditions')
+def generate_cover_renditions(book_id):
+    generate_renditions(book_id)
+
+
+# Not retried: rows of a failed attempt may already be written, and rows
+# without an ISBN would be created twice.
+@task('books.import_books', max_attempts=1)
+def import_uploaded_books(path, user_id, file_format, on_conflict):
+    """Import an upload saved to default_storage at ``path``, then delete it."""
+    try:
+        user = User.objects.get(pk=user_id)
+        with default_storage.open(path, 'rb') as stream:
+            return import_books(read_rows(stream, file_format), user, on_conflict=on_conflict).as_dict()
+    finally:
+        default_storage.delete(path)
@@ -1,3 +1,774 @@
-from django.test import TestCase
+import base64
+import csv
+import datetime
+import io
+import json
+import os
+import shutil
+import tempfile
+from collections import Counter
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import parse_qsl, urlsplit
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from Backend.renderers import ORJSONRenderer
+
+from . import views
+from .cache import VERSION_KEY, get_version
+from .authors import sync_authors
+from .facets import rebuild_facets, rollup_keys
+from .importer import existing_books, import_books
+from .models import Author, Book, BookFacetCount
+
+User = get_user_model()
+
+
+def make_books(user, count, start=0):
+    books = Book.objects.bulk_create([
+        Book(
+            title=f'Book-{start + i}',
+            authors='Jane Doe, John Roe',
+            genre='fiction',
+            publication_date=datetime.date(2000 + i % 20, 1, 1),
+            created_by=user,
+        )
+        for i in range(count)
+    ])
+    sync_authors(books, created=True)
+    return books
+
+
+class BookQueryCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        cache.clear()
+
+    def test_list_query_count_is_constant(self):
+        url = reverse('book-list-create')
+        for total in (1, 20):
+            Book.objects.all().delete()
+            owners = [
+                User.objects.create_user(
+                    username=f'owner{total}-{i}', email=f'owner{total}-{i}@example.com'
+                )
+                for i in range(3)
+            ]
+            for owner in owners:
+                make_books(owner, total, start=owner.pk * 100)
+            # COUNT(*) for pagination, one page of books joined with their
+            # owners, and one prefetch of their authors.
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_detail_query_count(self):
+        book = make_books(self.user, 1)[0]
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('book-detail', args=[book.pk]))
+        self.assertEqual(response.data['created_by_username'], 'reader')
+
+
+class BookQueryPlanTests(APITestCase):
+    def test_endpoint_queries_use_indexes(self):
+        out = io.StringIO()
+        # Too few books for PostgreSQL to choose an index on its own.
+        call_command(
+            'check_query_plans', seed=True, books=3000, users=20, min_rows=500, disable_seqscan=True, stdout=out
+        )
+        self.assertIn('All endpoint queries use indexes.', out.getvalue())
+        self.assertFalse(Book.objects.exists())
+
+
+class BookSearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        cache.clear()
+        self.url = reverse('book-list-create')
+        Book.objects.create(
+            title='Dune', authors='Frank Herbert', genre='sci_fi',
+            publication_date=datetime.date(1965, 8, 1), created_by=self.user,
+            description='Desert planet politics and spice.',
+        )
+        Book.objects.create(
+            title='Emma', authors='Jane Austen', genre='romance',
+            publication_date=datetime.date(1815, 12, 23), created_by=self.user,
+            description='A comedy of manners with a desert island daydream.',
+        )
+
+    def search(self, query, **params):
+        response = self.client.get(self.url, {'search': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [book['title'] for book in response.data['results']]
+
+    def test_matches_across_fields_with_prefix(self):
+        self.assertEqual(self.search('herb'), ['Dune'])
+        self.assertEqual(self.search('jane aus'), ['Emma'])
+        self.assertEqual(self.search('nothing-matches'), [])
+
+    def test_results_are_ranked_unless_ordering_given(self):
+        # "desert" is in both descriptions but only Dune mentions it first and shortest.
+        Book.objects.filter(title='Dune').update(title='Desert')
+        self.assertEqual(self.search('desert')[0], 'Desert')
+        self.assertEqual(self.search('desert', ordering='title'), ['Desert', 'Emma'])
+        self.assertEqual(self.search('desert', pagination='keyset')[0], 'Desert')
+
+    def test_index_follows_updates_and_deletes(self):
+        book = Book.objects.get(title='Dune')
+        book.authors = 'Someone Else'
+        book.save()
+        self.assertEqual(self.search('herbert'), [])
+        book.delete()
+        self.assertEqual(self.search('someone'), [])
+
+    def test_punctuation_is_not_query_syntax(self):
+        self.assertEqual(self.search('"dune*) -'), ['Dune'])
+
+    def test_queries_without_terms_match_nothing(self):
+        self.assertEqual(self.search('***'), [])
+        self.assertEqual(len(self.search(' ')), 2)
+
+
+class BookPaginationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        cache.clear()
+        self.url = reverse('book-list-create')
+        make_books(self.user, 45)
+        # Identical sort keys force the id tie-breaker to do its job.
+        Book.objects.update(created_at=Book.objects.first().created_at)
+
+    def walk(self, params):
+        seen, url, pages = [], self.url, 0
+        while url:
+            # The page itself and its authors; no COUNT(*), OFFSET or validator scan.
+            with self.assertNumQueries(2):
+                response = self.client.get(url, params if pages == 0 else None)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            seen.extend(book['id'] for book in response.data['results'])
+            url, pages = response.data['next'], pages + 1
+        return seen, pages
+
+    def test_keyset_walks_every_book_once(self):
+        for ordering in ('-created_at', 'title', 'publication_date', '-publication_date'):
+            seen, pages = self.walk({'pagination': 'keyset', 'ordering': ordering})
+            self.assertEqual(len(seen), 45, ordering)
+            self.assertEqual(len(set(seen)), 45, ordering)
+            self.assertEqual(pages, 3)
+
+    def test_keyset_walks_search_results_by_relevance(self):
+        for fast_path in (True, False):
+            with self.subTest(fast_path=fast_path), self.settings(BOOK_LIST_FAST_PATH=fast_path):
+                cache.clear()
+                seen, pages = self.walk({'pagination': 'keyset', 'search': 'book'})
+                self.assertEqual((len(set(seen)), pages), (45, 3))
+
+    def test_previous_link_returns_the_prior_page(self):
+        first = self.client.get(self.url, {'pagination': 'keyset', 'ordering': 'publication_date'})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [book['id'] for book in back.data['results']],
+            [book['id'] for book in first.data['results']],
+        )
+        self.assertIsNone(back.data['previous'])
+
+    def test_page_numbers_remain_the_default(self):
+        response = self.client.get(self.url, {'page': 3})
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_approximate_count_falls_back_to_exact_on_small_tables(self):
+        response = self.client.get(self.url, {'count': 'approximate'})
+        self.assertEqual(response.data['count'], 45)
+        self.assertNotIn('count_is_approximate', response.data)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursors_with_wrongly_typed_values_are_invalid(self):
+        payloads = [
+            {'v': ['notadate', 'x']}, {'v': [{'a': 1}, 1]}, {'v': 'ab'}, {'v': [None, None]}, ['v'],
+        ]
+        for fast_path in (True, False):
+            for payload in payloads:
+                cursor = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+                with self.subTest(payload=payload, fast_path=fast_path), self.settings(BOOK_LIST_FAST_PATH=fast_path):
+                    response = self.client.get(self.url, {'cursor': cursor})
+                    self.assertEqual((response.status_code, response.data['detail']), (404, 'Invalid cursor'))
+
+
+class BookSparseFieldsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', email='reader@example.com')
+        self.client.force_authenticate(self.user)
+        self.book = make_books(self.user, 3)[0]
+        self.url = reverse('book-list-create')
+
+    def test_fields_limit_the_response_and_the_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'id,title'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+        book_sql = queries[-1]['sql']
+        self.assertIn('"books_book"."title"', book_sql)
+        self.assertNotIn('"description"', book_sql)
+        self.assertNotIn('users_user', book_sql)
+        # No author prefetch when authors_list is not asked for.
+        self.assertFalse(any('books_bookauthor' in query['sql'] for query in queries))
+
+        detail = self.client.get(reverse('book-detail', args=[self.book.pk]), {'fields': 'title,authors_list'})
+        self.assertEqual(detail.data, {'title': 'Book-0', 'authors_list': ['Jane Doe', 'John Roe']})
+
+    def test_default_representation_and_validation(self):
+        full = self.client.get(self.url).data['results'][0]
+        self.assertIn('description', full)
+        self.assertEqual(len(full), 15)
+        response = self.client.get(self.url, {'fields': 'id,colour'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['fields'], ["Unknown field 'colour'."])
+        # Writes ignore the parameters.
+        response = self.client.patch(
+            reverse('book-detail', args=[self.book.pk]) + '?fields=id', {'title': 'Renamed'}
+        )
+        self.assertEqual(response.data['title'], 'Renamed')
+
+
+class BookFastPathTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', email='reader@example.com')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('book-list-create')
+        books = make_books(self.user, 25)
+        self.covered = books[0]
+        Book.objects.filter(pk=books[0].pk).update(
+            title='Ünïcode 書名 \u2028 "quoted" \\ tab\t', description='line\u2029break\n\x01',
+            isbn='9780000000001', pages=412, cover_image='book_covers/a.png',
+            cover_renditions={'source': 'book_covers/a.png', 'thumb': {'webp': 'book_covers/r/a.webp'}},
+        )
+        # A cover whose renditions are stale, and a book with no author entries.
+        Book.objects.filter(pk=books[1].pk).update(
+            cover_image='book_covers/b.png', cover_renditions={'source': 'book_covers/old.png'},
+        )
+        books[2].book_authors.all().delete()
+
+    def assert_identical(self, params):
+        cache.clear()
+        fast = self.client.get(self.url, params)
+        self.assertEqual(fast.status_code, 200)
+        cache.clear()
+        with override_settings(BOOK_LIST_FAST_PATH=False):
+            slow = self.client.get(self.url, params)
+        self.assertEqual(fast.content, JSONRenderer().render(slow.data), params)
+
+    def test_output_matches_the_serializer_byte_for_byte(self):
+        for params in (
+            {}, {'page': 2}, {'fields': 'id,title,cover_image'}, {'expand': 'description'},
+            {'ordering': 'title', 'pagination': 'keyset'}, {'search': 'book'}, {'genre': 'fiction'},
+        ):
+            self.assert_identical(params)
+        cursor = self.client.get(self.url, {'pagination': 'keyset'}).data['next']
+        self.assert_identical(dict(parse_qsl(urlsplit(cursor).query)))
+
+    def test_reads_rows_not_instances(self):
+        # Count, the page and its authors, as with the prefetch.
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'ordering': 'publication_date'})
+        covered = next(book for book in response.data['results'] if book['id'] == self.covered.pk)
+        self.assertEqual(covered['cover_image'], 'http://testserver/media/book_covers/a.png')
+        self.assertEqual(covered['cover_renditions'], {'thumb': {'webp': 'http://testserver/media/book_covers/r/a.webp'}})
+        self.assertEqual(covered['isbn'], '9780000000001')
+
+    def test_orjson_renderer_matches_json_renderer(self):
+        data = {
+            'when': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc),
+            'day': datetime.date(2024, 5, 1),
+            'price': Decimal('9.50'),
+            'text': 'a\u2028b\u2029c é \x00',
+            'nested': [{'n': 1, 'none': None, 'ratio': 0.1, 'big': 10 ** 30}],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            ORJSONRenderer().render(data, 'application/json; indent=4'),
+            JSONRenderer().render(data, 'application/json; indent=4'),
+        )
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class BookFacetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='reader', email='reader@example.com')
+        self.other = User.objects.create_user(username='writer', email='writer@example.com')
+        self.client.force_authenticate(self.user)
+        books = make_books(self.user, 6) + make_books(self.other, 3, start=6)
+        Book.objects.filter(pk__in=[book.pk for book in books[:2]]).update(genre='history')
+        Book.objects.filter(pk=books[6].pk).update(authors='Ann Other')
+        sync_authors(Book.objects.filter(pk=books[6].pk))
+        rebuild_facets()
+        self.url = reverse('book-facets')
+
+    def assert_counts_match_books(self):
+        recounted = Counter()
+        for row in Book.objects.order_by().values('genre', 'publication_date', 'created_by').annotate(total=Count('id')):
+            for key in rollup_keys(row['genre'], row['publication_date'].year, row['created_by']):
+                recounted[key] += row['total']
+        stored = {
+            (row.genre, row.year, row.uploader): row.count
+            for row in BookFacetCount.objects.exclude(count=0)
+        }
+        self.assertEqual(stored, +recounted)
+
+    def test_counts_follow_creates_updates_deletes_and_imports(self):
+        book = Book.objects.create(
+            title='New', authors='A', genre='mystery', publication_date=datetime.date(1999, 5, 1), created_by=self.user
+        )
+        self.assert_counts_match_books()
+        book.genre = 'fiction'
+        book.publication_date = datetime.date(2001, 1, 1)
+        book.save()
+        self.assert_counts_match_books()
+        Book.objects.get(title='Book-0').delete()
+        self.other.delete()
+        self.assert_counts_match_books()
+        row = {'title': 'Imported', 'authors': 'B', 'genre': 'romance', 'publication_date': '1990-01-01', 'isbn': '1234567890'}
+        import_books([(1, row, None)], self.user)
+        self.assert_counts_match_books()
+        import_books([(1, dict(row, genre='other', publication_date='1991-01-01'), None)], self.user, on_conflict='update')
+        self.assert_counts_match_books()
+
+    def test_facets_exclude_their_own_filter(self):
+        with self.assertNumQueries(3):
+            data = self.client.get(self.url, {'genre': 'history'}).data
+        self.assertEqual(data['count'], 2)
+        genres = {facet['value']: facet['count'] for facet in data['genre']}
+        self.assertEqual(len(genres), len(Book.GENRE_CHOICES))
+        self.assertEqual((genres['history'], genres['fiction'], genres['mystery']), (2, 7, 0))
+        self.assertEqual(data['created_by'], [{'value': self.user.pk, 'username': 'reader', 'count': 2}])
+        self.assertEqual(data['publication_year'], [{'value': 2001, 'count': 1}, {'value': 2000, 'count': 1}])
+
+        data = self.client.get(self.url, {'created_by': self.other.pk, 'publication_year': 2001}).data
+        self.assertEqual(data['count'], 1)
+        self.assertEqual([facet['count'] for facet in data['created_by']], [1, 1])
+
+    def test_author_and_search_filters_count_matching_books(self):
+        data = self.client.get(self.url, {'author': 'ann other'}).data
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['created_by'], [{'value': self.other.pk, 'username': 'writer', 'count': 1}])
+        data = self.client.get(self.url, {'search': 'book', 'genre': 'history'}).data
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(self.client.get(self.url, {'genre': 'poetry'}).status_code, 400)
+
+
+class BookCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse('book-list-create')
+        self.book = make_books(self.user, 1)[0]
+
+    def test_repeated_reads_are_served_from_cache(self):
+        self.assertEqual(self.client.get(self.url, {'genre': 'fiction', 'page': 1})['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, {'page': 1, 'genre': 'fiction', 'search': ''})
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data['count'], 1)
+
+        detail = reverse('book-detail', args=[self.book.pk])
+        self.client.get(detail)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(detail)['X-Cache'], 'HIT')
+
+    def test_writes_are_visible_immediately(self):
+        detail = reverse('book-detail', args=[self.book.pk])
+        self.client.get(self.url)
+        self.client.get(detail)
+
+        created = self.client.post(self.url, {
+            'title': 'Second', 'authors': 'Someone', 'genre': 'fiction',
+            'publication_date': '2001-01-01',
+        })
+        self.assertEqual(created.status_code, 201)
+        self.assertEqual(self.client.get(self.url).data['count'], 2)
+
+        self.client.patch(detail, {'title': 'Renamed'})
+        self.assertEqual(self.client.get(detail).data['title'], 'Renamed')
+
+        self.client.delete(detail)
+        self.assertEqual(self.client.get(detail).status_code, 404)
+        self.assertEqual(self.client.get(self.url).data['count'], 1)
+
+    def test_stats_are_admin_only(self):
+        self.client.get(self.url)
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(reverse('book-cache-stats')).status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        stats = self.client.get(reverse('book-cache-stats')).data
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+
+class BookConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        self.book = make_books(self.user, 3)[0]
+        self.list_url = reverse('book-list-create')
+        self.detail_url = reverse('book-detail', args=[self.book.pk])
+
+    def test_unchanged_resources_return_304_without_queries(self):
+        for url in (self.list_url, self.detail_url):
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response['ETag'], first['ETag'])
+            self.assertEqual(response.content, b'')
+
+    def test_validators_change_with_the_data_and_the_query(self):
+        list_etag = self.client.get(self.list_url)['ETag']
+        detail_etag = self.client.get(self.detail_url)['ETag']
+        self.assertNotEqual(self.client.get(self.list_url, {'genre': 'fiction'})['ETag'], list_etag)
+
+        self.client.patch(self.detail_url, {'title': 'Renamed'})
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['title'], 'Renamed')
+        self.assertEqual(self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+    def test_if_modified_since(self):
+        # Lists are validated by the book cache version alone.
+        self.assertNotIn('Last-Modified', self.client.get(self.list_url))
+        last_modified = self.client.get(self.detail_url)['Last-Modified']
+        response = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+
+class AsyncBookViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.book = make_books(self.user, 3)[0]
+        self.factory = APIRequestFactory()
+        self.token = str(AccessToken.for_user(self.user))
+
+    def call(self, view_class, path, token=True, headers=None, **kwargs):
+        headers = dict(headers or {})
+        if token:
+            headers['HTTP_AUTHORIZATION'] = f'Bearer {self.token}'
+        view = view_class.as_view()
+        if iscoroutinefunction(view):
+            view = async_to_sync(view)
+        response = view(self.factory.get(path, **headers), **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        return response
+
+    def test_async_views_match_sync_views(self):
+        cases = (
+            (views.BookListCreateView, views.AsyncBookListCreateView, '/api/book/?genre=fiction', {}),
+            (views.BookDetailView, views.AsyncBookDetailView, f'/api/book/{self.book.pk}/', {'pk': self.book.pk}),
+        )
+        for sync_view, async_view, path, kwargs in cases:
+            self.assertTrue(iscoroutinefunction(async_view.as_view()))
+            expected = self.call(sync_view, path, **kwargs)
+            # Drop the cached response but keep the version the ETag is built on.
+            version = get_version()
+            cache.clear()
+            cache.set(VERSION_KEY, version, None)
+            response = self.call(async_view, path, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data, expected.data)
+            self.assertEqual(response['ETag'], expected['ETag'])
+
+            response = self.call(async_view, path, headers={'HTTP_IF_NONE_MATCH': expected['ETag']}, **kwargs)
+            self.assertEqual(response.status_code, 304)
+
+    def test_async_views_authenticate_and_404(self):
+        self.assertEqual(self.call(views.AsyncBookListCreateView, '/api/book/', token=False).status_code, 401)
+        response = self.call(views.AsyncBookDetailView, '/api/book/0/', pk=0)
+        self.assertEqual(response.status_code, 404)
+
+
+class BookImportTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse('book-import')
+
+    def upload(self, name, content, **data):
+        upload = SimpleUploadedFile(name, content.encode())
+        return self.client.post(self.url, {'file': upload, **data}, format='multipart')
+
+    def test_csv_import_reports_row_errors(self):
+        content = (
+            'title,authors,genre,publication_date,isbn,pages\n'
+            'Dune,Frank Herbert,sci_fi,1965-08-01,0441172717,412\n'
+            'Bad title!,Someone,fiction,2000-01-01,,\n'
+            'Emma,Jane Austen,romance,1815-12-23,,\n'
+            'Dune-again,Frank Herbert,sci_fi,1965-08-01,0441172717,\n'
+        )
+        response = self.upload('books.csv', content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(response.data['skipped'], 1)
+        self.assertEqual(response.data['error_count'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        self.assertIn('title', response.data['errors'][0]['errors'])
+        self.assertEqual(Book.objects.get(isbn='0441172717').pages, 412)
+        self.assertEqual(self.client.get(reverse('book-list-create')).data['count'], 2)
+
+    def test_background_import_runs_as_a_job(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        content = 'title,authors,genre,publication_date\nDune,Frank Herbert,sci_fi,1965-08-01\n'
+        with override_settings(MEDIA_ROOT=media_root, JOBS_RUN_INLINE=True):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.upload('books.csv', content, background='true')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response['Location'], reverse('job-detail', args=[response.data['id']]))
+        job = self.client.get(response['Location']).data
+        self.assertEqual((job['status'], job['result']['created']), ('succeeded', 1))
+        self.assertEqual(os.listdir(os.path.join(media_root, 'imports')), [])
+
+    def test_jsonl_import_updates_on_conflict(self):
+        make_books(self.user, 1)
+        Book.objects.update(isbn='9780441172719')
+        other = User.objects.create_user(username='other', email='other@example.com')
+        Book.objects.create(
+            title='Theirs', authors='X', genre='other', publication_date=datetime.date(2000, 1, 1),
+            isbn='1234567890', created_by=other,
+        )
+        lines = [
+            {'title': 'Updated', 'authors': 'Frank Herbert', 'genre': 'sci_fi',
+             'publication_date': '1965-08-01', 'isbn': '9780441172719'},
+            {'title': 'Hijack', 'authors': 'Y', 'genre': 'other',
+             'publication_date': '2000-01-01', 'isbn': '1234567890'},
+            'not an object',
+        ]
+        content = '\n'.join(json.dumps(line) for line in lines) + '\n{broken\n'
+        response = self.upload('books.jsonl', content, on_conflict='update')
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(response.data['error_count'], 3)
+        self.assertEqual(Book.objects.get(isbn='9780441172719').title, 'Updated')
+        self.assertEqual(Book.objects.get(isbn='1234567890').title, 'Theirs')
+
+    def test_undecodable_files_are_reported_not_raised(self):
+        content = 'title,authors,genre,publication_date\nCaf\xe9,Someone,fiction,2000-01-01\n'.encode('latin-1')
+        upload = SimpleUploadedFile('books.csv', content)
+        response = self.client.post(self.url, {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['error_count']), (0, 1))
+        self.assertIn('not UTF-8', response.data['errors'][0]['errors']['non_field_errors'][0])
+
+    def test_isbns_saved_during_an_import_are_replanned(self):
+        make_books(self.user, 1)
+        Book.objects.update(isbn='0441172717')
+        content = (
+            'title,authors,genre,publication_date,isbn\n'
+            'Dune,Frank Herbert,sci_fi,1965-08-01,0441172717\n'
+            'Emma,Jane Austen,romance,1815-12-23,\n'
+        )
+        lookups = []
+
+        def lookup(isbns):
+            # The first lookup misses the book, as if another request saved it meanwhile.
+            lookups.append(isbns)
+            return {} if len(lookups) == 1 else existing_books(isbns)
+
+        with mock.patch('books.importer.existing_books', side_effect=lookup):
+            response = self.upload('books.csv', content)
+        self.assertEqual((response.data['created'], response.data['skipped']), (1, 1))
+        self.assertEqual((len(lookups), Book.objects.count()), (2, 2))
+
+    def test_rejects_unknown_options(self):
+        self.assertEqual(self.upload('books.csv', '', on_conflict='merge').status_code, 400)
+        self.assertEqual(self.upload('books.txt', '', format='xml').status_code, 400)
+
+    def test_management_command_batches(self):
+        content = 'title,authors,genre,publication_date\n' + ''.join(
+            f'Book-{i},Author {i},fiction,2000-01-01\n' for i in range(25)
+        )
+        handle = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False)
+        self.addCleanup(os.unlink, handle.name)
+        with handle:
+            handle.write(content)
+        out = io.StringIO()
+        with self.assertNumQueries(29):
+            # User lookup, then per batch of 10: SAVEPOINT, the books INSERT,
+            # SELECT/INSERT/SELECT for new authors, the BookAuthor INSERT, the
+            # facet count UPDATE, RELEASE. The first batch also creates the facet
+            # rows (SELECT, SAVEPOINT, INSERT, RELEASE).
+            call_command('import_books', handle.name, user='reader@example.com', batch_size=10, stdout=out)
+        self.assertEqual(json.loads(out.getvalue())['created'], 25)
+
+
+class BookExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        make_books(self.user, 5)
+        Book.objects.filter(title='Book-0').update(genre='history', description='Line one\nline "two"')
+
+    def export(self, file_format, **params):
+        response = self.client.get(reverse('book-export', args=[file_format]), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export_round_trips_through_the_importer(self):
+        content = self.export('csv', ordering='title')
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([row['title'] for row in rows], [f'Book-{i}' for i in range(5)])
+        self.assertEqual(rows[0]['description'], 'Line one\nline "two"')
+        self.assertEqual(rows[0]['created_by__username'], 'reader')
+
+    def test_jsonl_export_applies_list_filters(self):
+        lines = self.export('jsonl', genre='history').splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['title'], 'Book-0')
+        self.assertEqual(len(self.export('jsonl', search='book').splitlines()), 5)
+
+    def test_unknown_format(self):
+        response = self.client.get(reverse('book-export', args=['xml']))
+        self.assertEqual(response.status_code, 404)
+
+
+class BookAuthorTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        self.url = reverse('book-list-create')
+
+    def test_author_filter_matches_normalized_names(self):
+        make_books(self.user, 3)
+        Book.objects.create(
+            title='Solo', authors='John  Roe', genre='other',
+            publication_date=datetime.date(2001, 1, 1), created_by=self.user,
+        )
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(self.client.get(self.url, {'author': 'JOHN ROE'}).data['count'], 4)
+        self.assertEqual(self.client.get(self.url, {'author': 'jane doe'}).data['count'], 3)
+        self.assertEqual(self.client.get(self.url, {'author': 'Jane'}).data['count'], 0)
+
+    def test_editing_authors_resyncs_entries(self):
+        book = make_books(self.user, 1)[0]
+        response = self.client.patch(
+            reverse('book-detail', args=[book.pk]), {'authors': 'Ann Lee, Jane Doe'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        data = self.client.get(reverse('book-detail', args=[book.pk])).data
+        self.assertEqual(data['authors_list'], ['Ann Lee', 'Jane Doe'])
+        self.assertEqual(
+            list(Author.objects.get(normalized_name='john roe').books.all()), []
+        )
+
+    def test_authors_list_keeps_each_books_spelling(self):
+        payload = {'title': 'Lower', 'authors': 'ann lee', 'genre': 'other', 'publication_date': '2001-01-01'}
+        Book.objects.create(
+            title='Upper', authors='Ann Lee', genre='other',
+            publication_date=datetime.date(2000, 1, 1), created_by=self.user,
+        )
+        self.assertEqual(self.client.post(self.url, payload, format='json').status_code, 201)
+        lower = Book.objects.get(title='Lower')
+        self.assertEqual(lower.get_authors_list(), ['ann lee'])
+        self.assertEqual(self.client.get(reverse('book-detail', args=[lower.pk])).data['authors_list'], ['ann lee'])
+        for fast_path in (True, False):
+            with self.subTest(fast_path=fast_path), self.settings(BOOK_LIST_FAST_PATH=fast_path):
+                cache.clear()
+                results = self.client.get(self.url, {'ordering': 'title'}).data['results']
+                self.assertEqual([book['authors_list'] for book in results], [['ann lee'], ['Ann Lee']])
+
+
+class BookCoverRenditionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, JOBS_RUN_INLINE=True)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+
+    def upload_cover(self):
+        buffer = io.BytesIO()
+        Image.new('RGBA', (1200, 900), (200, 30, 30, 128)).save(buffer, 'PNG')
+        cover = SimpleUploadedFile('cover.png', buffer.getvalue(), content_type='image/png')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('book-list-create'), {
+                'title': 'Dune', 'authors': 'Frank Herbert', 'genre': 'sci_fi',
+                'publication_date': '1965-08-01', 'cover_image': cover,
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        return Book.objects.get(title='Dune')
+
+    def test_upload_generates_renditions(self):
+        book = self.upload_cover()
+        self.assertEqual(book.cover_renditions['source'], book.cover_image.name)
+        storage = book.cover_image.storage
+        for extension, file_format in (('webp', 'WEBP'), ('jpeg', 'JPEG')):
+            with Image.open(storage.path(book.cover_renditions['thumb'][extension])) as image:
+                self.assertEqual(image.size, (160, 240))
+                self.assertEqual(image.format, file_format)
+
+        data = self.client.get(reverse('book-detail', args=[book.pk])).data
+        self.assertTrue(data['cover_renditions']['card']['webp'].startswith('http://testserver/media/'))
+
+    def test_backfill_command_regenerates_stale_renditions(self):
+        book = self.upload_cover()
+        old_paths = list(book.cover_renditions['thumb'].values())
+        Book.objects.filter(pk=book.pk).update(cover_renditions={})
+        self.assertEqual(self.client.get(reverse('book-detail', args=[book.pk])).data['cover_renditions'], {})
+
+        out = io.StringIO()
+        call_command('generate_cover_renditions', stdout=out)
+        self.assertIn('for 1 book(s)', out.getvalue())
+        book.refresh_from_db()
+        self.assertEqual(book.cover_renditions['source'], book.cover_image.name)
+        self.assertNotEqual(list(book.cover_renditions['thumb'].values()), old_paths)
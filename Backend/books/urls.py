@@ -1,7 +1,17 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_VIEWS:
+    list_view, detail_view = views.AsyncBookListCreateView, views.AsyncBookDetailView
+else:
+    list_view, detail_view = views.BookListCreateView, views.BookDetailView
+
 urlpatterns = [
-    path('', views.BookListCreateView.as_view(), name='book-list-create'),
-    path('<int:pk>/', views.BookDetailView.as_view(), name='book-detail'),
+    path('', list_view.as_view(), name='book-list-create'),
+    path('<int:pk>/', detail_view.as_view(), name='book-detail'),
+    path('facets/', views.BookFacetsView.as_view(), name='book-facets'),
+    path('export/<str:file_format>/', views.BookExportView.as_view(), name='book-export'),
+    path('import/', views.BookImportView.as_view(), name='book-import'),
+    path('cache-stats/', views.BookCacheStatsView.as_view(), name='book-cache-stats'),
 ]
@@ -2,19 +2,53 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from django.conf import settings
+from asgiref.sync import sync_to_async
+from Backend.async_views import AsyncAPIViewMixin, AsyncListModelMixin, AsyncRetrieveModelMixin
+from Backend.conditional import AsyncConditionalGetMixin, ConditionalGetMixin
+from Backend.fields import SparseFieldsViewMixin
+from Backend.streaming import EXPORT_FORMATS, streaming_export
+from rest_framework.parsers import MultiPartParser
+from django.core.files.storage import default_storage
+from django.urls import reverse
+import uuid
+from jobs.queue import enqueue
+from jobs.serializers import JobSerializer
+from .cache import AsyncCachedResponseMixin, CachedResponseMixin, aget_version, cache_stats, get_version
+from .facets import BookFacets
+from .fastpath import FastBookListMixin
+from .filters import BookFilter
+from .importer import CONFLICT_POLICIES, FORMATS, detect_format, import_books, read_rows
 from .models import Book
-from .serializers import BookSerializer, BookCreateUpdateSerializer
-from rest_framework.permissions import AllowAny, IsAuthenticated
+from .search import BookSearchFilter
+from .serializers import BookSerializer, BookCreateUpdateSerializer, load_book_fields
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
+from rest_framework.views import APIView
 
-class BookListCreateView(generics.ListCreateAPIView):
-    permission_classes = [IsAuthenticated]
-    queryset = Book.objects.all()
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['genre', 'created_by']
+class BookFilterMixin:
+    queryset = Book.objects.with_owner().with_authors()
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, BookSearchFilter]
+    filterset_class = BookFilter
     search_fields = ['title', 'authors', 'description']
     ordering_fields = ['created_at', 'title', 'publication_date']
     ordering = ['-created_at']
 
+
+class SparseBookQuerysetMixin(SparseFieldsViewMixin):
+    def get_queryset(self):
+        serializer = self.get_read_serializer()
+        if serializer is None:
+            return super().get_queryset()
+        return load_book_fields(Book.objects.all(), serializer)
+
+
+class BookListCreateView(
+    SparseBookQuerysetMixin, BookFilterMixin, ConditionalGetMixin, CachedResponseMixin, FastBookListMixin,
+    generics.ListCreateAPIView
+):
+    permission_classes = [IsAuthenticated]
+    cache_scope = 'list'
+
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return BookCreateUpdateSerializer
@@ -23,8 +57,14 @@ class BookListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
-class BookDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Book.objects.all()
+    def compute_validator_state(self):
+        # Every book write and owner rename bumps the book cache version, and
+        # the ETag covers the URL (filters, cursor), so no table scan is needed.
+        return {'books_version': get_version()}
+
+class BookDetailView(SparseBookQuerysetMixin, ConditionalGetMixin, CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = Book.objects.with_owner().with_authors()
+    cache_scope = 'detail'
 
     def get_serializer_class(self):
         if self.request.method in ['PUT', 'PATCH']:
@@ -36,6 +76,122 @@ class BookDetailView(generics.RetrieveUpdateDestroyAPIView):
             return [permissions.IsAuthenticated(), IsOwnerOrReadOnly()]
         return [permissions.IsAuthenticated()]
 
+    def compute_validator_state(self):
+        return self.validator_queryset().first()
+
+    def validator_queryset(self):
+        return self.get_queryset().filter(pk=self.kwargs['pk']).values('updated_at', 'created_by__updated_at')
+
+
+class AsyncBookListCreateView(
+    AsyncAPIViewMixin, AsyncConditionalGetMixin, AsyncCachedResponseMixin, AsyncListModelMixin, BookListCreateView
+):
+    """BookListCreateView with an async GET, for ASGI deployments (ASYNC_VIEWS)."""
+
+    async def acompute_validator_state(self):
+        return {'books_version': await aget_version()}
+
+    async def aget_uncached_response(self, request, *args, **kwargs):
+        if settings.BOOK_LIST_FAST_PATH:
+            response = await sync_to_async(self.fast_list)(request)
+            if response is not None:
+                return response
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncBookDetailView(
+    AsyncAPIViewMixin, AsyncConditionalGetMixin, AsyncCachedResponseMixin, AsyncRetrieveModelMixin, BookDetailView
+):
+    """BookDetailView with an async GET, for ASGI deployments (ASYNC_VIEWS)."""
+
+    async def acompute_validator_state(self):
+        return await self.validator_queryset().afirst()
+
+    async def aget_uncached_response(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+
+class BookFacetsView(BookFilterMixin, CachedResponseMixin, generics.ListAPIView):
+    """
+    Book counts per genre, publication year and uploader (the top
+    books.facets.TOP_UPLOADERS) for the list endpoint's filters.
+    """
+    permission_classes = [IsAuthenticated]
+    cache_scope = 'facets'
+
+    def list(self, request, *args, **kwargs):
+        return Response(BookFacets(request, self).as_dict())
+
+
+class BookExportView(BookFilterMixin, generics.GenericAPIView):
+    """
+    Stream every book matching the same filters as the list endpoint
+    (genre, created_by, author, search, ordering) as CSV or JSON lines.
+    """
+    permission_classes = [IsAuthenticated]
+    columns = [
+        'id', 'title', 'authors', 'genre', 'publication_date', 'description',
+        'isbn', 'pages', 'created_by', 'created_by__username', 'created_at', 'updated_at',
+    ]
+
+    def get(self, request, file_format):
+        if file_format not in EXPORT_FORMATS:
+            return Response({'error': 'Unsupported export format'}, status=status.HTTP_404_NOT_FOUND)
+        queryset = self.filter_queryset(self.get_queryset()).prefetch_related(None).values_list(*self.columns)
+        return streaming_export(queryset, self.columns, file_format, 'books')
+
+
+class BookImportView(APIView):
+    """
+    Bulk-create books from an uploaded CSV or JSON-lines ``file``. Rows are
+    streamed and written in batches; the response reports per-row errors.
+
+    With ``background=true`` the file is saved and imported by a job
+    instead: the response is 202 with the job, whose result is the report.
+    """
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'A file is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('format') or detect_format(upload.name)
+        on_conflict = request.data.get('on_conflict', 'skip')
+        if file_format not in FORMATS:
+            return Response(
+                {'error': f"format must be one of: {', '.join(FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if on_conflict not in CONFLICT_POLICIES:
+            return Response(
+                {'error': f"on_conflict must be one of: {', '.join(CONFLICT_POLICIES)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.data.get('background', '').lower() == 'true':
+            path = default_storage.save(f'imports/{uuid.uuid4().hex}.{file_format}', upload)
+            job = enqueue(
+                'books.import_books', user=request.user,
+                path=path, user_id=request.user.pk, file_format=file_format, on_conflict=on_conflict,
+            )
+            return Response(
+                JobSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED,
+                headers={'Location': reverse('job-detail', args=[job.pk])},
+            )
+
+        report = import_books(read_rows(upload, file_format), request.user, on_conflict=on_conflict)
+        return Response(report.as_dict())
+
+
+class BookCacheStatsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats())
+
     
 class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
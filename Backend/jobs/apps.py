@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'jobs'
+
+    def ready(self):
+        from Backend.metrics import register_collector
+
+        from .queue import job_metrics
+
+        # Each app registers its tasks in tasks.py.
+        autodiscover_modules('tasks')
+        register_collector(job_metrics)
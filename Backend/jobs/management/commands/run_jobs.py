@@ -0,0 +1,27 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.queue import Worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (cover renditions, imports, token "
+        "pruning) and queue the periodic ones. SIGTERM or Ctrl-C stops "
+        "claiming jobs and exits once the running ones finish."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, help="Jobs run at once in a process pool; 0 runs them in this process. Default: JOBS_CONCURRENCY."
+        )
+        parser.add_argument('--poll-interval', type=float, help="Seconds between checks for due jobs. Default: JOBS_POLL_INTERVAL.")
+        parser.add_argument('--once', action='store_true', help="Exit once no job is due instead of waiting for more.")
+
+    def handle(self, *args, **options):
+        worker = Worker(concurrency=options['concurrency'], poll_interval=options['poll_interval'])
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+        completed = worker.run(once=options['once'])
+        self.stdout.write(f"Ran {completed} job(s).")
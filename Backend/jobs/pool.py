@@ -0,0 +1,28 @@
+"""
+Entry points of the worker's pool processes. They are spawned rather than
+forked, so none shares the worker's database connections, and import this
+module before Django is set up: it must not import models at load time.
+"""
+import signal
+
+import django
+
+
+def setup():
+    # A stop signal reaches the whole process group. Only the worker acts on
+    # it, letting running jobs finish before it shuts the pool down.
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+
+
+def execute(name, kwargs):
+    from django.db import close_old_connections
+
+    from .queue import execute
+
+    close_old_connections()
+    try:
+        return execute(name, kwargs)
+    finally:
+        close_old_connections()
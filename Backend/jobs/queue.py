@@ -0,0 +1,229 @@
+"""
+A job queue kept in the database: enqueue() inserts a Job row in the
+caller's transaction and the run_jobs worker claims due rows, runs them in a
+process pool and records the outcome. A job that fails is retried with
+exponential backoff until it has made ``max_attempts``.
+"""
+import logging
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from . import pool
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue(name, user=None, **kwargs):
+    """
+    Queue the task ``name`` to be called with ``kwargs`` and return its Job.
+    The row belongs to the current transaction, so the job only runs if
+    that commits. With JOBS_RUN_INLINE it runs in this process right after
+    the commit instead, for tests and development without a worker.
+    """
+    registered = get_task(name)
+    job = Job.objects.create(
+        name=name,
+        kwargs=kwargs,
+        created_by=user,
+        max_attempts=registered.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+    if settings.JOBS_RUN_INLINE:
+        transaction.on_commit(lambda: run_job(job.pk))
+    return job
+
+
+def claim(job_id, worker=''):
+    """Mark a queued job running on ``worker`` and return it, or None if another worker got it first."""
+    now = timezone.now()
+    claimed = Job.objects.filter(pk=job_id, status=Job.QUEUED).update(
+        status=Job.RUNNING, attempts=F('attempts') + 1, started_at=now, finished_at=None,
+        worker=worker, heartbeat_at=now,
+    )
+    return Job.objects.get(pk=job_id) if claimed else None
+
+
+def execute(name, kwargs):
+    """Call the task; returns ``(True, result)`` or ``(False, error message)``."""
+    try:
+        return True, get_task(name)(**kwargs)
+    except Exception as e:
+        logger.exception("Job %s failed", name)
+        return False, f'{type(e).__name__}: {e}'
+
+
+def finish(job, succeeded, outcome):
+    now = timezone.now()
+    # Only this run's report counts: once the job was taken for lost, its
+    # row has moved on and the update matches nothing.
+    running = Job.objects.filter(pk=job.pk, status=Job.RUNNING, worker=job.worker, attempts=job.attempts)
+    if succeeded:
+        running.update(status=Job.SUCCEEDED, result=outcome, error='', finished_at=now)
+    elif job.attempts < job.max_attempts:
+        delay = settings.JOBS_RETRY_DELAY * 2 ** (job.attempts - 1)
+        running.update(status=Job.QUEUED, error=outcome, run_after=now + timedelta(seconds=delay))
+    else:
+        running.update(status=Job.FAILED, error=outcome, finished_at=now)
+
+
+def run_job(job_id):
+    """Claim and run one job in this process."""
+    job = claim(job_id)
+    if job is not None:
+        finish(job, *execute(job.name, job.kwargs))
+
+
+def due_job_ids(limit):
+    jobs = Job.objects.filter(status=Job.QUEUED, run_after__lte=timezone.now()).order_by('run_after', 'id')
+    return list(jobs.values_list('id', flat=True)[:limit])
+
+
+def recover_stalled_jobs(exclude=()):
+    """
+    Count running jobs without a heartbeat for JOBS_HEARTBEAT_TIMEOUT, whose
+    worker presumably died, as failed attempts. ``exclude`` are ids of jobs
+    the calling worker is running itself.
+    """
+    timeout = settings.JOBS_HEARTBEAT_TIMEOUT
+    stalled = Job.objects.filter(
+        status=Job.RUNNING, heartbeat_at__lt=timezone.now() - timedelta(seconds=timeout)
+    ).exclude(pk__in=exclude)
+    for job in stalled:
+        finish(job, False, f'No heartbeat from worker {job.worker or "(inline)"} for {timeout} seconds; it was probably stopped.')
+
+
+def enqueue_periodic_jobs():
+    """
+    Queue each JOBS_PERIODIC task not queued within its interval. Workers
+    that check at the same moment may both queue it, so periodic tasks must
+    be safe to run twice.
+    """
+    now = timezone.now()
+    for name, interval in settings.JOBS_PERIODIC.items():
+        if not Job.objects.filter(name=name, created_at__gt=now - timedelta(seconds=interval)).exists():
+            enqueue(name)
+
+
+class Worker:
+    """
+    Claim due jobs and run up to ``concurrency`` of them at once in a pool of
+    processes, or one at a time in this process if ``concurrency`` is 0.
+    """
+
+    def __init__(self, concurrency=None, poll_interval=None):
+        self.concurrency = settings.JOBS_CONCURRENCY if concurrency is None else concurrency
+        self.poll_interval = settings.JOBS_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.id = f'{socket.gethostname()[:60]}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.running = {}
+        self.stopping = False
+        self.finished = threading.Event()
+
+    def stop(self, *args):
+        """Stop claiming jobs; run() returns once the running ones finish."""
+        self.stopping = True
+
+    def run(self, once=False):
+        """Work until stop(); with ``once``, until no job is due. Returns the number of jobs run."""
+        self.pool = self.make_pool() if self.concurrency else None
+        self.finished.clear()
+        heartbeat = threading.Thread(target=self.heartbeat, name='job-heartbeat', daemon=True)
+        heartbeat.start()
+        completed = 0
+        try:
+            while not self.stopping or self.running:
+                claimed = 0
+                if not self.stopping:
+                    recover_stalled_jobs(exclude=[job.pk for job in self.running.values()])
+                    enqueue_periodic_jobs()
+                    for job_id in due_job_ids(max(self.concurrency, 1) - len(self.running)):
+                        job = claim(job_id, worker=self.id)
+                        if job is None:
+                            continue
+                        claimed += 1
+                        if self.pool is None:
+                            finish(job, *execute(job.name, job.kwargs))
+                            completed += 1
+                        else:
+                            self.submit(job)
+                if self.running:
+                    completed += self.collect(timeout=self.poll_interval)
+                elif once and not claimed:
+                    break
+                elif not claimed:
+                    time.sleep(self.poll_interval)
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            self.finished.set()
+            heartbeat.join()
+        return completed
+
+    def heartbeat(self):
+        """
+        Mark this worker's jobs alive every JOBS_HEARTBEAT_INTERVAL until run()
+        returns. It runs in a thread so jobs run in this process (concurrency 0)
+        do not hold it up.
+        """
+        try:
+            while not self.finished.wait(settings.JOBS_HEARTBEAT_INTERVAL):
+                try:
+                    Job.objects.filter(worker=self.id, status=Job.RUNNING).update(heartbeat_at=timezone.now())
+                except DatabaseError:
+                    logger.exception("Job heartbeat failed")
+                close_old_connections()
+        finally:
+            connection.close()
+
+    def make_pool(self):
+        return ProcessPoolExecutor(
+            self.concurrency,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=pool.setup,
+            max_tasks_per_child=settings.JOBS_MAX_TASKS_PER_CHILD,
+        )
+
+    def submit(self, job):
+        try:
+            self.running[self.pool.submit(pool.execute, job.name, job.kwargs)] = job
+        except BrokenProcessPool as e:
+            # A pool process died; the jobs it took down fail in collect().
+            finish(job, False, f'{type(e).__name__}: {e}')
+            self.pool.shutdown(wait=False)
+            self.pool = self.make_pool()
+
+    def collect(self, timeout):
+        done, _ = wait(self.running, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            job = self.running.pop(future)
+            try:
+                outcome = future.result()
+            except Exception as e:
+                # The pool process died (e.g. killed for memory).
+                outcome = (False, f'{type(e).__name__}: {e}')
+            finish(job, *outcome)
+        return len(done)
+
+
+def job_metrics():
+    """Prometheus lines for Backend.metrics."""
+    counts = dict(
+        Job.objects.filter(status__in=[Job.QUEUED, Job.RUNNING]).order_by()
+        .values_list('status').annotate(total=Count('id'))
+    )
+    yield '# HELP jobs_pending Jobs waiting to run or running, by status.'
+    yield '# TYPE jobs_pending gauge'
+    for status in (Job.QUEUED, Job.RUNNING):
+        yield f'jobs_pending{{status="{status}"}} {counts.get(status, 0)}'
@@ -0,0 +1,38 @@
+class Task:
+    def __init__(self, name, function, max_attempts):
+        self.name = name
+        self.function = function
+        self.max_attempts = max_attempts
+
+    def __call__(self, **kwargs):
+        return self.function(**kwargs)
+
+    def enqueue(self, user=None, **kwargs):
+        from .queue import enqueue
+
+        return enqueue(self.name, user=user, **kwargs)
+
+
+TASKS = {}
+
+
+def task(name, max_attempts=None):
+    """
+    Register a function as the task ``name``. It is called with the job's
+    keyword arguments, which must be JSON-serializable, and its return value
+    is stored as the job's result. Tasks that are not safe to repeat should
+    set ``max_attempts=1``; others default to JOBS_MAX_ATTEMPTS.
+    """
+    def register(function):
+        if name in TASKS:
+            raise ValueError(f'Task {name!r} is already registered.')
+        TASKS[name] = Task(name, function, max_attempts)
+        return TASKS[name]
+    return register
+
+
+def get_task(name):
+    try:
+        return TASKS[name]
+    except KeyError:
+        raise LookupError(f'No task named {name!r}.') from None
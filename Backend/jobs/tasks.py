@@ -0,0 +1,15 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Job
+from .registry import task
+
+
+@task('jobs.prune_finished_jobs')
+def prune_finished_jobs():
+    """Delete jobs that finished more than JOBS_RETENTION_DAYS ago."""
+    cutoff = timezone.now() - timedelta(days=settings.JOBS_RETENTION_DAYS)
+    deleted, _ = Job.objects.filter(status__in=[Job.SUCCEEDED, Job.FAILED], finished_at__lt=cutoff).delete()
+    return {'deleted': deleted}
@@ -0,0 +1,117 @@
+import signal
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from . import pool
+from .models import Job
+from .queue import Worker, claim, enqueue, enqueue_periodic_jobs, finish, recover_stalled_jobs
+from .registry import task
+
+User = get_user_model()
+
+calls = []
+
+
+@task('jobs.tests.flaky')
+def flaky(fail_times):
+    calls.append(fail_times)
+    if len(calls) <= fail_times:
+        raise RuntimeError('try again')
+    return {'calls': len(calls)}
+
+
+@override_settings(JOBS_RUN_INLINE=False, JOBS_MAX_ATTEMPTS=3, JOBS_RETRY_DELAY=30, JOBS_PERIODIC={})
+class WorkerTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def run_due_jobs(self):
+        # Make retries due now rather than after their backoff.
+        Job.objects.filter(status=Job.QUEUED).update(run_after=timezone.now())
+        return Worker(concurrency=0).run(once=True)
+
+    def test_failed_jobs_are_retried_with_backoff(self):
+        job = enqueue('jobs.tests.flaky', fail_times=1)
+        self.assertEqual(Worker(concurrency=0).run(once=True), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.error), (Job.QUEUED, 1, 'RuntimeError: try again'))
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=25))
+
+        self.assertEqual(self.run_due_jobs(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.result, job.error), (Job.SUCCEEDED, 2, {'calls': 2}, ''))
+
+    def test_jobs_fail_after_max_attempts(self):
+        job = enqueue('jobs.tests.flaky', fail_times=5)
+        for _ in range(3):
+            self.run_due_jobs()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 3))
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(self.run_due_jobs(), 0)
+
+    def test_jobs_without_a_heartbeat_count_as_failed_attempts(self):
+        job = claim(enqueue('jobs.tests.flaky', fail_times=0).pk, worker='lost')
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        recover_stalled_jobs()
+        stalled = Job.objects.get(pk=job.pk)
+        self.assertEqual(stalled.status, Job.QUEUED)
+        self.assertIn('No heartbeat from worker lost', stalled.error)
+
+        # The lost run's report no longer applies once the job is retried.
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        retry = claim(job.pk, worker='other')
+        finish(job, True, {'stale': True})
+        retry.refresh_from_db()
+        self.assertEqual((retry.status, retry.worker, retry.attempts), (Job.RUNNING, 'other', 2))
+
+    def test_long_running_jobs_with_a_heartbeat_are_left_alone(self):
+        long_running = claim(enqueue('jobs.tests.flaky', fail_times=0).pk, worker='busy')
+        Job.objects.filter(pk=long_running.pk).update(started_at=timezone.now() - timedelta(hours=1))
+        own = claim(enqueue('jobs.tests.flaky', fail_times=0).pk, worker='self')
+        Job.objects.filter(pk=own.pk).update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        recover_stalled_jobs(exclude=[own.pk])
+        self.assertEqual(Job.objects.filter(status=Job.RUNNING).count(), 2)
+
+    def test_pool_processes_leave_stop_signals_to_the_worker(self):
+        with mock.patch('jobs.pool.django.setup'), mock.patch('jobs.pool.signal.signal') as set_handler:
+            pool.setup()
+        set_handler.assert_any_call(signal.SIGTERM, signal.SIG_IGN)
+        set_handler.assert_any_call(signal.SIGINT, signal.SIG_IGN)
+
+    @override_settings(JOBS_PERIODIC={'jobs.prune_finished_jobs': 3600})
+    def test_periodic_jobs_are_queued_once_per_interval(self):
+        enqueue_periodic_jobs()
+        enqueue_periodic_jobs()
+        self.assertEqual(Job.objects.filter(name='jobs.prune_finished_jobs').count(), 1)
+
+    def test_unknown_tasks_are_rejected(self):
+        with self.assertRaises(LookupError):
+            enqueue('jobs.tests.missing')
+
+
+@override_settings(JOBS_RUN_INLINE=True)
+class JobViewTests(APITestCase):
+    def setUp(self):
+        calls.clear()
+        self.user = User.objects.create_user(username='reader', email='reader@example.com')
+        self.other = User.objects.create_user(username='writer', email='writer@example.com')
+        self.client.force_authenticate(self.user)
+
+    def test_users_see_only_their_own_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = enqueue('jobs.tests.flaky', user=self.user, fail_times=0)
+            other = enqueue('jobs.tests.flaky', user=self.other, fail_times=0)
+
+        data = self.client.get(reverse('job-list')).data
+        self.assertEqual([row['id'] for row in data['results']], [job.pk])
+        data = self.client.get(reverse('job-detail', args=[job.pk])).data
+        self.assertEqual((data['status'], data['result']), (Job.SUCCEEDED, {'calls': 1}))
+        self.assertEqual(self.client.get(reverse('job-detail', args=[other.pk])).status_code, 404)
@@ -0,0 +1,29 @@
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticated
+
+from .models import Job
+from .serializers import JobSerializer
+
+
+class OwnJobsMixin:
+    serializer_class = JobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Staff see every job, including the ones no user queued.
+        if self.request.user.is_staff:
+            return Job.objects.all()
+        return Job.objects.filter(created_by=self.request.user)
+
+
+class JobListView(OwnJobsMixin, generics.ListAPIView):
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        status = self.request.query_params.get('status')
+        if status:
+            queryset = queryset.filter(status=status)
+        return queryset
+
+
+class JobDetailView(OwnJobsMixin, generics.RetrieveAPIView):
+    pass
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ReadingListsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reading_lists'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.5 on 2026-10-18 06:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('books', '0007_list_indexes'),
+        ('reading_lists', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='readinglist',
+            index=models.Index(fields=['user', '-created_at', 'updated_at'], name='readinglist_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='readinglistitem',
+            index=models.Index(fields=['reading_list', 'order', 'added_at'], name='item_list_order_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+# reading_lists.ordering.ORDER_GAP when this migration was written.
+ORDER_GAP = 1024
+
+
+def respace_items(apps, schema_editor):
+    ReadingListItem = apps.get_model('reading_lists', 'ReadingListItem')
+    # Read every id up front: updating "order" while iterating an index on it
+    # could revisit rows.
+    rows = list(
+        ReadingListItem.objects.order_by('reading_list_id', 'order', 'added_at', 'id')
+        .values_list('id', 'reading_list_id')
+    )
+    items, list_id, position = [], None, 0
+    for pk, reading_list_id in rows:
+        if reading_list_id != list_id:
+            list_id, position = reading_list_id, 0
+        position += 1
+        items.append(ReadingListItem(pk=pk, order=position * ORDER_GAP))
+    ReadingListItem.objects.bulk_update(items, ['order'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reading_lists', '0003_list_indexes'),
+    ]
+
+    operations = [
+        # Spread existing items ORDER_GAP apart; the old dense values are
+        # still a valid ordering, so reversing changes nothing.
+        migrations.RunPython(respace_items, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,25 @@
 from django.db import models
 from django.contrib.auth import get_user_model
-from books.models import Book
+from books.models import Book, authors_prefetch
 
 User = get_user_model()
 
+
+class ReadingListQuerySet(models.QuerySet):
+    def with_item_count(self):
+        queryset = self.select_related('user').annotate(items_count=models.Count('items'))
+        if not self.query.order_by:
+            # Meta.ordering is dropped once the COUNT adds a GROUP BY.
+            queryset = queryset.order_by(*self.model._meta.ordering)
+        return queryset
+
+    def with_items(self, items=None):
+        """with_item_count() plus the items, fetched with ``items`` (default: with their books)."""
+        if items is None:
+            items = ReadingListItem.objects.with_books()
+        return self.with_item_count().prefetch_related(models.Prefetch('items', queryset=items))
+
+
 class ReadingList(models.Model):
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
@@ -12,24 +28,40 @@ class ReadingList(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ReadingListQuerySet.as_manager()
+
     class Meta:
         unique_together = ['user', 'name']
         ordering = ['-created_at']
+        indexes = [
+            # updated_at rides along so the ETag aggregate is an index-only scan.
+            models.Index(fields=['user', '-created_at', 'updated_at'], name='readinglist_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s {self.name}"
     
 
+class ReadingListItemQuerySet(models.QuerySet):
+    def with_books(self):
+        return self.select_related('book__created_by').prefetch_related(authors_prefetch('book__book_authors'))
+
+
 class ReadingListItem(models.Model):
     reading_list = models.ForeignKey(ReadingList, on_delete=models.CASCADE, related_name='items')
     book = models.ForeignKey(Book, on_delete=models.CASCADE)
     order = models.PositiveIntegerField(default=0)
     added_at = models.DateTimeField(auto_now_add=True)
     notes = models.TextField(blank=True)
-    
+
+    objects = ReadingListItemQuerySet.as_manager()
+
     class Meta:
         unique_together = ['reading_list', 'book']
         ordering = ['order', 'added_at']
+        indexes = [
+            models.Index(fields=['reading_list', 'order', 'added_at'], name='item_list_order_idx'),
+        ]
     
     def __str__(self):
         return f"{self.book.title} in {self.reading_list.name}"   
\ No newline at end of file
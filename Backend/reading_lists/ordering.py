@@ -0,0 +1,53 @@
+from django.db.models import Max
+
+from .models import ReadingListItem
+
+# Items are spaced ORDER_GAP apart, so an item moves by taking a free value
+# between its new neighbours: one row changes, not every row after it.
+ORDER_GAP = 1024
+
+
+def next_orders(reading_list, count):
+    """Order values for ``count`` items appended to the end of ``reading_list``."""
+    last = reading_list.items.aggregate(last=Max('order'))['last'] or 0
+    return [last + ORDER_GAP * (i + 1) for i in range(count)]
+
+
+def respace(reading_list):
+    """Renumber the list's items ORDER_GAP apart, keeping their current order."""
+    items = list(reading_list.items.order_by('order', 'added_at', 'id').only('id', 'order'))
+    for position, item in enumerate(items, start=1):
+        item.order = position * ORDER_GAP
+    ReadingListItem.objects.bulk_update(items, ['order'], batch_size=1000)
+
+
+def neighbours(reading_list, item, after):
+    """Order values of the items ``item`` would sit between, placed after ``after``."""
+    others = reading_list.items.exclude(pk=item.pk)
+    if after is None:
+        previous = 0
+    else:
+        previous = others.values_list('order', flat=True).get(pk=after.pk)
+        # >= so an item tied with ``after`` counts as its next neighbour.
+        others = others.exclude(pk=after.pk).filter(order__gte=previous)
+    return previous, others.order_by('order').values_list('order', flat=True).first()
+
+
+def place_after(reading_list, item, after):
+    """
+    Return an order value that puts ``item`` right after ``after`` (another
+    item of the list, or None for the front). Respaces the list when there
+    is no free value left between the two neighbours.
+    """
+    previous, following = neighbours(reading_list, item, after)
+    if following is not None and following - previous <= 1:
+        respace(reading_list)
+        previous, following = neighbours(reading_list, item, after)
+    if following is None:
+        return previous + ORDER_GAP
+    return (previous + following) // 2
+
+
+def move_item(reading_list, item, after):
+    item.order = place_after(reading_list, item, after)
+    item.save(update_fields=['order'])
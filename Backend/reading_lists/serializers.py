@@ -1,9 +1,12 @@
 from rest_framework import serializers
+from Backend.fields import SparseFieldsMixin
+from Backend.metrics import TimedSerializerMixin
 from .models import ReadingList, ReadingListItem
+from books.models import Book
 from books.serializers import BookSerializer
 
 
-class ReadingListItemSerializer(serializers.ModelSerializer):
+class ReadingListItemSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     book = BookSerializer(read_only=True)
     book_id = serializers.IntegerField(write_only=True)
 
@@ -12,10 +15,10 @@ class ReadingListItemSerializer(serializers.ModelSerializer):
         fields = ['id', 'book', 'book_id', 'order', 'notes', 'added_at']
         read_only_fields = ['id', 'added_at']
 
-class ReadingListSerializer(serializers.ModelSerializer):
+class ReadingListSerializer(SparseFieldsMixin, TimedSerializerMixin, serializers.ModelSerializer):
     items = ReadingListItemSerializer(many=True, read_only=True)
     user_username = serializers.CharField(source='user.username', read_only=True)
-    items_count = serializers.IntegerField(source='items.count', read_only=True)
+    items_count = serializers.SerializerMethodField()
 
     class Meta:
         model = ReadingList
@@ -23,8 +26,76 @@ class ReadingListSerializer(serializers.ModelSerializer):
             'id', 'name', 'description', 'user', 'user_username',
             'is_public', 'items', 'items_count', 'created_at', 'updated_at'
         ]
+        # The list endpoint leaves out the items unless ?expand=items.
+        summary_fields = [
+            'id', 'name', 'description', 'user', 'user_username',
+            'is_public', 'items_count', 'created_at', 'updated_at'
+        ]
+
+    def get_items_count(self, obj):
+        # Annotated by ReadingListQuerySet.with_items(); fall back for bare instances.
+        if hasattr(obj, 'items_count'):
+            return obj.items_count
+        return obj.items.count()
 
 class ReadingListCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = ReadingList
         fields = ['name', 'description', 'is_public']
+
+
+# Largest batch the bulk item endpoints accept in one request.
+MAX_BATCH_SIZE = 500
+
+
+class BulkAddItemsSerializer(serializers.Serializer):
+    items = ReadingListItemSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_SIZE)
+
+    def validate_items(self, items):
+        book_ids = [item['book_id'] for item in items]
+        if len(set(book_ids)) != len(book_ids):
+            raise serializers.ValidationError("Each book can only be added once.")
+        missing = set(book_ids) - set(Book.objects.filter(pk__in=book_ids).values_list('pk', flat=True))
+        if missing:
+            raise serializers.ValidationError(f"Books not found: {sorted(missing)}")
+        present = set(self.context['reading_list'].items.filter(book_id__in=book_ids).values_list('book_id', flat=True))
+        if present:
+            raise serializers.ValidationError(f"Books already in the list: {sorted(present)}")
+        return items
+
+
+class BulkRemoveItemsSerializer(serializers.Serializer):
+    item_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=MAX_BATCH_SIZE
+    )
+
+    def validate_item_ids(self, item_ids):
+        item_ids = set(item_ids)
+        found = set(self.context['reading_list'].items.filter(pk__in=item_ids).values_list('pk', flat=True))
+        if found != item_ids:
+            raise serializers.ValidationError(f"Items not found: {sorted(item_ids - found)}")
+        return sorted(item_ids)
+
+
+class ItemMoveSerializer(serializers.Serializer):
+    item_id = serializers.IntegerField()
+    # The item to place it after; null moves it to the front.
+    after_id = serializers.IntegerField(allow_null=True)
+
+    def validate(self, attrs):
+        if attrs['item_id'] == attrs['after_id']:
+            raise serializers.ValidationError("An item cannot be placed after itself.")
+        return attrs
+
+
+class ReorderItemsSerializer(serializers.Serializer):
+    moves = ItemMoveSerializer(many=True, allow_empty=False, max_length=MAX_BATCH_SIZE)
+
+    def validate_moves(self, moves):
+        item_ids = {move['item_id'] for move in moves} | {move['after_id'] for move in moves}
+        item_ids.discard(None)
+        items = self.context['reading_list'].items.only('id', 'order', 'reading_list_id').in_bulk(item_ids)
+        missing = item_ids - set(items)
+        if missing:
+            raise serializers.ValidationError(f"Items not found: {sorted(missing)}")
+        return [(items[move['item_id']], items.get(move['after_id'])) for move in moves]
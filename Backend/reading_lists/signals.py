@@ -0,0 +1,38 @@
+import contextvars
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ReadingList, ReadingListItem
+
+pending_touches = contextvars.ContextVar('pending_reading_list_touches', default=None)
+
+
+def touch_reading_lists(*list_ids):
+    # Bump the parents' updated_at so their ETag/Last-Modified change with their items.
+    pending = pending_touches.get()
+    if pending is not None:
+        pending.update(list_ids)
+    else:
+        ReadingList.objects.filter(pk__in=list_ids).update(updated_at=timezone.now())
+
+
+@contextmanager
+def batched_touches():
+    """Bump each reading list touched inside the block once, on the way out."""
+    pending = set()
+    token = pending_touches.set(pending)
+    try:
+        yield
+    finally:
+        pending_touches.reset(token)
+    if pending:
+        touch_reading_lists(*pending)
+
+
+@receiver(post_save, sender=ReadingListItem)
+@receiver(post_delete, sender=ReadingListItem)
+def touch_reading_list(sender, instance, **kwargs):
+    touch_reading_lists(instance.reading_list_id)
@@ -1,3 +1,275 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from books.models import Book
+from books.tests import make_books
+from . import views
+from .models import ReadingList, ReadingListItem
+from .ordering import ORDER_GAP
+
+User = get_user_model()
+
+
+class ReadingListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.client.force_authenticate(self.user)
+
+    def make_lists(self, lists, items_per_list):
+        ReadingList.objects.all().delete()
+        Book.objects.all().delete()
+        books = make_books(self.owner, items_per_list)
+        for i in range(lists):
+            reading_list = ReadingList.objects.create(user=self.user, name=f'List {i}')
+            ReadingListItem.objects.bulk_create([
+                ReadingListItem(reading_list=reading_list, book=book, order=position)
+                for position, book in enumerate(books)
+            ])
+        return reading_list
+
+    def test_list_query_count_is_constant(self):
+        url = reverse('reading-list-list-create')
+        for lists, items_per_list in ((1, 1), (5, 30)):
+            self.make_lists(lists, items_per_list)
+            # ETag validators, COUNT(*) for pagination and the annotated lists.
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('items', response.data['results'][0])
+            # Expanded: one prefetch for items/books/owners and one for the books' authors.
+            with self.assertNumQueries(5):
+                response = self.client.get(url, {'expand': 'items'})
+        first = response.data['results'][0]
+        self.assertEqual(first['items_count'], 30)
+        self.assertEqual(len(first['items']), 30)
+        self.assertEqual(first['items'][0]['book']['created_by_username'], 'owner')
+
+    def test_detail_query_count_is_constant(self):
+        for lists, items_per_list in ((1, 1), (1, 40)):
+            reading_list = self.make_lists(lists, items_per_list)
+            with self.assertNumQueries(4):
+                response = self.client.get(reverse('reading-list-detail', args=[reading_list.pk]))
+            self.assertEqual(response.data['items_count'], items_per_list)
+
+    def test_other_users_lists_are_hidden(self):
+        other = ReadingList.objects.create(user=self.owner, name='Private')
+        response = self.client.get(reverse('reading-list-detail', args=[other.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+class ReadingListSparseFieldsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.com')
+        self.client.force_authenticate(self.user)
+        self.reading_list = ReadingList.objects.create(user=self.user, name='Favourites')
+        for position, book in enumerate(make_books(self.user, 2)):
+            ReadingListItem.objects.create(reading_list=self.reading_list, book=book, order=position)
+        self.url = reverse('reading-list-detail', args=[self.reading_list.pk])
+
+    def test_nested_books_are_summaries_unless_expanded(self):
+        book = self.client.get(self.url).data['items'][0]['book']
+        self.assertEqual(book['title'], 'Book-0')
+        self.assertNotIn('description', book)
+        book = self.client.get(self.url, {'expand': 'items.book'}).data['items'][0]['book']
+        self.assertIn('description', book)
+
+    def test_fields_reach_into_items_and_skip_unread_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'fields': 'id,items.order,items.book.title'})
+        self.assertEqual(response.data, {'id': self.reading_list.pk, 'items': [
+            {'order': 0, 'book': {'title': 'Book-0'}}, {'order': 1, 'book': {'title': 'Book-1'}},
+        ]})
+        items_sql = next(query['sql'] for query in queries if 'FROM "reading_lists_readinglistitem"' in query['sql'])
+        self.assertNotIn('"notes"', items_sql)
+        self.assertNotIn('"description"', items_sql)
+        self.assertFalse(any('books_bookauthor' in query['sql'] for query in queries))
+
+        response = self.client.get(self.url, {'fields': 'id,items.book.colour'})
+        self.assertEqual(response.status_code, 400)
+
+
+class ReadingListConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.force_authenticate(self.user)
+        owner = User.objects.create_user(username='owner', email='owner@example.com')
+        self.books = make_books(owner, 2)
+        self.reading_list = ReadingList.objects.create(user=self.user, name='Favourites')
+        self.url = reverse('reading-list-detail', args=[self.reading_list.pk])
+
+    def assertChanged(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_unchanged_list_returns_304(self):
+        for url in (self.url, reverse('reading-list-list-create')):
+            etag = self.client.get(url)['ETag']
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_item_and_book_changes_bump_the_parent(self):
+        etag = self.client.get(self.url)['ETag']
+        add_url = reverse('add-book-to-list', args=[self.reading_list.pk])
+        item_id = self.client.post(add_url, {'book_id': self.books[0].pk}).data['id']
+        etag = self.assertChanged(self.url, etag)
+
+        book = self.books[0]
+        book.title = 'Edited'
+        book.save()
+        etag = self.assertChanged(self.url, etag)
+
+        owner = book.created_by
+        owner.username = 'renamed'
+        owner.save()
+        etag = self.assertChanged(self.url, etag)
+
+        self.client.delete(reverse('remove-book-from-list', args=[self.reading_list.pk, item_id]))
+        self.assertChanged(self.url, etag)
+
+    def test_validators_are_per_user(self):
+        etag = self.client.get(reverse('reading-list-list-create'))['ETag']
+        other = User.objects.create_user(username='other', email='other@example.com')
+        self.client.force_authenticate(other)
+        self.assertChanged(reverse('reading-list-list-create'), etag)
+
+
+class ReadingListExportTests(APITestCase):
+    def test_export_streams_one_row_per_item(self):
+        user = User.objects.create_user(username='reader', email='reader@example.com')
+        self.client.force_authenticate(user)
+        books = make_books(user, 3)
+        full = ReadingList.objects.create(user=user, name='Full')
+        for position, book in enumerate(books):
+            ReadingListItem.objects.create(reading_list=full, book=book, order=position)
+        ReadingList.objects.create(user=user, name='Empty')
+        ReadingList.objects.create(user=User.objects.create_user(username='x', email='x@example.com'), name='Theirs')
+
+        response = self.client.get(reverse('reading-list-export', args=['jsonl']))
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]['name'], 'Empty')
+        self.assertIsNone(rows[0]['items__id'])
+        self.assertEqual([row['items__book__title'] for row in rows[1:]], ['Book-0', 'Book-1', 'Book-2'])
+
+
+class ReadingListBulkItemTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='reader', email='reader@example.com')
+        self.client.force_authenticate(self.user)
+        self.books = make_books(self.user, 6)
+        self.reading_list = ReadingList.objects.create(user=self.user, name='Favourites')
+
+    def url(self, name):
+        return reverse(name, args=[self.reading_list.pk])
+
+    def titles(self):
+        return list(self.reading_list.items.order_by('order', 'added_at').values_list('book__title', flat=True))
+
+    def add(self, books):
+        return self.client.post(
+            self.url('bulk-add-books'), {'items': [{'book_id': book.pk} for book in books]}, format='json'
+        )
+
+    def test_bulk_add_appends_in_one_batch(self):
+        self.client.post(self.url('add-book-to-list'), {'book_id': self.books[0].pk})
+        # Savepoint, list lock, validation (books, already present), last
+        # order, INSERT, the created items with books and authors, one parent
+        # bump and the release.
+        with self.assertNumQueries(10):
+            response = self.add(self.books[1:])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['book']['title'] for item in response.data], [f'Book-{i}' for i in range(1, 6)])
+        self.assertEqual(self.titles(), [f'Book-{i}' for i in range(6)])
+        orders = list(self.reading_list.items.values_list('order', flat=True))
+        self.assertEqual(orders, [ORDER_GAP * i for i in range(1, 7)])
+
+    def test_bulk_add_rejects_the_whole_batch(self):
+        self.add(self.books[:1])
+        for books in (self.books[:2], [self.books[1], self.books[1]]):
+            response = self.add(books)
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.titles(), ['Book-0'])
+        self.assertEqual(self.client.post(self.url('bulk-add-books'), {'items': [{'book_id': 0}]}, format='json').status_code, 400)
+
+    def test_bulk_remove(self):
+        items = self.add(self.books).data
+        etag = self.client.get(reverse('reading-list-detail', args=[self.reading_list.pk]))['ETag']
+        url = self.url('bulk-remove-items')
+        response = self.client.post(url, {'item_ids': [items[0]['id'], 0]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(url, {'item_ids': [item['id'] for item in items[:4]]}, format='json')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.titles(), ['Book-4', 'Book-5'])
+        response = self.client.get(reverse('reading-list-detail', args=[self.reading_list.pk]), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_move_rewrites_only_the_moved_item(self):
+        items = [item['id'] for item in self.add(self.books).data]
+        url = self.url('reorder-items')
+        # Savepoint, list lock, item lookup, the two neighbours, one UPDATE,
+        # moved orders, parent bump and the release.
+        with self.assertNumQueries(9):
+            response = self.client.post(url, {'moves': [{'item_id': items[5], 'after_id': items[0]}]}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.titles(), ['Book-0', 'Book-5', 'Book-1', 'Book-2', 'Book-3', 'Book-4'])
+
+        moves = [{'item_id': items[0], 'after_id': items[4]}, {'item_id': items[3], 'after_id': None}]
+        self.client.post(url, {'moves': moves}, format='json')
+        self.assertEqual(self.titles(), ['Book-3', 'Book-5', 'Book-1', 'Book-2', 'Book-4', 'Book-0'])
+
+    def test_exhausted_gap_respaces_the_list(self):
+        items = [item['id'] for item in self.add(self.books[:3]).data]
+        url = self.url('reorder-items')
+        # Each move halves the gap in front of the first item.
+        for i in range(12):
+            moving = items[1] if i % 2 == 0 else items[2]
+            response = self.client.post(url, {'moves': [{'item_id': moving, 'after_id': None}]}, format='json')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.titles(), ['Book-2', 'Book-1', 'Book-0'])
+        orders = list(self.reading_list.items.values_list('order', flat=True))
+        self.assertEqual(len(set(orders)), 3)
+
+    def test_invalid_moves(self):
+        items = [item['id'] for item in self.add(self.books[:2]).data]
+        url = self.url('reorder-items')
+        for move in ({'item_id': items[0], 'after_id': items[0]}, {'item_id': items[0], 'after_id': 0}):
+            self.assertEqual(self.client.post(url, {'moves': [move]}, format='json').status_code, 400)
+        other = ReadingList.objects.create(user=User.objects.create_user(username='x', email='x@example.com'), name='Theirs')
+        response = self.client.post(reverse('reorder-items', args=[other.pk]), {'moves': []}, format='json')
+        self.assertEqual(response.status_code, 404)
+
+
+class AsyncReadingListViewTests(APITestCase):
+    def test_async_views_match_sync_views(self):
+        user = User.objects.create_user(username='reader', email='reader@example.com')
+        reading_list = ReadingList.objects.create(user=user, name='Favourites')
+        for position, book in enumerate(make_books(user, 2)):
+            ReadingListItem.objects.create(reading_list=reading_list, book=book, order=position)
+        factory = APIRequestFactory()
+
+        cases = (
+            (views.ReadingListListCreateView, views.AsyncReadingListListCreateView, {}),
+            (views.ReadingListDetailView, views.AsyncReadingListDetailView, {'pk': reading_list.pk}),
+        )
+        for sync_view, async_view, kwargs in cases:
+            request = factory.get('/')
+            force_authenticate(request, user)
+            expected = sync_view.as_view()(request, **kwargs).render()
+
+            request = factory.get('/')
+            force_authenticate(request, user)
+            response = async_to_sync(async_view.as_view())(request, **kwargs).render()
+            self.assertEqual(response.data, expected.data)
+            self.assertEqual(response['ETag'], expected['ETag'])
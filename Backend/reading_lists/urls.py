@@ -1,10 +1,19 @@
+from django.conf import settings
 from django.urls import path 
 from . import views
 
+if settings.ASYNC_VIEWS:
+    list_view, detail_view = views.AsyncReadingListListCreateView, views.AsyncReadingListDetailView
+else:
+    list_view, detail_view = views.ReadingListListCreateView, views.ReadingListDetailView
 
 urlpatterns = [
-    path('', views.ReadingListListCreateView.as_view(), name='reading-list-list-create'),
-    path('<int:pk>/', views.ReadingListDetailView.as_view(), name='reading-list-detail'),
+    path('', list_view.as_view(), name='reading-list-list-create'),
+    path('export/<str:file_format>/', views.ReadingListExportView.as_view(), name='reading-list-export'),
+    path('<int:pk>/', detail_view.as_view(), name='reading-list-detail'),
     path('<int:list_id>/add-book/', views.AddBookToListView.as_view(), name='add-book-to-list'),
     path('<int:list_id>/items/<int:item_id>/', views.RemoveBookFromListView.as_view(), name='remove-book-from-list'),
+    path('<int:list_id>/items/bulk-add/', views.BulkAddBooksView.as_view(), name='bulk-add-books'),
+    path('<int:list_id>/items/bulk-remove/', views.BulkRemoveItemsView.as_view(), name='bulk-remove-items'),
+    path('<int:list_id>/items/reorder/', views.ReorderItemsView.as_view(), name='reorder-items'),
 ]
@@ -1,31 +1,92 @@
+import abc
+
 from rest_framework import generics, status
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
+from django.db import transaction
+from django.db.models import Count, Max
+from Backend.async_views import AsyncAPIViewMixin, AsyncListModelMixin, AsyncRetrieveModelMixin
+from Backend.conditional import AsyncConditionalGetMixin, ConditionalGetMixin
+from Backend.fields import SparseFieldsViewMixin
+from Backend.streaming import EXPORT_FORMATS, streaming_export
+from books.serializers import load_book_fields
 from .models import ReadingList, ReadingListItem
+from .ordering import move_item, next_orders
 from .serializers import (
     ReadingListSerializer, 
     ReadingListCreateUpdateSerializer,
-    ReadingListItemSerializer
+    ReadingListItemSerializer,
+    BulkAddItemsSerializer,
+    BulkRemoveItemsSerializer,
+    ReorderItemsSerializer,
 )
+from .signals import batched_touches, touch_reading_lists
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 
-class ReadingListListCreateView(generics.ListCreateAPIView):
+def validator_aggregates():
+    # Item changes touch the parent list's updated_at (see signals); book
+    # edits are picked up through the items' books, and renamed book owners
+    # (created_by_username) through the books' creators.
+    return {
+        'updated_at': Max('updated_at'),
+        'book_updated_at': Max('items__book__updated_at'),
+        'book_owner_updated_at': Max('items__book__created_by__updated_at'),
+        'count': Count('id', distinct=True),
+    }
+
+
+def reading_list_validator_state(request, queryset):
+    state = queryset.aggregate(**validator_aggregates())
+    state['user'] = request.user.pk
+    state['user_updated_at'] = request.user.updated_at
+    return state
+
+
+async def areading_list_validator_state(request, queryset):
+    state = await queryset.aaggregate(**validator_aggregates())
+    state['user'] = request.user.pk
+    state['user_updated_at'] = request.user.updated_at
+    return state
+
+
+class SparseReadingListQuerysetMixin(SparseFieldsViewMixin):
+    """Prefetch the items, and load their books' columns, only as far as the serializer will read them."""
+
+    def get_queryset(self):
+        queryset = ReadingList.objects.filter(user=self.request.user)
+        serializer = self.get_read_serializer()
+        if serializer is None:
+            return queryset
+        items = serializer.fields.get('items')
+        if items is None:
+            return queryset.with_item_count()
+        item_serializer = items.child
+        item_queryset = ReadingListItem.objects.defer(*item_serializer.get_deferred_columns())
+        if 'book' in item_serializer.fields:
+            item_queryset = load_book_fields(item_queryset, item_serializer.fields['book'], prefix='book__')
+        return queryset.with_items(item_queryset)
+
+
+class ReadingListListCreateView(SparseReadingListQuerysetMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
+    summary_view = True
 
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return ReadingListCreateUpdateSerializer
         return ReadingListSerializer
     
-    def get_queryset(self):
-        return ReadingList.objects.filter(user=self.request.user)
-    
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-class ReadingListDetailView(generics.RetrieveUpdateDestroyAPIView):
+    def get_validator_state(self):
+        return reading_list_validator_state(
+            self.request, ReadingList.objects.filter(user=self.request.user)
+        )
+
+class ReadingListDetailView(SparseReadingListQuerysetMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_serializer_class(self):
@@ -33,10 +94,63 @@ class ReadingListDetailView(generics.RetrieveUpdateDestroyAPIView):
             return ReadingListCreateUpdateSerializer
         return ReadingListSerializer
     
-    def get_queryset(self):
-        return ReadingList.objects.filter(user=self.request.user)
+    def get_validator_state(self):
+        state = reading_list_validator_state(
+            self.request, ReadingList.objects.filter(user=self.request.user, pk=self.kwargs['pk'])
+        )
+        return state if state['count'] else None
     
 
+class AsyncReadingListListCreateView(
+    AsyncAPIViewMixin, AsyncConditionalGetMixin, AsyncListModelMixin, ReadingListListCreateView
+):
+    """ReadingListListCreateView with an async GET, for ASGI deployments (ASYNC_VIEWS)."""
+
+    async def aget_validator_state(self):
+        return await areading_list_validator_state(
+            self.request, ReadingList.objects.filter(user=self.request.user)
+        )
+
+    async def aget_response(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+
+class AsyncReadingListDetailView(
+    AsyncAPIViewMixin, AsyncConditionalGetMixin, AsyncRetrieveModelMixin, ReadingListDetailView
+):
+    """ReadingListDetailView with an async GET, for ASGI deployments (ASYNC_VIEWS)."""
+
+    async def aget_validator_state(self):
+        state = await areading_list_validator_state(
+            self.request, ReadingList.objects.filter(user=self.request.user, pk=self.kwargs['pk'])
+        )
+        return state if state['count'] else None
+
+    async def aget_response(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+
+class ReadingListExportView(APIView):
+    """Stream the user's reading lists as CSV or JSON lines, one row per item."""
+    permission_classes = [IsAuthenticated]
+    columns = [
+        'id', 'name', 'description', 'is_public', 'created_at',
+        'items__id', 'items__order', 'items__notes', 'items__added_at',
+        'items__book', 'items__book__title', 'items__book__authors', 'items__book__isbn',
+    ]
+
+    def get(self, request, file_format):
+        if file_format not in EXPORT_FORMATS:
+            return Response({'error': 'Unsupported export format'}, status=status.HTTP_404_NOT_FOUND)
+        # Lists without items still produce one row, with empty item columns.
+        queryset = (
+            ReadingList.objects.filter(user=request.user)
+            .order_by('-created_at', 'id', 'items__order', 'items__added_at')
+            .values_list(*self.columns)
+        )
+        return streaming_export(queryset, self.columns, file_format, 'reading-lists')
+
+
 class AddBookToListView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -48,7 +162,11 @@ class AddBookToListView(APIView):
         
         serializer = ReadingListItemSerializer(data=request.data)
         if serializer.is_valid():
-            serializer.save(reading_list=reading_list)
+            extra = {}
+            if 'order' not in serializer.validated_data:
+                # Append, leaving a gap so later moves touch a single row.
+                extra['order'] = next_orders(reading_list, 1)[0]
+            serializer.save(reading_list=reading_list, **extra)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -64,4 +182,63 @@ class RemoveBookFromListView(APIView):
             item.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
         except (ReadingList.DoesNotExist, ReadingListItem.DoesNotExist):
-            return Response({'error': 'Item not found'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+            return Response({'error': 'Item not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+class BulkItemView(APIView, abc.ABC):
+    """
+    Base for the bulk item endpoints: validates the body against
+    ``serializer_class`` and runs ``apply`` in one transaction, holding the
+    reading list's row lock so concurrent batches on a list do not interleave.
+    """
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def post(self, request, list_id):
+        with transaction.atomic(), batched_touches():
+            try:
+                reading_list = ReadingList.objects.select_for_update().get(id=list_id, user=request.user)
+            except ReadingList.DoesNotExist:
+                return Response({'error': 'Reading list not found'}, status=status.HTTP_404_NOT_FOUND)
+
+            serializer = self.serializer_class(data=request.data, context={'reading_list': reading_list})
+            serializer.is_valid(raise_exception=True)
+            return self.apply(reading_list, serializer.validated_data)
+
+    @abc.abstractmethod
+    def apply(self, reading_list, data):
+        """Make the change described by ``data`` and return the response."""
+
+
+class BulkAddBooksView(BulkItemView):
+    serializer_class = BulkAddItemsSerializer
+
+    def apply(self, reading_list, data):
+        orders = next_orders(reading_list, len(data['items']))
+        created = ReadingListItem.objects.bulk_create([
+            ReadingListItem(reading_list=reading_list, book_id=item['book_id'], notes=item.get('notes', ''), order=order)
+            for item, order in zip(data['items'], orders)
+        ])
+        touch_reading_lists(reading_list.pk)
+        items = ReadingListItem.objects.with_books().filter(pk__in=[item.pk for item in created])
+        return Response(ReadingListItemSerializer(items, many=True).data, status=status.HTTP_201_CREATED)
+
+
+class BulkRemoveItemsView(BulkItemView):
+    serializer_class = BulkRemoveItemsSerializer
+
+    def apply(self, reading_list, data):
+        reading_list.items.filter(pk__in=data['item_ids']).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ReorderItemsView(BulkItemView):
+    """Apply ``moves`` in sequence; each one normally rewrites only the moved item."""
+    serializer_class = ReorderItemsSerializer
+
+    def apply(self, reading_list, data):
+        for item, after in data['moves']:
+            move_item(reading_list, item, after)
+        # Re-read: a later move may have respaced the list under an earlier one.
+        moved = reading_list.items.filter(pk__in={item.pk for item, _ in data['moves']})
+        return Response({'items': list(moved.order_by('order', 'added_at').values('id', 'order'))})
@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from Backend.metrics import register_collector
+
+        from . import signals  # noqa: F401
+        from .revocation import revocation_metrics
+        from .throttling import throttle_metrics
+
+        register_collector(revocation_metrics)
+        register_collector(throttle_metrics)
@@ -1,20 +1,86 @@
 from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
 from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+
+from .cache import aget_cached_user, get_cached_user
 
 class CookieJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
+        raw_token = self.get_request_token(request)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_user(validated_token), validated_token
+
+    async def authenticate_async(self, request):
+        # Used by Backend.async_views; token validation is CPU-only, so only
+        # the user lookup needs to await.
+        raw_token = self.get_request_token(request)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    def get_request_token(self, request):
         # Try to get token from cookie first
         raw_token = request.COOKIES.get(settings.ACCESS_TOKEN_COOKIE_NAME)
-        
+
         if raw_token is None:
             # Fallback to header authentication for API testing
             header = self.get_header(request)
             if header is None:
                 return None
             raw_token = self.get_raw_token(header)
-            if raw_token is None:
-                return None
-        
-        validated_token = self.get_validated_token(raw_token)
-        return self.get_user(validated_token), validated_token
\ No newline at end of file
+        return raw_token
+
+    def get_user(self, validated_token):
+        # Same checks as JWTAuthentication.get_user, but the lookup goes
+        # through users.cache instead of querying users_user every request.
+        # Misses read the primary: a replica could still hold the user as
+        # it was before the change that invalidated the cache entry.
+        user_id = self.get_token_user_id(validated_token)
+        try:
+            user = get_cached_user(
+                user_id,
+                lambda: self.user_model.objects.using(DEFAULT_DB_ALIAS).get(**{api_settings.USER_ID_FIELD: user_id}),
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        return self.check_user(user, validated_token)
+
+    async def aget_user(self, validated_token):
+        user_id = self.get_token_user_id(validated_token)
+        try:
+            user = await aget_cached_user(
+                user_id,
+                lambda: self.user_model.objects.using(DEFAULT_DB_ALIAS).aget(**{api_settings.USER_ID_FIELD: user_id}),
+            )
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+        return self.check_user(user, validated_token)
+
+    def get_token_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+    def check_user(self, user, validated_token):
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Cached users carry the hash of their password, not the password.
+            marker = getattr(user, 'password_marker', None) or get_md5_hash_password(user.password)
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != marker:
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
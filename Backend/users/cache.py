@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+LOCAL_CACHE_SIZE = 1024
+# What authentication, permissions and the profile views read from
+# request.user. The password hash and last login stay out of the shared
+# cache; reading them off a cached user loads them from the database.
+CACHED_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'bio', 'profile_picture',
+    'is_active', 'is_staff', 'is_superuser', 'created_at', 'updated_at',
+)
+PASSWORD_MARKER = 'password_marker'
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def version_key(user_id):
+    return f'users:auth:version:{user_id}'
+
+
+def user_key(user_id, version):
+    return f'users:auth:{user_id}:{version}'
+
+
+def get_user_version(user_id):
+    version = cache.get(version_key(user_id))
+    if version is None:
+        # Seed from the clock so an evicted counter never reuses an old version.
+        cache.add(version_key(user_id), int(time.time() * 1000), None)
+        version = cache.get(version_key(user_id))
+    return version
+
+
+def invalidate_user(user_id):
+    try:
+        cache.incr(version_key(user_id))
+    except ValueError:
+        cache.set(version_key(user_id), int(time.time() * 1000), None)
+    with _local_lock:
+        _local.pop(user_id, None)
+
+
+def get_cached_user(user_id, load):
+    """
+    Return the user for ``user_id`` from the in-process cache, then the shared
+    cache, calling ``load()`` only on a miss in both.
+
+    Entries are keyed on the user's version stamp, which ``invalidate_user()``
+    bumps, so every lookup costs a single shared-cache read and no query.
+    Only ``CACHED_FIELDS`` are stored; each caller gets a fresh instance with
+    the rest deferred, as views may modify ``request.user``.
+    """
+    version = get_user_version(user_id)
+    state = get_local(user_id, version)
+    if state is None:
+        state = cache.get(user_key(user_id, version))
+        if state is None:
+            state = user_state(load())
+            cache.set(user_key(user_id, version), state, settings.USER_CACHE_TIMEOUT)
+        put_local(user_id, version, state)
+    return user_from_state(state)
+
+
+def user_state(user):
+    state = {}
+    for name in CACHED_FIELDS:
+        field = user._meta.get_field(name)
+        state[field.attname] = field.get_prep_value(field.value_from_object(user))
+    if api_settings.CHECK_REVOKE_TOKEN:
+        # What the token's revoke claim is compared with, so a password
+        # change is still noticed without caching the hash itself.
+        state[PASSWORD_MARKER] = get_md5_hash_password(user.password)
+    return state
+
+
+def user_from_state(state):
+    fields = [field for field in get_user_model()._meta.concrete_fields if field.attname in state]
+    user = get_user_model().from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in fields],
+        [state[field.attname] for field in fields],
+    )
+    user.password_marker = state.get(PASSWORD_MARKER)
+    return user
+
+
+async def aget_user_version(user_id):
+    version = await cache.aget(version_key(user_id))
+    if version is None:
+        await cache.aadd(version_key(user_id), int(time.time() * 1000), None)
+        version = await cache.aget(version_key(user_id))
+    return version
+
+
+async def aget_cached_user(user_id, load):
+    """Async get_cached_user(); ``load`` is a coroutine function."""
+    version = await aget_user_version(user_id)
+    state = get_local(user_id, version)
+    if state is None:
+        state = await cache.aget(user_key(user_id, version))
+        if state is None:
+            state = user_state(await load())
+            await cache.aset(user_key(user_id, version), state, settings.USER_CACHE_TIMEOUT)
+        put_local(user_id, version, state)
+    return user_from_state(state)
+
+
+def get_local(user_id, version):
+    with _local_lock:
+        entry = _local.get(user_id)
+        if entry is not None and entry[0] == version:
+            _local.move_to_end(user_id)
+            return entry[1]
+    return None
+
+
+def put_local(user_id, version, state):
+    with _local_lock:
+        _local[user_id] = (version, state)
+        _local.move_to_end(user_id)
+        while len(_local) > LOCAL_CACHE_SIZE:
+            _local.popitem(last=False)
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+# Cost parameters come from settings so they can be raised without a code
+# change. Stored hashes with a different cost (or from a non-preferred
+# hasher) are transparently re-hashed on the user's next successful login.
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    iterations = settings.PASSWORD_PBKDF2_ITERATIONS or hashers.PBKDF2PasswordHasher.iterations
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    work_factor = settings.PASSWORD_SCRYPT_WORK_FACTOR or hashers.ScryptPasswordHasher.work_factor
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    # Requires the optional argon2-cffi package.
+    time_cost = settings.PASSWORD_ARGON2_TIME_COST or hashers.Argon2PasswordHasher.time_cost
+    memory_cost = settings.PASSWORD_ARGON2_MEMORY_COST or hashers.Argon2PasswordHasher.memory_cost
@@ -0,0 +1,68 @@
+import time
+
+from django.contrib.auth import authenticate, get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+
+from users.views import LoginView
+
+User = get_user_model()
+
+EMAIL = 'login-benchmark@example.com'
+PASSWORD = 'Benchmark-pass1!'
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure logins per second in a single process (one sync gunicorn "
+        "worker), comparing the old double-hash check with the current view."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=5.0, help="Time budget per scenario.")
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        view = LoginView.as_view()
+
+        def legacy_check():
+            # What LoginView.post did before: fetch, check_password, then authenticate() again.
+            user = User.objects.get(email=EMAIL)
+            user.check_password(PASSWORD)
+            return authenticate(None, username=EMAIL, password=PASSWORD)
+
+        def current_check():
+            return authenticate(None, username=EMAIL, password=PASSWORD)
+
+        def login_view():
+            request = factory.post('/api/auth/login/', {'email': EMAIL, 'password': PASSWORD}, format='json')
+            response = view(request)
+            assert response.status_code == 200, response.status_code
+
+        with transaction.atomic():
+            User.objects.filter(email=EMAIL).delete()
+            User.objects.create_user(username='login-benchmark', email=EMAIL, password=PASSWORD)
+            # Warm up so hash upgrades and imports do not skew the first scenario.
+            login_view()
+
+            self.stdout.write(f"{'scenario':<40}{'logins/s':>10}{'ms/login':>10}")
+            for name, run in (
+                ('legacy check (2 hashes)', legacy_check),
+                ('current check (1 hash)', current_check),
+                ('current LoginView end to end', login_view),
+            ):
+                count, elapsed = self.measure(run, options['seconds'])
+                self.stdout.write(f"{name:<40}{count / elapsed:>10.1f}{elapsed / count * 1000:>10.1f}")
+
+            transaction.set_rollback(True)
+
+    def measure(self, run, budget):
+        count = 0
+        started = time.perf_counter()
+        while True:
+            run()
+            count += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= budget:
+                return count, elapsed
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from users.revocation import prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired refresh tokens and their blacklist entries in small "
+        "transactions. The run_jobs worker does this every "
+        "TOKEN_PRUNE_INTERVAL_SECONDS; run it by hand to catch up at once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help="Tokens deleted per transaction.")
+
+    def handle(self, *args, **options):
+        deleted = prune_expired_tokens(batch_size=options['batch_size'])
+        self.stdout.write(f"Pruned {deleted} expired tokens.")
@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection, transaction
+from prometheus_client import Histogram
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from Backend.metrics import REGISTRY
+
+LOCAL_CACHE_SIZE = 4096
+PRUNED_KEY = 'users:revoked:pruned'
+
+CHECK_DURATION = Histogram(
+    'token_revocation_check_duration_seconds', 'Time to check a refresh token against the blacklist, by where the answer came from.',
+    ('source',), buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1),
+    registry=REGISTRY,
+)
+
+# jti -> expiry timestamp of tokens known to be revoked. A revocation only
+# ends when the token expires, so these never go stale.
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def revoked_key(jti):
+    return f'users:revoked:{jti}'
+
+
+def cache_timeout(expires_at):
+    return max(int(expires_at - time.time()), 1)
+
+
+def mark_revoked(jti, expires_at):
+    """Record that ``jti``, valid until the ``expires_at`` timestamp, is revoked."""
+    cache.set(revoked_key(jti), True, cache_timeout(expires_at))
+    remember_local(jti, expires_at)
+
+
+def is_revoked(jti, expires_at):
+    """
+    Whether the refresh token ``jti`` is blacklisted. Known revocations are
+    answered from process memory; other tokens from the shared cache, and
+    the blacklist is only queried when neither knows.
+
+    A signal records tokens in the shared cache as they are blacklisted,
+    and answers of "not revoked" are cached for TOKEN_REVOCATION_CACHE_TIMEOUT.
+    With a per-process cache (LocMemCache) the signal only reaches the
+    process that revoked the token, so those answers are not cached at all.
+    """
+    started = time.perf_counter()
+    source = 'local'
+    try:
+        if local_revoked(jti):
+            return True
+        source = 'cache'
+        revoked = cache.get(revoked_key(jti))
+        if revoked is None:
+            source = 'database'
+            revoked = BlacklistedToken.objects.filter(token__jti=jti).exists()
+            if revoked:
+                cache.set(revoked_key(jti), True, cache_timeout(expires_at))
+            elif settings.TOKEN_REVOCATION_CACHE_TIMEOUT and cache_is_shared():
+                timeout = min(cache_timeout(expires_at), settings.TOKEN_REVOCATION_CACHE_TIMEOUT)
+                cache.set(revoked_key(jti), False, timeout)
+        if revoked:
+            remember_local(jti, expires_at)
+        return revoked
+    finally:
+        CHECK_DURATION.labels(source).observe(time.perf_counter() - started)
+
+
+def cache_is_shared():
+    """Whether other processes read what this one writes to the default cache."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def local_revoked(jti):
+    with _local_lock:
+        expires_at = _local.get(jti)
+        if expires_at is None:
+            return False
+        if expires_at <= time.time():
+            del _local[jti]
+            return False
+        _local.move_to_end(jti)
+        return True
+
+
+def remember_local(jti, expires_at):
+    with _local_lock:
+        _local[jti] = expires_at
+        _local.move_to_end(jti)
+        while len(_local) > LOCAL_CACHE_SIZE:
+            _local.popitem(last=False)
+
+
+def prune_expired_tokens(batch_size=1000):
+    """
+    Delete expired outstanding tokens, and their blacklist entries, in
+    batches of ``batch_size``, each in its own transaction so no lock is
+    held for long. Returns the number of outstanding tokens deleted.
+    """
+    now = aware_utcnow()
+    deleted = 0
+    last_id = 0
+    while True:
+        # Ids grow with issue time, so expired tokens cluster at the start
+        # of the primary key and each batch resumes where the last ended.
+        ids = list(
+            OutstandingToken.objects.filter(id__gt=last_id, expires_at__lte=now)
+            .order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            BlacklistedToken.objects.filter(token_id__in=ids).delete()
+            deleted += OutstandingToken.objects.filter(id__in=ids).delete()[1].get(OutstandingToken._meta.label, 0)
+        last_id = ids[-1]
+    if deleted:
+        try:
+            cache.incr(PRUNED_KEY, deleted)
+        except ValueError:
+            cache.add(PRUNED_KEY, 0, None)
+            cache.incr(PRUNED_KEY, deleted)
+    return deleted
+
+
+def table_rows(model):
+    """Row count of ``model``'s table; PostgreSQL's planner estimate, as counting grows with the table."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [model._meta.db_table])
+            row = cursor.fetchone()
+        # -1 until the table is first vacuumed or analyzed.
+        if row is not None and row[0] >= 0:
+            return row[0]
+    return model.objects.count()
+
+
+def revocation_metrics():
+    """Prometheus lines for Backend.metrics."""
+    yield '# HELP token_outstanding_rows Rows in the outstanding refresh token table.'
+    yield '# TYPE token_outstanding_rows gauge'
+    yield f'token_outstanding_rows {table_rows(OutstandingToken)}'
+    yield '# HELP token_blacklisted_rows Rows in the refresh token blacklist.'
+    yield '# TYPE token_blacklisted_rows gauge'
+    yield f'token_blacklisted_rows {table_rows(BlacklistedToken)}'
+    yield '# HELP token_pruned_total Expired outstanding tokens deleted by prune_tokens.'
+    yield '# TYPE token_pruned_total counter'
+    yield f'token_pruned_total {cache.get(PRUNED_KEY, 0)}'
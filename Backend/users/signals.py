@@ -0,0 +1,25 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .cache import invalidate_user
+from .revocation import mark_revoked
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    # Covers ProfileView.put, admin edits, deactivation and password changes.
+    invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def token_blacklisted(sender, instance, created=False, raw=False, **kwargs):
+    # Logout and the admin both blacklist through BlacklistedToken. Deleting
+    # an entry is not tracked, so prune_tokens can delete without loading
+    # rows; an unblacklisted token stays rejected until its cache entry ends.
+    if created and not raw:
+        mark_revoked(instance.token.jti, instance.token.expires_at.timestamp())
@@ -0,0 +1,8 @@
+from jobs.registry import task
+
+from .revocation import prune_expired_tokens
+
+
+@task('users.prune_expired_tokens')
+def prune_tokens():
+    return {'deleted': prune_expired_tokens()}
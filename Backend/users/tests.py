@@ -1,3 +1,225 @@
-from django.test import TestCase
+import datetime
+import io
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from . import authentication, cache as user_cache
+from .hashers import PBKDF2PasswordHasher
+
+User = get_user_model()
+
+
+class CookieJWTAuthenticationCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.client.cookies[settings.ACCESS_TOKEN_COOKIE_NAME] = str(AccessToken.for_user(self.user))
+        self.url = reverse('profile')
+
+    def test_user_lookup_is_cached(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['username'], 'reader')
+
+    def test_profile_update_invalidates(self):
+        self.client.get(self.url)
+        response = self.client.put(self.url, {'bio': 'Likes long books'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.url).data['bio'], 'Likes long books')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('Secret-pass1'))
+
+    def test_deactivated_user_is_rejected_immediately(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get(self.url)
+        self.user.delete()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_password_hash_stays_out_of_the_cache(self):
+        self.client.get(self.url)
+        version = cache.get(f'users:auth:version:{self.user.pk}')
+        state = cache.get(f'users:auth:{self.user.pk}:{version}')
+        self.assertEqual(state['email'], 'reader@example.com')
+        self.assertNotIn(self.user.password, repr(state))
+
+    def test_password_change_revokes_cached_tokens(self):
+        token = AccessToken.for_user(self.user)
+        token[jwt_settings.REVOKE_TOKEN_CLAIM] = get_md5_hash_password(self.user.password)
+        self.client.cookies[settings.ACCESS_TOKEN_COOKIE_NAME] = str(token)
+        with mock.patch.object(authentication.api_settings, 'CHECK_REVOKE_TOKEN', True), \
+                mock.patch.object(user_cache.api_settings, 'CHECK_REVOKE_TOKEN', True):
+            self.client.get(self.url)
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.get(self.url).status_code, 200)
+            self.user.set_password('Other-pass2')
+            self.user.save()
+            self.assertEqual(self.client.get(self.url).status_code, 401)
+
+
+class LoginViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.url = reverse('login')
+
+    def login(self, password='Secret-pass1'):
+        return self.client.post(self.url, {'email': 'reader@example.com', 'password': password})
+
+    def test_password_is_verified_exactly_once(self):
+        verify = PBKDF2PasswordHasher.verify
+        with mock.patch.object(PBKDF2PasswordHasher, 'verify', autospec=True, side_effect=verify) as spy:
+            response = self.login()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(spy.call_count, 1)
+        self.assertIn(settings.ACCESS_TOKEN_COOKIE_NAME, response.cookies)
+        self.assertIn(settings.REFRESH_TOKEN_COOKIE_NAME, response.cookies)
+
+    def test_rejections(self):
+        self.assertEqual(self.login('wrong').status_code, 401)
+        self.assertEqual(self.client.post(self.url, {'email': 'reader@example.com'}).status_code, 400)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login().status_code, 401)
+
+    def test_legacy_hashes_are_upgraded_on_login(self):
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password('Secret-pass1', hasher='scrypt')
+        )
+        self.assertEqual(self.login().status_code, 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith(PBKDF2PasswordHasher.algorithm + '$'))
+        self.assertEqual(self.login().status_code, 200)
+
+
+@override_settings(METRICS_TOKEN='secret')
+class TokenRevocationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='reader', email='reader@example.com', password='Secret-pass1'
+        )
+        self.refresh_url = reverse('token_refresh')
+
+    def login(self):
+        response = self.client.post(reverse('login'), {'email': 'reader@example.com', 'password': 'Secret-pass1'})
+        return response.cookies[settings.REFRESH_TOKEN_COOKIE_NAME].value
+
+    def test_refresh_checks_the_blacklist_once_per_token_with_a_shared_cache(self):
+        self.login()
+        with mock.patch('users.revocation.cache_is_shared', return_value=True):
+            # The access cookie's user, then the blacklist; both are cached after.
+            with self.assertNumQueries(2):
+                self.assertEqual(self.client.post(self.refresh_url).status_code, 200)
+            with self.assertNumQueries(0):
+                self.assertEqual(self.client.post(self.refresh_url).status_code, 200)
+
+    def test_refresh_checks_the_blacklist_every_time_with_a_per_process_cache(self):
+        self.login()
+        self.client.post(self.refresh_url)
+        # Another process may have revoked the token since.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.post(self.refresh_url).status_code, 200)
+
+    def test_logout_revokes_without_waiting_for_the_cache(self):
+        refresh = self.login()
+        self.client.post(self.refresh_url)
+        self.client.post(reverse('logout'))
+        self.client.cookies[settings.REFRESH_TOKEN_COOKIE_NAME] = refresh
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.post(self.refresh_url).status_code, 401)
+        cache.clear()
+        self.assertEqual(self.client.post(self.refresh_url).status_code, 401)
+
+    def test_prune_deletes_expired_tokens_in_batches(self):
+        for _ in range(5):
+            self.login()
+        tokens = list(OutstandingToken.objects.order_by('id'))
+        BlacklistedToken.objects.create(token=tokens[0])
+        OutstandingToken.objects.exclude(pk=tokens[-1].pk).update(
+            expires_at=timezone.now() - datetime.timedelta(seconds=1)
+        )
+        out = io.StringIO()
+        call_command('prune_tokens', batch_size=2, stdout=out)
+        self.assertEqual(out.getvalue().strip(), 'Pruned 4 expired tokens.')
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertFalse(BlacklistedToken.objects.exists())
+
+        metrics = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret')
+        # PostgreSQL reports the planner's estimate, which lags until ANALYZE.
+        self.assertRegex(metrics.content.decode(), r'\ntoken_outstanding_rows \d+\n')
+        self.assertIn('\ntoken_pruned_total 4\n', metrics.content.decode())
+
+
+@override_settings(
+    METRICS_TOKEN='secret',
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'login_ip': '3/min', 'login_account': '2/min', 'register_ip': None},
+    },
+)
+class AuthThrottleTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='reader', email='reader@example.com', password='Secret-pass1')
+        self.url = reverse('login')
+        self.now = 1_000_000.0
+        clock = mock.patch('users.throttling.TokenBucketThrottle.timer', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def login(self, email='reader@example.com', password='wrong', address='10.0.0.1'):
+        return self.client.post(self.url, {'email': email, 'password': password}, REMOTE_ADDR=address)
+
+    def test_account_bucket_rejects_before_hashing_and_refills(self):
+        verify = PBKDF2PasswordHasher.verify
+        with mock.patch.object(PBKDF2PasswordHasher, 'verify', autospec=True, side_effect=verify) as spy:
+            self.assertEqual(self.login().status_code, 401)
+            self.assertEqual(self.login(address='10.0.0.2').status_code, 401)
+            with self.assertNumQueries(0):
+                response = self.login(address='10.0.0.3')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        self.assertEqual(spy.call_count, 2)
+
+        # One token back every 30 seconds; rejected attempts did not delay it.
+        self.now += 30
+        self.assertEqual(self.login(password='Secret-pass1', address='10.0.0.3').status_code, 200)
+        self.assertEqual(self.login(address='10.0.0.3').status_code, 429)
+
+    def test_address_bucket_covers_every_account(self):
+        for number in range(3):
+            self.assertEqual(self.login(f'user{number}@example.com').status_code, 401)
+        self.assertEqual(self.login('user3@example.com').status_code, 429)
+        self.assertEqual(self.login('user3@example.com', address='10.0.0.9').status_code, 401)
+
+        metrics = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer secret').content.decode()
+        self.assertIn('auth_throttle_requests_total{scope="login_ip",outcome="rejected"} 1\n', metrics)
+        self.assertIn('auth_throttle_requests_total{scope="login_ip",outcome="allowed"} 4\n', metrics)
+
+    def test_non_object_bodies_are_rejected_by_the_view(self):
+        response = self.client.post(self.url, [1], format='json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,110 @@
+import hashlib
+import math
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+
+def bucket_key(scope, ident):
+    return f'throttle:{scope}:{hashlib.sha256(ident.encode()).hexdigest()[:32]}'
+
+
+def counter_key(scope, outcome):
+    return f'throttle:{scope}:{outcome}'
+
+
+def record(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    A token bucket per ``view.throttle_scope`` and client, kept in the shared
+    cache. The rate ``'5/min'`` holds up to 5 tokens and adds one every 12
+    seconds; each request takes one. Scopes without a rate in
+    DEFAULT_THROTTLE_RATES are not limited. Clients are told apart by
+    address unless a subclass overrides ``get_ident_for()``.
+
+    The bucket is stored as the time it will next be full (GCRA), so a
+    request takes its token with an atomic increment and concurrent
+    requests cannot all read the same state and pass together. Throttles
+    run before the view, so a rejected request costs no password hashing
+    or queries.
+    """
+    kind = None
+    timer = time.time
+
+    def get_ident_for(self, request):
+        return self.get_ident(request)
+
+    def get_scope(self, view):
+        scope = getattr(view, 'throttle_scope', None)
+        return scope and f'{scope}_{self.kind}'
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        scope = self.get_scope(view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope) if scope else None
+        ident = self.get_ident_for(request) if rate else None
+        if not ident:
+            return True
+
+        capacity, duration = SimpleRateThrottle.parse_rate(self, rate)
+        interval = max(duration * 1000 // capacity, 1)
+        now = int(self.timer() * 1000)
+        key = bucket_key(scope, ident)
+        timeout = duration + 60
+        try:
+            full_at = cache.incr(key, interval)
+        except ValueError:
+            full_at = now + interval if cache.add(key, now + interval, timeout) else cache.incr(key, interval)
+        if full_at - interval < now:
+            # The bucket had refilled completely; count from now instead.
+            full_at = now + interval
+            cache.set(key, full_at, timeout)
+
+        excess = full_at - now - capacity * interval
+        if excess > 0:
+            # Give the token back, so rejected requests do not push the
+            # refill further out.
+            cache.decr(key, interval)
+            cache.touch(key, timeout)
+            self.retry_after = math.ceil(excess / 1000)
+            record(counter_key(scope, 'rejected'))
+            return False
+        record(counter_key(scope, 'allowed'))
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class ClientIPThrottle(TokenBucketThrottle):
+    """Per client address; set NUM_PROXIES when behind a proxy that appends to X-Forwarded-For."""
+    kind = 'ip'
+
+
+class AccountThrottle(TokenBucketThrottle):
+    """Per account named in the request, whichever address the attempts come from."""
+    kind = 'account'
+
+    def get_ident_for(self, request):
+        if not isinstance(request.data, dict):
+            return None
+        email = request.data.get('email')
+        return email.strip().lower() if isinstance(email, str) else None
+
+
+def throttle_metrics():
+    """Prometheus lines for Backend.metrics; the counters are shared by every worker."""
+    yield '# HELP auth_throttle_requests_total Requests checked by the auth rate limits, by scope and outcome.'
+    yield '# TYPE auth_throttle_requests_total counter'
+    for scope in sorted(api_settings.DEFAULT_THROTTLE_RATES):
+        for outcome in ('allowed', 'rejected'):
+            yield f'auth_throttle_requests_total{{scope="{scope}",outcome="{outcome}"}} {cache.get(counter_key(scope, outcome), 0)}'
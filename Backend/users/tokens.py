@@ -0,0 +1,14 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from .revocation import is_revoked
+
+
+class RefreshToken(BaseRefreshToken):
+    def check_blacklist(self):
+        # Same check as simplejwt's, through users.revocation instead of a
+        # blacklist query on every refresh.
+        if is_revoked(self.payload[api_settings.JTI_CLAIM], self.payload['exp']):
+            raise TokenError(_('Token is blacklisted'))
@@ -4,13 +4,14 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import get_user_model, authenticate
 from django.conf import settings
 from django.middleware.csrf import get_token
 from datetime import datetime, timedelta
 from .serializers import UserRegistrationSerializer, UserProfileSerializer
+from .throttling import AccountThrottle, ClientIPThrottle
+from .tokens import RefreshToken
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,50 +19,37 @@ User = get_user_model()
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
+    # No authentication: throttles run before any hashing or user lookup.
+    authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle, AccountThrottle]
+    throttle_scope = 'register'
     serializer_class = UserRegistrationSerializer
 
 class LoginView(APIView):
+    authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = [ClientIPThrottle, AccountThrottle]
+    throttle_scope = 'login'
 
     def post(self, request):
-        email = request.data.get('email')
-        password = request.data.get('password')
-        
-        print(f"DEBUG: Received email: {email}")
-        print(f"DEBUG: Received password: {'*' * len(password) if password else 'None'}")
-        print(f"DEBUG: Request data: {request.data}")
+        data = request.data if isinstance(request.data, dict) else {}
+        email = data.get('email')
+        password = data.get('password')
 
         if not email or not password:
-            print("DEBUG: Missing email or password")
             return Response(
                 {'error': 'Email and password are required'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        try:
-            db_user = User.objects.get(email=email)
-            print(f"DEBUG: User found in DB: {db_user.email}")
-            print(f"DEBUG: User is_active: {db_user.is_active}")
-            print(f"DEBUG: User has_usable_password: {db_user.has_usable_password()}")
-            
-            password_check = db_user.check_password(password)
-            print(f"DEBUG: Direct password check result: {password_check}")
-            
-        except User.DoesNotExist:
-            print(f"DEBUG: User with email {email} not found in database")
-            return Response(
-                {'error': 'Invalid credentials'}, 
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        
-        print(f"DEBUG: Attempting authentication with username={email}")
+
+        # A single lookup and hash verification; ModelBackend also rejects
+        # inactive users and re-hashes with the preferred hasher when needed.
         user = authenticate(request, username=email, password=password)
-        print(f"DEBUG: Authentication result: {user}")
-        
+
         if user:
-            print(f"DEBUG: Authentication successful for {user.email}")
-            
+            logger.debug("Login successful for user %s", user.pk)
+
             refresh = RefreshToken.for_user(user)
             access_token = refresh.access_token
 
@@ -94,7 +82,7 @@ class LoginView(APIView):
             
             return response
         else:
-            print(f"DEBUG: Authentication failed for {email}")
+            logger.info("Failed login attempt")
             return Response(
                 {'error': 'Invalid credentials'}, 
                 status=status.HTTP_401_UNAUTHORIZED
@@ -97,11 +97,17 @@ const BookCard = ({ book, onUpdate }) => {
   return (
     <div className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-lg transition-shadow">
       {book.cover_image && (
-        <img
-          src={book.cover_image}
-          alt={book.title}
-          className="w-full h-48 object-cover"
-        />
+        <picture>
+          {book.cover_renditions?.card && (
+            <source srcSet={book.cover_renditions.card.webp} type="image/webp" />
+          )}
+          <img
+            src={book.cover_renditions?.card?.jpeg || book.cover_image}
+            alt={book.title}
+            loading="lazy"
+            className="w-full h-48 object-cover"
+          />
+        </picture>
       )}
       <div className="p-4">
         <div className="flex justify-between items-start mb-2">
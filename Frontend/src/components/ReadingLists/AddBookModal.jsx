@@ -21,7 +21,9 @@ const AddBookModal = ({ isOpen, onClose, listId, onBookAdded }) => {
   const fetchBooks = async () => {
     try {
       setLoading(true);
-      const params = searchTerm ? { search: searchTerm } : {};
+      // Only what the picker shows; skips descriptions and cover data.
+      const params = { fields: 'id,title,authors,genre' };
+      if (searchTerm) params.search = searchTerm;
       const response = await booksAPI.getBooks(params);
       setBooks(response.data.results || response.data);
     } catch (error) {
@@ -149,11 +149,17 @@ const ReadingListDetail = () => {
               className="bg-white rounded-lg shadow-md overflow-hidden hover:shadow-lg transition-shadow"
             >
               {item.book.cover_image && (
-                <img
-                  src={item.book.cover_image}
-                  alt={item.book.title}
-                  className="w-full h-48 object-cover"
-                />
+                <picture>
+                  {item.book.cover_renditions?.card && (
+                    <source srcSet={item.book.cover_renditions.card.webp} type="image/webp" />
+                  )}
+                  <img
+                    src={item.book.cover_renditions?.card?.jpeg || item.book.cover_image}
+                    alt={item.book.title}
+                    loading="lazy"
+                    className="w-full h-48 object-cover"
+                  />
+                </picture>
               )}
               <div className="p-4">
                 <div className="flex justify-between items-start mb-2">
@@ -16,6 +16,7 @@ export const authAPI = {
 // Books APIs
 export const booksAPI = {
   getBooks: (params) => api.get("/book/", { params }),
+  getBookFacets: (params) => api.get("/book/facets/", { params }),
   getBook: (id) => api.get(`/book/${id}/`),
   createBook: (bookData) => api.post("/book/", bookData),
   updateBook: (id, bookData) => api.put(`/book/${id}/`, bookData),
@@ -33,4 +34,17 @@ export const readingListsAPI = {
     api.post(`/reading-list/${listId}/add-book/`, bookData),
   removeBookFromList: (listId, itemId) =>
     api.delete(`/reading-list/${listId}/items/${itemId}/`),
+  bulkAddBooks: (listId, items) =>
+    api.post(`/reading-list/${listId}/items/bulk-add/`, { items }),
+  bulkRemoveItems: (listId, itemIds) =>
+    api.post(`/reading-list/${listId}/items/bulk-remove/`, { item_ids: itemIds }),
+  // moves: [{ item_id, after_id }], after_id null moves an item to the front.
+  reorderItems: (listId, moves) =>
+    api.post(`/reading-list/${listId}/items/reorder/`, { moves }),
+};
+
+// Background jobs (e.g. imports posted with background=true)
+export const jobsAPI = {
+  getJobs: (params) => api.get("/jobs/", { params }),
+  getJob: (id) => api.get(`/jobs/${id}/`),
 };